@@ -14,3 +14,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'NextStar.settings')
 
 application = get_asgi_application()
+
+# The event loop outlives requests here, so mirror-node clients can be pooled
+from hiero.async_mirror_node import enable_pooling  # noqa: E402
+enable_pooling()
@@ -35,6 +35,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestProfilingMiddleware',  # No-op unless REQUEST_PROFILING=True
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -44,6 +45,45 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Request profiling (opt-in): Server-Timing header plus a JSON log line for slow requests
+REQUEST_PROFILING_ENABLED = os.getenv('REQUEST_PROFILING', 'False') == 'True'
+REQUEST_PROFILING_SAMPLE_RATE = float(os.getenv('REQUEST_PROFILING_SAMPLE_RATE', '1.0'))  # Fraction of requests profiled
+REQUEST_PROFILING_SLOW_MS = int(os.getenv('REQUEST_PROFILING_SLOW_MS', '500'))
+REQUEST_PROFILING_DUPLICATE_THRESHOLD = 3  # Same SQL this many times => likely N+1
+
+# Ticket numbers each worker process claims per round trip (1 = strictly sequential)
+TICKET_NUMBER_BLOCK_SIZE = int(os.getenv('TICKET_NUMBER_BLOCK_SIZE', '1'))
+# NFT metadata documents are served from here; only <base><digest> is minted on-chain.
+# Minted URIs can never be changed, so outside DEBUG there is no localhost default
+# and ticket mints fail until it is set.
+NFT_METADATA_BASE_URL = os.getenv('NFT_METADATA_BASE_URL', 'http://localhost:8000/nft/' if DEBUG else '')
+
+# Ventures with at least this many tickets spread sales over counter shards
+FUNDING_SHARD_MIN_TICKETS = int(os.getenv('FUNDING_SHARD_MIN_TICKETS', '1000'))
+FUNDING_COUNTER_SHARDS = int(os.getenv('FUNDING_COUNTER_SHARDS', '8'))
+
+# Per-action request limits enforced by core.rate_limit: at most `limit` hits per `timeout` seconds
+RATE_LIMITS = {
+    'create_proposal': {'limit': 3, 'timeout': 3600},     # 3 per hour
+    'cast_vote': {'limit': 10, 'timeout': 300},           # 10 per 5 minutes
+    'purchase_nft': {'limit': 5, 'timeout': 3600},        # 5 per hour
+    'buy_venture_ticket': {'limit': 10, 'timeout': 300},  # 10 per 5 minutes
+    'submit_solution': {'limit': 30, 'timeout': 300},     # 30 per 5 minutes
+    'use_hint': {'limit': 30, 'timeout': 300},            # 30 per 5 minutes
+    'buy_nft_listing': {'limit': 5, 'timeout': 300},      # 5 per 5 minutes
+}
+
+# Rate-limit counters and fragment-cache versions must be shared by every
+# worker to hold across processes. Without REDIS_URL each process keeps its
+# own local-memory cache (fine for a single worker or development).
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+
 ROOT_URLCONF = 'NextStar.urls'
 
 TEMPLATES = [
@@ -6,4 +6,5 @@ urlpatterns = [
     path('', include('core.urls')),
     path('', include('ventures.urls')),
     path('', include('gaming.urls')),
+    path('', include('governance.urls')),
 ]
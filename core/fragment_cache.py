@@ -0,0 +1,70 @@
+import time
+from django.core.cache import cache
+
+# Fragment namespaces. Each one is versioned per object id and bumped by signals
+# whenever the rows rendered inside the fragment change.
+VENTURE_CARD = 'venture_card'            # keyed by venture id
+VENTURE_INVESTORS = 'venture_investors'  # keyed by venture id
+VENTURE_TICKETS = 'venture_tickets'      # keyed by venture id
+GAME_HUB = 'game_hub'                    # keyed by venture id
+PROPOSAL_FEED = 'proposal_feed'          # keyed by proposal status
+GOVERNANCE_STATS = 'governance_stats'    # single 'all' key
+NFT_MARKET = 'nft_market'                # single 'summary' key
+VENTURE_SEARCH = 'venture_search'        # single 'all' key
+USER_WALLET = 'user_wallet'              # keyed by user id (STAR balance and tickets held)
+
+def _version_key(namespace, key):
+    return f"fragver:{namespace}:{key}"
+
+def _initial_version():
+    """Seed versions from the clock so an evicted counter never falls back
+    to a number an older fragment was cached under."""
+    return int(time.time() * 1000)
+
+def get_fragment_version(namespace, key):
+    """Return the current version for a fragment, creating it if needed"""
+    version_key = _version_key(namespace, key)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, _initial_version(), None)
+        version = cache.get(version_key)
+    return version
+
+async def aget_fragment_version(namespace, key):
+    """get_fragment_version for async views"""
+    version_key = _version_key(namespace, key)
+    version = await cache.aget(version_key)
+    if version is None:
+        await cache.aadd(version_key, _initial_version(), None)
+        version = await cache.aget(version_key)
+    return version
+
+def get_fragment_versions(namespace, keys):
+    """Return {key: version} for many fragments in one cache round trip"""
+    version_keys = {_version_key(namespace, key): key for key in keys}
+    found = cache.get_many(list(version_keys))
+    versions = {version_keys[vk]: value for vk, value in found.items()}
+
+    for vk, key in version_keys.items():
+        if key not in versions:
+            cache.add(vk, _initial_version(), None)
+            versions[key] = cache.get(vk)
+    return versions
+
+def bump_fragment_version(namespace, key):
+    """Invalidate every cached fragment rendered for this key"""
+    version_key = _version_key(namespace, key)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Counter missing (never read or evicted): any new seed is newer
+        cache.add(version_key, _initial_version(), None)
+
+def attach_fragment_versions(objects, namespace, attr='fragment_version'):
+    """Set ``attr`` on each object to its fragment version for use as a
+    ``{% cache %}`` vary-on argument"""
+    objects = list(objects)
+    versions = get_fragment_versions(namespace, [obj.pk for obj in objects])
+    for obj in objects:
+        setattr(obj, attr, versions[obj.pk])
+    return objects
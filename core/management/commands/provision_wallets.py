@@ -0,0 +1,46 @@
+# management/commands/provision_wallets.py
+from django.core.management.base import BaseCommand
+from core.models import UserWallet
+from core.wallet_provisioning import provision_wallet, MAX_PROVISIONING_ATTEMPTS
+
+class Command(BaseCommand):
+    help = 'Provision Hedera accounts for pending (and optionally failed) user wallets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Also retry wallets whose background provisioning gave up')
+        parser.add_argument('--reset-stuck', action='store_true',
+                            help='Requeue wallets left in "provisioning" by a crashed worker '
+                                 '(only run when no web workers are provisioning)')
+        parser.add_argument('--max-attempts', type=int, default=MAX_PROVISIONING_ATTEMPTS)
+        parser.add_argument('--limit', type=int, default=100)
+
+    def handle(self, *args, **options):
+        if options['reset_stuck']:
+            reset = UserWallet.objects.filter(status='provisioning').update(status='pending')
+            self.stdout.write(f"Requeued {reset} stuck wallets")
+
+        statuses = ['pending', 'failed'] if options['retry_failed'] else ['pending']
+        wallet_ids = list(
+            UserWallet.objects.filter(status__in=statuses)
+            .order_by('created_at')
+            .values_list('id', flat=True)[:options['limit']]
+        )
+
+        provisioned = failed = 0
+        for wallet_id in wallet_ids:
+            wallet = provision_wallet(wallet_id, max_attempts=options['max_attempts'])
+            if wallet is None:
+                continue
+            if wallet.status == 'active':
+                provisioned += 1
+                self.stdout.write(f"Provisioned wallet for {wallet.user.username}: {wallet.recipient_id}")
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(
+                    f"Failed to provision wallet for {wallet.user.username}: {wallet.provisioning_error}"
+                ))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Provisioned {provisioned} wallets, {failed} failed'
+        ))
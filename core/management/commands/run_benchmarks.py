@@ -0,0 +1,155 @@
+# management/commands/run_benchmarks.py
+import importlib
+import json
+import math
+import statistics
+import time
+from contextlib import ExitStack
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from ventures.models import Venture, VentureOwnership
+from gaming.models import VentureGame
+from core.management.commands.seed_perf_data import SEED_EMAIL_DOMAIN
+
+# Every Hedera / mirror-node entry point a view module imports, replaced by a
+# canned response so benchmarks run offline and measure only our own code
+EXTERNAL_STUBS = {
+    'get_balance': 1000,
+    'aget_balance': 1000,
+    'submit_message': {'status': 'success', 'message_id': '0.0.0@0.0'},
+    'transfer_tokens': {'status': 'success'},
+    'fund_pool': {'status': 'success'},
+    'associate_token': {'status': 'success'},
+    'associate_nft': {'status': 'success'},
+    'mint_nft': {'status': 'success', 'serial_number': 1},
+}
+STUBBED_MODULES = ['core.views', 'ventures.views', 'governance.views']
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+class Command(BaseCommand):
+    help = 'Benchmark the hot endpoints against seeded data (run seed_perf_data first)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Only run the named endpoint (repeatable)')
+        parser.add_argument('--cold', action='store_true',
+                            help='Clear the cache before every request to measure uncached paths')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    def handle(self, *args, **options):
+        user = self.pick_user()
+        venture = self.pick_venture(user)
+
+        endpoints = {
+            'dashboard_view': reverse('dashboard'),
+            'ventures_list': reverse('ventures_list'),
+            'venture_detail': reverse('venture_detail', args=[venture.slug]),
+            'get_active_proposals': reverse('active_proposals'),
+            'governance_stats': reverse('governance_stats'),
+            'game_hub': reverse('game_hub', args=[venture.id]),
+            'leaderboard': reverse('leaderboard', args=[venture.id]),
+        }
+        if options['endpoints']:
+            unknown = set(options['endpoints']) - set(endpoints)
+            if unknown:
+                raise CommandError(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+            endpoints = {name: url for name, url in endpoints.items() if name in options['endpoints']}
+
+        client = Client()
+        client.force_login(user)
+
+        results = []
+        with ExitStack() as stack:
+            for module in STUBBED_MODULES:
+                imported = importlib.import_module(module)
+                for name, value in EXTERNAL_STUBS.items():
+                    if hasattr(imported, name):
+                        stack.enter_context(mock.patch.object(imported, name, return_value=value))
+            for name, url in endpoints.items():
+                results.append(self.run_endpoint(client, name, url, options))
+
+        failed = [result['endpoint'] for result in results if not result['ok']]
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.report(user, venture, results, options)
+        if failed:
+            # Timings of error pages say nothing about the real page
+            raise CommandError(f"Non-2xx responses from: {', '.join(failed)}")
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS('Benchmark complete'))
+
+    def report(self, user, venture, results, options):
+
+        self.stdout.write(f"User {user.username}, venture {venture.slug}, "
+                          f"{options['iterations']} iterations ({'cold' if options['cold'] else 'warm'} cache)")
+        self.stdout.write(f"{'endpoint':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>10}  status")
+        for result in results:
+            line = (
+                f"{result['endpoint']:<22}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                f"{result['p99_ms']:>10.1f}{result['queries_mean']:>10.1f}  {result['status_codes']}"
+            )
+            self.stdout.write(line if result['ok'] else self.style.ERROR(f"{line}  FAILED"))
+
+    def pick_user(self):
+        """A seeded user who both invests and plays, so every page renders its full content"""
+        user = (
+            User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}',
+                                venture_ownerships__isnull=False, game_sessions__isnull=False)
+            .order_by('id').first()
+        )
+        if not user:
+            raise CommandError('No seeded data found. Run "python manage.py seed_perf_data" first.')
+        return user
+
+    def pick_venture(self, user):
+        venture_ids = VentureGame.objects.values('venture_id')
+        ownership = (
+            VentureOwnership.objects.filter(owner=user, venture_id__in=venture_ids)
+            .select_related('venture').first()
+        )
+        if ownership:
+            return ownership.venture
+        return Venture.objects.filter(id__in=venture_ids).first()
+
+    def run_endpoint(self, client, name, url, options):
+        for _ in range(options['warmup']):
+            client.get(url)
+
+        timings, query_counts, status_codes = [], [], set()
+        for _ in range(options['iterations']):
+            if options['cold']:
+                cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+            query_counts.append(len(queries))
+            status_codes.add(response.status_code)
+
+        return {
+            'endpoint': name,
+            'url': url,
+            'iterations': options['iterations'],
+            'p50_ms': round(percentile(timings, 50), 2),
+            'p95_ms': round(percentile(timings, 95), 2),
+            'p99_ms': round(percentile(timings, 99), 2),
+            'mean_ms': round(statistics.mean(timings), 2),
+            'queries_mean': round(statistics.mean(query_counts), 1),
+            'queries_max': max(query_counts),
+            'status_codes': sorted(status_codes),
+            'ok': all(200 <= code < 300 for code in status_codes),
+        }
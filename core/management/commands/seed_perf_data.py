@@ -0,0 +1,279 @@
+# management/commands/seed_perf_data.py
+import random
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from core.models import UserWallet
+from ventures.models import Venture, VentureTicket, VentureOwnership
+from ventures.search import rebuild_index as rebuild_search_index
+from gaming.models import VentureGame, Puzzle, PlayerSession, Leaderboard
+from governance.models import GovernanceNFT, GovernanceTopic, GovernanceProposal, Vote
+from governance.views import GovernanceConfig
+from governance.inventory import sync_tier_inventory
+from governance.voting_power import rebuild_voting_power
+
+SEED_EMAIL_DOMAIN = 'seed.nextstar.local'
+BATCH_SIZE = 1000
+
+class Command(BaseCommand):
+    help = 'Seed the database with synthetic users, ventures, games and governance data for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0,
+                            help='Multiplier applied to every count below')
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--ventures', type=int, default=20)
+        parser.add_argument('--investors-per-venture', type=int, default=50)
+        parser.add_argument('--games-per-venture', type=int, default=2)
+        parser.add_argument('--puzzles-per-game', type=int, default=10)
+        parser.add_argument('--sessions-per-game', type=int, default=40)
+        parser.add_argument('--nft-holders', type=int, default=150)
+        parser.add_argument('--proposals', type=int, default=40)
+        parser.add_argument('--votes-per-proposal', type=int, default=60)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible data')
+        parser.add_argument('--flush', action='store_true',
+                            help='Delete previously seeded data before seeding')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        scale = options['scale']
+        counts = {
+            name: max(1, int(options[name] * scale))
+            for name in ['users', 'ventures', 'investors_per_venture', 'sessions_per_game',
+                         'nft_holders', 'proposals', 'votes_per_proposal']
+        }
+        counts['games_per_venture'] = min(options['games_per_venture'], len(VentureGame.VENTURE_GAME_TYPES))
+        counts['puzzles_per_game'] = options['puzzles_per_game']
+
+        seeded_users = User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}')
+        if seeded_users.exists():
+            if not options['flush']:
+                raise CommandError('Seed data already exists. Re-run with --flush to replace it.')
+            # Everything seeded hangs off the seeded users and cascades with them
+            seeded_users.delete()
+            self.stdout.write('Removed previously seeded data')
+
+        with transaction.atomic():
+            users = self.seed_users(counts['users'])
+            ventures = self.seed_ventures(users, counts['ventures'])
+            self.seed_ownerships(users, ventures, counts['investors_per_venture'])
+            self.seed_games(users, ventures, counts)
+            self.seed_governance(users, counts)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(users)} users and {len(ventures)} ventures "
+            f"(password for every seeded user: 'benchmark')"
+        ))
+
+    def seed_users(self, count):
+        password = make_password('benchmark')  # Hash once, reuse for every row
+        User.objects.bulk_create([
+            User(
+                username=f'perf{i}@{SEED_EMAIL_DOMAIN}',
+                email=f'perf{i}@{SEED_EMAIL_DOMAIN}',
+                first_name=f'Perf{i}',
+                last_name='User',
+                password=password,
+            )
+            for i in range(count)
+        ], batch_size=BATCH_SIZE)
+        users = list(User.objects.filter(email__endswith=f'@{SEED_EMAIL_DOMAIN}').order_by('id'))
+
+        now = timezone.now()
+        UserWallet.objects.bulk_create([
+            UserWallet(
+                user=user,
+                public_key=f'302a300506032b6570032100{user.id:040d}',
+                recipient_id=f'0.0.{9000000 + user.id}',
+                status='active',
+                provisioned_at=now,
+            )
+            for user in users
+        ], batch_size=BATCH_SIZE)
+        self.stdout.write(f'Created {len(users)} users with wallets')
+        return users
+
+    def seed_ventures(self, users, count):
+        now = timezone.now()
+        ventures = []
+        for i in range(count):
+            ticket_price = Decimal(self.rng.choice([5, 50, 100, 500]))
+            max_tickets = self.rng.choice([100, 500, 1000])
+            ventures.append(Venture(
+                name=f'Perf Venture {i}',
+                slug=f'perf-venture-{i}',
+                description=f'Synthetic venture {i} used for load benchmarks. ' * 5,
+                founder=self.rng.choice(users),
+                funding_goal=ticket_price * max_tickets,
+                ticket_price=ticket_price,
+                max_tickets=max_tickets,
+                nft_contract_address=f'0.0.{8000000 + i}',
+                funding_start=now - timedelta(days=self.rng.randint(1, 20)),
+                funding_end=now + timedelta(days=self.rng.randint(1, 40)),
+                status=self.rng.choice(['funding', 'funding', 'funding', 'active']),
+            ))
+        Venture.objects.bulk_create(ventures, batch_size=BATCH_SIZE)
+        # bulk_create skips the signal that keeps the search index in step
+        rebuild_search_index()
+        self.stdout.write(f'Created {len(ventures)} ventures')
+        return ventures
+
+    def seed_ownerships(self, users, ventures, investors_per_venture):
+        now = timezone.now()
+        tickets = []
+        for venture in ventures:
+            investors = self.rng.sample(users, min(investors_per_venture, len(users), venture.max_tickets))
+            for number, investor in enumerate(investors, start=1):
+                tickets.append(VentureTicket(
+                    venture=venture,
+                    buyer=investor,
+                    ticket_number=number,
+                    purchase_price=venture.ticket_price,
+                    nft_token_id=f'{venture.nft_contract_address}/{number}',
+                    purchased_at=now - timedelta(minutes=self.rng.randint(1, 20000)),
+                    status='purchased',
+                ))
+            venture.tickets_sold = len(investors)
+            venture.funding_raised = venture.ticket_price * len(investors)
+        VentureTicket.objects.bulk_create(tickets, batch_size=BATCH_SIZE)
+        Venture.objects.bulk_update(ventures, ['tickets_sold', 'funding_raised'], batch_size=BATCH_SIZE)
+
+        VentureOwnership.objects.bulk_create([
+            VentureOwnership(
+                venture=ticket.venture,
+                owner=ticket.buyer,
+                ticket=ticket,
+                equity_percentage=ticket.venture.equity_per_ticket,
+                investment_amount=ticket.purchase_price,
+            )
+            for ticket in tickets
+        ], batch_size=BATCH_SIZE)
+        self.stdout.write(f'Created {len(tickets)} tickets and ownerships')
+
+    def seed_games(self, users, ventures, counts):
+        game_types = [code for code, _ in VentureGame.VENTURE_GAME_TYPES]
+        games = [
+            VentureGame(venture=venture, game_type=game_type,
+                        difficulty=self.rng.choice(['easy', 'medium', 'hard']), auto_generate=False)
+            for venture in ventures
+            for game_type in game_types[:counts['games_per_venture']]
+        ]
+        # bulk_create skips the post_save signals that build leaderboards and puzzles
+        VentureGame.objects.bulk_create(games, batch_size=BATCH_SIZE)
+        Leaderboard.objects.bulk_create([Leaderboard(venture_game=game) for game in games], batch_size=BATCH_SIZE)
+
+        template = Puzzle()
+        puzzles = []
+        for game in games:
+            for number in range(1, counts['puzzles_per_game'] + 1):
+                puzzle = {'synthetic': True, 'game_type': game.game_type, 'number': number}
+                solution = {'synthetic': True, 'answer': self.rng.getrandbits(64)}
+                puzzles.append(Puzzle(
+                    venture_game=game,
+                    puzzle_number=number,
+                    puzzle_data=template.encrypt_data(puzzle),
+                    solution_data=template.encrypt_data(solution),
+                    seed=str(self.rng.getrandbits(64)),
+                    difficulty_score=self.rng.random(),
+                    validation_hash=template.calculate_hash(puzzle, solution),
+                ))
+        Puzzle.objects.bulk_create(puzzles, batch_size=BATCH_SIZE)
+
+        puzzles_by_game = {}
+        for puzzle in puzzles:
+            puzzles_by_game.setdefault(puzzle.venture_game_id, []).append(puzzle)
+
+        now = timezone.now()
+        sessions = []
+        for game in games:
+            game_puzzles = puzzles_by_game.get(game.id, [])
+            pairs = {(self.rng.choice(users), self.rng.choice(game_puzzles))
+                     for _ in range(counts['sessions_per_game'])} if game_puzzles else set()
+            for player, puzzle in pairs:
+                completed = self.rng.random() < 0.7
+                sessions.append(PlayerSession(
+                    player=player,
+                    puzzle=puzzle,
+                    venture_game=game,
+                    is_completed=completed,
+                    is_correct=completed,
+                    completed_at=now if completed else None,
+                    time_spent_seconds=self.rng.uniform(60, 3600),
+                    total_score=self.rng.randint(50, 400) if completed else 0,
+                ))
+        PlayerSession.objects.bulk_create(sessions, batch_size=BATCH_SIZE)
+
+        for leaderboard in Leaderboard.objects.filter(venture_game__in=games):
+            leaderboard.update_leaderboard()
+        self.stdout.write(f'Created {len(games)} games, {len(puzzles)} puzzles and {len(sessions)} sessions')
+
+    def seed_governance(self, users, counts):
+        topics = list(GovernanceTopic.objects.all())
+        if not topics:
+            topics = [GovernanceTopic.objects.create(
+                topic_id='0.0.7174440', name='The Galactic Forum', description='General community discussions'
+            )]
+
+        now = timezone.now()
+        holders = self.rng.sample(users, min(counts['nft_holders'], len(users)))
+        tiers = ['cosmic'] * 20 + ['stellar'] * 5 + ['celestial']
+        nfts = []
+        for serial, holder in enumerate(holders, start=1):
+            tier = self.rng.choice(tiers)
+            nfts.append(GovernanceNFT(
+                user=holder,
+                tier=tier,
+                nft_id=f'seed-{holder.id}-{tier}',
+                serial_number=serial,
+                token_id='0.0.7181084',
+                voting_power=GovernanceConfig.VOTING_POWER[tier],
+            ))
+        GovernanceNFT.objects.bulk_create(nfts, batch_size=BATCH_SIZE)
+        # bulk_create skips the signal that maintains the voting power index
+        rebuild_voting_power()
+        sync_tier_inventory()
+        power_by_user = {nft.user_id: nft.voting_power for nft in nfts}
+
+        proposals = []
+        for i in range(counts['proposals']):
+            ended = self.rng.random() < 0.3
+            start = now - timedelta(days=self.rng.randint(8, 30) if ended else self.rng.randint(0, 6))
+            proposals.append(GovernanceProposal(
+                topic=self.rng.choice(topics),
+                creator=self.rng.choice(holders),
+                title=f'Perf proposal {i}',
+                description=f'Synthetic governance proposal {i} for benchmarks.',
+                voting_start=start,
+                voting_end=start + timedelta(days=GovernanceConfig.VOTING_DURATION_DAYS),
+                status=self.rng.choice(['passed', 'rejected']) if ended else 'active',
+                hedera_message_id=f'0.0.7174440@{i}',
+            ))
+        GovernanceProposal.objects.bulk_create(proposals, batch_size=BATCH_SIZE)
+
+        votes = []
+        for proposal in proposals:
+            voters = self.rng.sample(holders, min(counts['votes_per_proposal'], len(holders)))
+            for voter in voters:
+                choice = self.rng.choice(['yes', 'yes', 'no', 'abstain'])
+                votes.append(Vote(
+                    proposal=proposal,
+                    voter=voter,
+                    vote=choice,
+                    voting_power=power_by_user[voter.id],
+                    hedera_transaction_id=f'0.0.{9000000 + voter.id}@{proposal.id}',
+                    status='anchored',
+                    anchored_at=now,
+                ))
+                # Keep the denormalized tallies in step, as cast_vote would
+                tally_field = GovernanceProposal.TALLY_FIELDS[choice]
+                setattr(proposal, tally_field, getattr(proposal, tally_field) + power_by_user[voter.id])
+                proposal.voter_count += 1
+        Vote.objects.bulk_create(votes, batch_size=BATCH_SIZE)
+        GovernanceProposal.objects.bulk_update(
+            proposals, list(GovernanceProposal.TALLY_FIELDS.values()) + ['voter_count'], batch_size=BATCH_SIZE
+        )
+        self.stdout.write(f'Created {len(nfts)} governance NFTs, {len(proposals)} proposals and {len(votes)} votes')
@@ -0,0 +1,83 @@
+import json
+import logging
+import random
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from contextlib import ExitStack
+from core.profiling import (
+    start_profile, stop_profile, sql_execute_wrapper, instrument_cache_backend,
+)
+
+logger = logging.getLogger('core.profiling')
+
+class RequestProfilingMiddleware:
+    """Opt-in per-request profiling of SQL, cache and Hedera/mirror-node calls.
+
+    Sampled requests get a ``Server-Timing`` header; those slower than
+    ``REQUEST_PROFILING_SLOW_MS`` are also logged as one JSON line that lists
+    repeated (N+1) queries.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 1.0)
+        self.slow_ms = getattr(settings, 'REQUEST_PROFILING_SLOW_MS', 500)
+        self.duplicate_threshold = getattr(settings, 'REQUEST_PROFILING_DUPLICATE_THRESHOLD', 3)
+
+        for alias in settings.CACHES:
+            instrument_cache_backend(type(caches[alias]))
+
+    def __call__(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile, token = start_profile()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sql_execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            stop_profile(token)
+
+        response['Server-Timing'] = self.server_timing(profile)
+        if profile.elapsed_ms >= self.slow_ms:
+            self.log_slow_request(request, response, profile)
+        return response
+
+    def server_timing(self, profile):
+        return ', '.join([
+            f'sql;dur={profile.sql_ms:.1f};desc="{len(profile.queries)} queries"',
+            f'cache;desc="{profile.cache_hits} hits {profile.cache_misses} misses"',
+            f'hedera;dur={profile.external_ms:.1f};desc="{len(profile.external_calls)} calls"',
+            f'total;dur={profile.elapsed_ms:.1f}',
+        ])
+
+    def log_slow_request(self, request, response, profile):
+        match = getattr(request, 'resolver_match', None)
+        logger.warning(json.dumps({
+            'event': 'slow_request',
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(profile.elapsed_ms, 1),
+            'sql': {
+                'count': len(profile.queries),
+                'ms': round(profile.sql_ms, 1),
+                'duplicates': [
+                    {'sql': sql[:300], 'count': count}
+                    for sql, count in profile.duplicate_queries(self.duplicate_threshold)
+                ],
+            },
+            'cache': {'hits': profile.cache_hits, 'misses': profile.cache_misses},
+            'external_calls': [
+                {'service': service, 'call': name, 'ms': round(ms, 1), 'ok': ok}
+                for service, name, ms, ok in profile.external_calls
+            ],
+        }))
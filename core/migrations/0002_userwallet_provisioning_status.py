@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-19 06:53
+
+from django.db import migrations, models
+
+
+def mark_existing_wallets_active(apps, schema_editor):
+    # Wallets created before background provisioning already have an account
+    UserWallet = apps.get_model('core', 'UserWallet')
+    UserWallet.objects.exclude(recipient_id__isnull=True).exclude(recipient_id='').update(status='active')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userwallet',
+            name='provisioned_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='userwallet',
+            name='provisioning_attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userwallet',
+            name='provisioning_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='userwallet',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('provisioning', 'Provisioning'), ('active', 'Active'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_wallets_active, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_userwallet_provisioning_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NFTMetadata',
+            fields=[
+                ('digest', models.CharField(max_length=43, primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
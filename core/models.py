@@ -14,6 +14,13 @@ from decimal import Decimal
 load_dotenv()
 
 class UserWallet(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('provisioning', 'Provisioning'),
+        ('active', 'Active'),
+        ('failed', 'Failed'),
+    ]
+
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='wallet')
     fiat_balance = models.DecimalField(max_digits=9, decimal_places=2, default=0)
     public_key = models.CharField(max_length=256, blank=True, null=True)
@@ -21,6 +28,17 @@ class UserWallet(models.Model):
     recipient_id = models.CharField(max_length=100, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Hedera account provisioning (runs in the background after signup)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    provisioning_attempts = models.IntegerField(default=0)
+    provisioning_error = models.TextField(blank=True)
+    provisioned_at = models.DateTimeField(blank=True, null=True)
+
+    @property
+    def is_provisioned(self):
+        """Wallet has a Hedera account associated with the STAR token"""
+        return self.status == 'active' and bool(self.recipient_id)
+
     def save(self, *args, **kwargs):
         """Encrypt private keys before saving."""
         if self.private_key:
@@ -62,4 +80,12 @@ class UserWallet(models.Model):
             raise ValueError(f"Decryption error: {e}")
 
     def __str__(self):
-        return f"{self.user.username} Wallet"
\ No newline at end of file
+        return f"{self.user.username} Wallet"
+class NFTMetadata(models.Model):
+    """An NFT metadata document, addressed by the hash of its content (see core.nft_metadata)"""
+    digest = models.CharField(max_length=43, primary_key=True)  # unpadded base64url SHA-256
+    content = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.digest
@@ -0,0 +1,34 @@
+import base64
+import hashlib
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from .models import NFTMetadata
+
+# Hedera keeps at most 100 bytes of metadata per NFT, so full HIP-412 documents
+# are stored here under the hash of their bytes and served by
+# core.views.nft_metadata; the token only carries the document's URI. The
+# same document always gets the same URI, so storing it again is a no-op.
+MAX_ONCHAIN_METADATA_BYTES = 100
+
+def content_digest(content):
+    """Unpadded base64url SHA-256 of a document (43 characters)"""
+    digest = hashlib.sha256(content.encode('utf-8')).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+def metadata_uri(digest):
+    if not settings.NFT_METADATA_BASE_URL:
+        raise ImproperlyConfigured("NFT_METADATA_BASE_URL is not set; refusing to mint metadata URIs")
+    uri = f"{settings.NFT_METADATA_BASE_URL}{digest}"
+    if len(uri.encode('utf-8')) > MAX_ONCHAIN_METADATA_BYTES:
+        raise ValueError(
+            f"NFT metadata URI is {len(uri)} bytes, over the {MAX_ONCHAIN_METADATA_BYTES}-byte limit; "
+            f"shorten NFT_METADATA_BASE_URL"
+        )
+    return uri
+
+def store_metadata(content):
+    """Store a serialized metadata document. Returns (digest, uri)."""
+    digest = content_digest(content)
+    uri = metadata_uri(digest)
+    NFTMetadata.objects.bulk_create([NFTMetadata(digest=digest, content=content)], ignore_conflicts=True)
+    return digest, uri
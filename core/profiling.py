@@ -0,0 +1,164 @@
+"""Per-request profiling primitives.
+
+A profile is bound to the current request through a context variable by
+``core.middleware.RequestProfilingMiddleware``. Code outside a sampled request
+sees no active profile, so every recorder below is a cheap no-op there.
+"""
+import contextvars
+import functools
+import inspect
+import re
+import time
+from collections import Counter
+from django.core.cache.backends.base import BaseCache
+
+_current_profile = contextvars.ContextVar('request_profile', default=None)
+
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+class RequestProfile:
+    """Everything recorded while serving one request"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []         # (sql, duration_ms)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.external_calls = []  # (service, name, duration_ms, ok)
+
+    @property
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def sql_ms(self):
+        return sum(duration for _, duration in self.queries)
+
+    @property
+    def external_ms(self):
+        return sum(call[2] for call in self.external_calls)
+
+    def duplicate_queries(self, threshold):
+        """SQL statements (ignoring parameters) executed at least ``threshold`` times.
+        These are almost always N+1 loops."""
+        counts = Counter(_normalize_sql(sql) for sql, _ in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count >= threshold]
+
+
+def _normalize_sql(sql):
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def start_profile():
+    profile = RequestProfile()
+    token = _current_profile.set(profile)
+    return profile, token
+
+
+def stop_profile(token):
+    _current_profile.reset(token)
+
+
+def current_profile():
+    return _current_profile.get()
+
+
+def sql_execute_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook recording every query and its duration"""
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries.append((sql, (time.perf_counter() - start) * 1000))
+
+
+def record_cache_lookup(hits, misses):
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.cache_hits += hits
+        profile.cache_misses += misses
+
+
+def _call_succeeded(result):
+    return not (isinstance(result, dict) and result.get('status') == 'failed')
+
+
+def profile_external_call(service):
+    """Decorator recording the duration of a Hedera/mirror-node call (sync or async)"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                profile = _current_profile.get()
+                if profile is None:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter()
+                ok = False
+                try:
+                    result = await func(*args, **kwargs)
+                    ok = _call_succeeded(result)
+                    return result
+                finally:
+                    profile.external_calls.append(
+                        (service, func.__name__, (time.perf_counter() - start) * 1000, ok)
+                    )
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = _call_succeeded(result)
+                return result
+            finally:
+                profile.external_calls.append(
+                    (service, func.__name__, (time.perf_counter() - start) * 1000, ok)
+                )
+        return wrapper
+    return decorator
+
+
+_MISSING = object()
+_instrumented_backends = set()
+
+
+def instrument_cache_backend(backend_class):
+    """Count hits and misses on a cache backend class (idempotent)"""
+    if backend_class in _instrumented_backends:
+        return
+    _instrumented_backends.add(backend_class)
+
+    original_get = backend_class.get
+    original_get_many = backend_class.get_many
+
+    @functools.wraps(original_get)
+    def get(self, key, default=None, version=None):
+        value = original_get(self, key, _MISSING, version=version)
+        if value is _MISSING:
+            record_cache_lookup(0, 1)
+            return default
+        record_cache_lookup(1, 0)
+        return value
+
+    @functools.wraps(original_get_many)
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = original_get_many(self, keys, version=version)
+        record_cache_lookup(len(found), len(keys) - len(found))
+        return found
+
+    backend_class.get = get
+    # BaseCache.get_many loops over get(), which is already counted
+    if original_get_many is not BaseCache.get_many:
+        backend_class.get_many = get_many
@@ -0,0 +1,68 @@
+import functools
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+# Counters live in the default cache. With the default LocMemCache every
+# process counts on its own, so N workers let through up to N x limit per
+# window; set REDIS_URL (see settings.CACHES) to share counters.
+
+# Used for actions missing from settings.RATE_LIMITS
+DEFAULT_RATE_LIMIT = {'limit': 5, 'timeout': 300}
+
+def get_rate_limit_config(action):
+    return settings.RATE_LIMITS.get(action, DEFAULT_RATE_LIMIT)
+
+def check_rate_limit(action, identity, limit=None, timeout=None):
+    """Count one hit for ``identity`` on ``action``.
+
+    Returns (allowed, retry_after_seconds). Windows are fixed and aligned to
+    the clock, so the counter key changes each window and its TTL is set once
+    on creation. The common path is a single atomic ``incr``; ``add`` is only
+    needed for the first hit of a window.
+    """
+    if limit is None or timeout is None:
+        config = get_rate_limit_config(action)
+        limit = config['limit'] if limit is None else limit
+        timeout = config['timeout'] if timeout is None else timeout
+
+    now = time.time()
+    window = int(now // timeout)
+    key = f"rate_limit:{action}:{identity}:{window}"
+    retry_after = max(1, int((window + 1) * timeout - now))
+
+    try:
+        count = cache.incr(key)
+    except ValueError:
+        # First hit this window. Another worker may win the add, so fall back to incr.
+        if cache.add(key, 1, retry_after + 1):
+            count = 1
+        else:
+            count = cache.incr(key)
+
+    return count <= limit, retry_after
+
+def rate_limit_identity(request):
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return f"ip:{request.META.get('REMOTE_ADDR', 'unknown')}"
+
+def rate_limit(action, message='Rate limit exceeded. Please wait before trying again.'):
+    """View decorator returning 429 once the caller exceeds the action's limit.
+    Place it below ``login_required`` so limits are counted per user."""
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            allowed, retry_after = check_rate_limit(action, rate_limit_identity(request))
+            if not allowed:
+                response = JsonResponse({
+                    'success': False,
+                    'error': message,
+                    'retry_after': retry_after
+                }, status=429)
+                response['Retry-After'] = str(retry_after)
+                return response
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
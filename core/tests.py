@@ -1,3 +1,75 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.http import HttpResponse
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from core.models import UserWallet
+from core.rate_limit import check_rate_limit, DEFAULT_RATE_LIMIT, get_rate_limit_config
+from ventures.models import Venture
 
-# Create your tests here.
+class DashboardTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='investor')
+        # Not provisioned yet, so the dashboard makes no mirror-node calls
+        UserWallet.objects.create(user=self.user, status='pending')
+        self.client.force_login(self.user)
+
+    def test_dashboard_renders(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_buy_ticket_modal_targets_an_open_venture(self):
+        now = timezone.now()
+        venture = Venture.objects.create(
+            name='Open Venture', slug='open-venture', description='Open for funding', founder=self.user,
+            funding_goal=Decimal('1000'), ticket_price=Decimal('10'), status='funding',
+            funding_start=now - timedelta(days=1), funding_end=now + timedelta(days=1),
+        )
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, f'data-venture-id="{venture.id}"')
+
+
+class BenchmarkCommandTests(TestCase):
+    def seed(self):
+        call_command('seed_perf_data', users=20, ventures=2, investors_per_venture=10, puzzles_per_game=3,
+                     sessions_per_game=20, nft_holders=10, proposals=3, votes_per_proposal=5, stdout=StringIO())
+
+    def test_benchmarks_run_against_seeded_data(self):
+        self.seed()
+        out = StringIO()
+        call_command('run_benchmarks', iterations=1, warmup=0, stdout=out)
+        self.assertIn('Benchmark complete', out.getvalue())
+        self.assertNotIn('FAILED', out.getvalue())
+
+    def test_benchmarks_require_seed_data(self):
+        with self.assertRaisesMessage(CommandError, 'No seeded data found'):
+            call_command('run_benchmarks', iterations=1, warmup=0, stdout=StringIO())
+
+    def test_error_responses_fail_the_run(self):
+        self.seed()
+        out = StringIO()
+        with mock.patch('django.test.Client.get', return_value=HttpResponse(status=500)):
+            with self.assertRaisesMessage(CommandError, 'Non-2xx responses from: governance_stats'):
+                call_command('run_benchmarks', iterations=1, warmup=0, endpoint=['governance_stats'], stdout=out)
+        self.assertIn('FAILED', out.getvalue())
+
+
+class RateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(RATE_LIMITS={'cast_vote': {'limit': 2, 'timeout': 300}})
+    def test_limits_come_from_settings(self):
+        self.assertEqual(get_rate_limit_config('cast_vote'), {'limit': 2, 'timeout': 300})
+        self.assertEqual(get_rate_limit_config('unknown_action'), DEFAULT_RATE_LIMIT)
+        results = [check_rate_limit('cast_vote', 'user:1')[0] for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+        self.assertTrue(check_rate_limit('cast_vote', 'user:2')[0])
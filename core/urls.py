@@ -13,7 +13,11 @@ urlpatterns = [
     path('dashboard/wallet-details/', views.get_wallet_details, name='wallet_details'),
     path('dashboard/submit-strategy/', views.submit_strategy_view, name='submit_strategy'),
     
+    # Content-addressed NFT metadata (the URI minted on-chain)
+    path('nft/<str:digest>', views.nft_metadata, name='nft_metadata'),
+    
     # API endpoints
     path('api/wallet/balance/', views.get_wallet_balance, name='api_wallet_balance'),
+    path('api/wallet/status/', views.get_wallet_status, name='api_wallet_status'),
     path('api/games/active/', views.get_active_games, name='api_active_games'),
 ]
\ No newline at end of file
@@ -1,14 +1,14 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpResponse
 from django.contrib import messages
-from django.views.decorators.http import require_http_methods
+from django.views.decorators.http import require_http_methods, etag
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
 from django.db.models import Sum, Count, Q
 from django.core.cache import cache
-from django.views.decorators.cache import cache_page
+from django.views.decorators.cache import cache_page, cache_control
 from django.db import transaction
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponseRedirect
@@ -20,16 +20,20 @@ import requests
 import os
 from dotenv import load_dotenv
 from governance.models import GovernanceNFT, GovernanceTopic, GovernanceProposal, Vote, NFTMarketplace
-from core.models import UserWallet
+from core.models import UserWallet, NFTMetadata
+from core.fragment_cache import attach_fragment_versions, bump_fragment_version, VENTURE_CARD, USER_WALLET
+from core.wallet_provisioning import schedule_wallet_provisioning
 from hiero.utils import create_new_account
 from hiero.ft import associate_token, transfer_tokens, fund_pool
 from hiero.nft import create_nft, mint_nft, associate_nft
 from hiero.hcs import submit_message
 from core.main import generate_star_convergence_with_mapping
 from hiero.mirror_node import get_balance
+from hiero.async_mirror_node import aget_balance
 from django.core.paginator import Paginator
 from django.db.models import F, ExpressionWrapper, DecimalField
 from datetime import datetime, timedelta
+from decimal import Decimal
 import json
 from hiero_sdk_python import (
     AccountId,
@@ -50,22 +54,6 @@ def id_generator(size=8, chars=string.ascii_uppercase + string.digits):
     """Optimized random string generator"""
     return ''.join(random.choices(chars, k=size))
 
-def assign_user_wallet(name):
-    """Optimized wallet assignment with better error handling"""
-    try:
-        recipient_id, recipient_private_key, new_account_public_key = create_new_account(name)
-        associate_token(recipient_id, recipient_private_key)
-        
-        return {
-            'status': 'success',
-            'new_account_public_key': new_account_public_key,
-            'recipient_private_key': recipient_private_key,
-            'recipient_id': recipient_id
-        }
-    except Exception as e:
-        logger.error(f"Wallet assignment error: {e}")
-        return {'status': 'failed', 'error': str(e)}
-
 @require_http_methods(["GET", "POST"])
 def register_view(request):
     """Optimized registration view with bulk operations"""
@@ -96,15 +84,9 @@ def register_view(request):
             return redirect('register')
         
         try:
-            # Create wallet first (more expensive operation)
-            wallet_response = assign_user_wallet(name=f"{post_data['first_name']} {post_data['last_name']}")
-            
-            if wallet_response['status'] != 'success':
-                messages.warning(request, "Wallet creation failed")
-                return redirect('register')
-            
-            # Bulk create user and wallet
-            with transaction.atomic():  # Fixed transaction import
+            # Create user and a pending wallet; the Hedera account is
+            # provisioned in the background once this transaction commits
+            with transaction.atomic():
                 user = User.objects.create_user(
                     username=email,  # Use email as username for faster lookup
                     email=email,
@@ -113,16 +95,12 @@ def register_view(request):
                     password=post_data['password']
                 )
                 
-                UserWallet.objects.create(
-                    user=user,
-                    public_key=wallet_response['new_account_public_key'],
-                    private_key=wallet_response['recipient_private_key'],
-                    recipient_id=wallet_response['recipient_id']
-                )
+                wallet = UserWallet.objects.create(user=user, status='pending')
+                schedule_wallet_provisioning(wallet.id)
             
             # Cache the new user
             cache.set(cache_key, True, 300)
-            messages.success(request, "Account created successfully")
+            messages.success(request, "Account created successfully. Your Hedera wallet is being set up.")
             return redirect('login')
             
         except Exception as e:
@@ -188,20 +166,8 @@ def logout_view(request):
 
 @cache_page(300)  # Cache for 5 minutes
 def landing(request):
-    """Optimized landing page with selective field loading"""
-    cache_key = "landing_page_data"
-    cached_data = cache.get(cache_key)
-    
-    if cached_data:
-        return render(request, 'landing.html', cached_data)
-    
-   
-    context = {
-        
-    }
-    
-    cache.set(cache_key, context, 300)
-    return render(request, 'landing.html', context)
+    """Landing page (whole response cached by cache_page)"""
+    return render(request, 'landing.html', {})
 
 
 @login_required
@@ -229,7 +195,7 @@ def dashboard_view(request):
     
     all_ventures = Venture.objects.filter(
         status__in=['funding', 'active']
-    ).order_by('-created_at')
+    ).select_related('founder').order_by('-created_at')
 
     # Get 2 active ventures for overview
     active_ventures = all_ventures[:2]
@@ -250,18 +216,11 @@ def dashboard_view(request):
         total=Sum('equity_percentage')
     )['total'] or 0
     
-    portfolio_value = total_invested * 1.2  # Simple calculation
+    portfolio_value = total_invested * Decimal('1.2')  # Simple calculation
     
-    # Get investor data for each venture
-    for venture in all_ventures:
-        # Get top 3 investors for each venture
-        top_investors = VentureOwnership.objects.filter(
-            venture=venture
-        ).order_by('-investment_amount')[:3]
-        venture.top_investors = list(top_investors)
-        venture.investor_count = VentureOwnership.objects.filter(
-            venture=venture
-        ).count()
+    # Venture cards (incl. top investors) render from cache until the venture
+    # or its ownerships change; investor queries only run on a cache miss
+    attach_fragment_versions(all_ventures, VENTURE_CARD, attr='card_version')
     
     
     try:
@@ -275,13 +234,17 @@ def dashboard_view(request):
         
         
         
-        # Wallet data with simulated blockchain info
+        # Wallet data with simulated blockchain info (no Hedera calls until provisioned)
+        star_balance = get_balance(wallet.recipient_id) if wallet.is_provisioned else 0
+        public_key = wallet.public_key or ''
         wallet_data = {
-            'public_key': wallet.public_key[:20] + '...' + wallet.public_key[-20:],
-            'full_public_key': wallet.public_key,
+            'status': wallet.status,
+            'is_provisioned': wallet.is_provisioned,
+            'public_key': public_key[:20] + '...' + public_key[-20:] if public_key else 'Provisioning...',
+            'full_public_key': public_key,
             'hedera_id': wallet.recipient_id,
-            'balance': get_balance(wallet.recipient_id) if hasattr(wallet, 'recipient_id') else 0,
-            'star_tokens': get_balance(wallet.recipient_id) if hasattr(wallet, 'recipient_id') else 0,
+            'balance': star_balance,
+            'star_tokens': star_balance,
             'tickets': owned_tickets.count(),
             'nfts': owned_tickets.count(),
             'recent_transactions': [
@@ -318,7 +281,7 @@ def dashboard_view(request):
         # User stats
         user_stats = {
             'total_ventures': active_ventures.count(),
-            'total_invested': sum(v['value'] * v['equity'] / 100 for v in user_ventures),
+            'total_invested': total_invested,
             'total_wins': 3,
             'total_tickets': wallet_data['tickets'],
             'win_rate': 25,  # percentage
@@ -345,6 +308,7 @@ def dashboard_view(request):
             'wallet': wallet,
             'wallet_data': wallet_data,
             'active_ventures': active_ventures,
+            'funding_ventures': active_ventures_,  # The dashboard's buy-ticket modal targets the newest one
             'user_ventures': user_ventures,
             'user_stats': user_stats,
             'leaderboard': leaderboard,
@@ -421,17 +385,38 @@ def update_profile_view(request):
 
 
 @login_required
-def get_wallet_details(request):
+@require_http_methods(["GET"])
+def get_wallet_status(request):
+    """API endpoint for the background wallet provisioning status"""
+    wallet = UserWallet.objects.filter(user=request.user).only(
+        'status', 'recipient_id', 'provisioning_attempts', 'provisioned_at'
+    ).first()
+    if not wallet:
+        return JsonResponse({'success': False, 'error': 'Wallet not found'}, status=404)
+    
+    return JsonResponse({
+        'success': True,
+        'status': wallet.status,
+        'is_provisioned': wallet.is_provisioned,
+        'hedera_id': wallet.recipient_id if wallet.is_provisioned else None,
+        'attempts': wallet.provisioning_attempts,
+        'provisioned_at': wallet.provisioned_at,
+    })
+
+@login_required
+async def get_wallet_details(request):
     """Get detailed wallet information"""
     try:
-        wallet = UserWallet.objects.get(user=request.user)
+        user = await request.auser()
+        wallet = await UserWallet.objects.aget(user=user)
         
-        # Get actual balance from Hedera (simulated)
-        balance = get_balance(wallet.recipient_id) if hasattr(wallet, 'recipient_id') else 0
+        # Get actual balance from the mirror node without blocking a worker
+        balance = await aget_balance(wallet.recipient_id) if wallet.is_provisioned else 0
         
         return JsonResponse({
             'success': True,
             'wallet': {
+                'status': wallet.status,
                 'public_key': wallet.public_key,
                 'hedera_id': wallet.recipient_id,
                 'balance': balance,
@@ -475,11 +460,12 @@ def submit_strategy_view(request):
 
 
 @login_required
-def get_wallet_balance(request):
+async def get_wallet_balance(request):
     """API endpoint for wallet balance"""
     try:
-        wallet = UserWallet.objects.get(user=request.user)
-        balance = get_balance(wallet.recipient_id) if hasattr(wallet, 'recipient_id') else 0
+        user = await request.auser()
+        wallet = await UserWallet.objects.aget(user=user)
+        balance = await aget_balance(wallet.recipient_id) if wallet.is_provisioned else 0
         
         return JsonResponse({
             'success': True,
@@ -528,6 +514,8 @@ def buy_star(request):
             messages.warning(request, "Failed to Transfer ASTRA. Try again later.")
             return HttpResponseRedirect(request.META.get('HTTP_REFERER'))
         else:
+            # The new balance must show in the invest checks cached for this user
+            bump_fragment_version(USER_WALLET, user.id)
             messages.success(request, f"{amount} ASTRA Transfered successfully to your account. Check your phone.")
             return HttpResponseRedirect(request.META.get('HTTP_REFERER'))
     
@@ -541,6 +529,16 @@ def buy_star(request):
         messages.warning(request, "nternal server error.")
         return HttpResponseRedirect(request.META.get('HTTP_REFERER'))
 
+@require_http_methods(["GET", "HEAD"])
+@cache_control(public=True, max_age=31536000, immutable=True)
+@etag(lambda request, digest: digest)
+def nft_metadata(request, digest):
+    """Serve a stored NFT metadata document. Public, as wallets and explorers fetch
+    it without a session; content-addressed, so it can be cached forever."""
+    document = get_object_or_404(NFTMetadata, digest=digest)
+    return HttpResponse(document.content, content_type='application/json')
+
+
 '''
 @login_required(login_url="login")
 def pay_mpesa(request):
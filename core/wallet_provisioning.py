@@ -0,0 +1,96 @@
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.db import transaction, close_old_connections
+from django.utils import timezone
+from hiero_sdk_python import PrivateKey
+from core.models import UserWallet
+from hiero.utils import create_new_account
+from hiero.ft import associate_token
+
+logger = logging.getLogger(__name__)
+
+# Background provisioning settings
+PROVISIONING_WORKERS = 4
+MAX_PROVISIONING_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 2  # Doubled after every failed attempt
+
+_executor = ThreadPoolExecutor(max_workers=PROVISIONING_WORKERS, thread_name_prefix='wallet-provisioning')
+
+def schedule_wallet_provisioning(wallet_id):
+    """Provision the wallet in a background worker once the signup transaction commits"""
+    transaction.on_commit(lambda: _executor.submit(_run_provisioning, wallet_id))
+
+def _run_provisioning(wallet_id):
+    try:
+        provision_wallet(wallet_id)
+    except Exception as e:
+        logger.error(f"Wallet provisioning crashed for wallet {wallet_id}: {e}")
+    finally:
+        close_old_connections()
+
+def _load_private_key(wallet):
+    """Rebuild the account key from the encrypted value stored on the wallet"""
+    match = re.search(r"hex=([0-9a-fA-F]+)", wallet.decrypt_key())
+    if not match:
+        raise ValueError("Stored private key is not in the expected format")
+    return PrivateKey.from_string(match.group(1))
+
+def _provision_step(wallet, private_key=None):
+    """Run whichever Hedera step is still outstanding. Each step is persisted
+    so a retry never creates a second account for the same user."""
+    if not wallet.recipient_id:
+        account = create_new_account(wallet.user.get_full_name() or wallet.user.username)
+        if not account:
+            raise RuntimeError("Hedera account creation failed")
+
+        recipient_id, private_key, public_key = account
+        wallet.recipient_id = str(recipient_id)
+        wallet.public_key = str(public_key)
+        wallet.private_key = private_key
+        wallet.save(update_fields=['recipient_id', 'public_key', 'private_key'])
+
+    association = associate_token(wallet.recipient_id, private_key or _load_private_key(wallet))
+    if association['status'] != 'success':
+        raise RuntimeError(f"Token association failed: {association.get('error')}")
+    return private_key
+
+def provision_wallet(wallet_id, max_attempts=MAX_PROVISIONING_ATTEMPTS, backoff=RETRY_BACKOFF_SECONDS):
+    """Create the Hedera account and STAR association for a pending wallet.
+
+    Returns the wallet, or None if another worker already claimed it.
+    """
+    # Claim the wallet atomically so two workers never provision it twice
+    claimed = UserWallet.objects.filter(
+        id=wallet_id, status__in=['pending', 'failed']
+    ).update(status='provisioning')
+    if not claimed:
+        return None
+
+    wallet = UserWallet.objects.select_related('user').get(id=wallet_id)
+    private_key = None
+
+    for attempt in range(1, max_attempts + 1):
+        wallet.provisioning_attempts += 1
+        try:
+            private_key = _provision_step(wallet, private_key)
+        except Exception as e:
+            logger.warning(f"Wallet provisioning attempt {attempt} failed for user {wallet.user_id}: {e}")
+            wallet.provisioning_error = str(e)
+            wallet.save(update_fields=['provisioning_attempts', 'provisioning_error'])
+            if attempt < max_attempts:
+                time.sleep(backoff * 2 ** (attempt - 1))
+            continue
+
+        wallet.status = 'active'
+        wallet.provisioning_error = ''
+        wallet.provisioned_at = timezone.now()
+        wallet.save(update_fields=['status', 'provisioning_attempts', 'provisioning_error', 'provisioned_at'])
+        logger.info(f"Wallet provisioned for user {wallet.user_id}: {wallet.recipient_id}")
+        return wallet
+
+    wallet.status = 'failed'
+    wallet.save(update_fields=['status'])
+    logger.error(f"Wallet provisioning gave up for user {wallet.user_id} after {max_attempts} attempts")
+    return wallet
@@ -1,5 +1,6 @@
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from core.fragment_cache import bump_fragment_version, GAME_HUB
 from .models import VentureGame, Leaderboard, PlayerSession
 
 @receiver(post_save, sender=VentureGame)
@@ -29,4 +30,11 @@ def generate_puzzles_for_game(sender, instance, created, **kwargs):
             Puzzle.objects.create(
                 venture_game=instance,
                 puzzle_number=i
-            )
\ No newline at end of file
+            )
+
+@receiver([post_save, post_delete], sender=VentureGame)
+@receiver([post_save, post_delete], sender=PlayerSession)
+def invalidate_game_hub_fragments(sender, instance, **kwargs):
+    """Re-render game hub tiles and leaderboard for the venture"""
+    venture_id = instance.venture_id if sender is VentureGame else instance.venture_game.venture_id
+    bump_fragment_version(GAME_HUB, venture_id)
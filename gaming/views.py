@@ -4,9 +4,13 @@ from django.contrib import messages
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
+from django.db.models import Count
+from django.utils.functional import SimpleLazyObject
 import json
 from .models import VentureGame, Puzzle, PlayerSession, Leaderboard
 from ventures.models import Venture
+from core.fragment_cache import get_fragment_version, GAME_HUB
+from core.rate_limit import rate_limit
 
 def is_admin(user):
     return user.is_staff
@@ -15,8 +19,9 @@ def is_admin(user):
 @login_required
 def game_hub(request, venture_id):
     venture = get_object_or_404(Venture, id=venture_id)
-    print(venture)
-    games = VentureGame.objects.filter(venture=venture, is_active=True)
+    games = VentureGame.objects.filter(venture=venture, is_active=True).annotate(
+        puzzle_count=Count('puzzles')
+    )
     
     # Get completion stats
     completed_puzzles = {}
@@ -29,18 +34,19 @@ def game_hub(request, venture_id):
         ).count()
         completed_puzzles[game.id] = completed
     
-    # Get leaderboard data
-    leaderboard_data = []
-    for game in games:
-        leaderboard = Leaderboard.objects.filter(venture_game=game).first()
-        if leaderboard:
+    # Get leaderboard data (only built when the hub fragment is not cached)
+    def build_leaderboard_data():
+        leaderboard_data = []
+        for leaderboard in Leaderboard.objects.filter(venture_game__in=games):
             leaderboard_data.extend(leaderboard.top_scores[:10])
+        return leaderboard_data
     
     context = {
         'venture': venture,
         'games': games,
         'completed_puzzles': completed_puzzles,
-        'leaderboards': leaderboard_data,
+        'leaderboards': SimpleLazyObject(build_leaderboard_data),
+        'hub_version': get_fragment_version(GAME_HUB, venture.pk),
     }
     return render(request, 'gaming/game_hub.html', context)
 
@@ -137,6 +143,7 @@ def create_venture_game(request):
 
 @login_required
 @require_POST
+@rate_limit('submit_solution')
 def submit_solution(request, session_id):
     try:
         session = get_object_or_404(PlayerSession, id=session_id, player=request.user)
@@ -209,6 +216,7 @@ def download_puzzle(request, venture_id):
 # API Views
 @csrf_exempt
 @require_POST
+@rate_limit('use_hint')
 def api_use_hint(request, session_id):
     try:
         data = json.loads(request.body)
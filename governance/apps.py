@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GovernanceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "governance"
+
+    def ready(self):
+        import governance.signals
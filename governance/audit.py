@@ -0,0 +1,144 @@
+import json
+import os
+import threading
+from collections import Counter
+from .models import Vote
+from .vote_anchoring import vote_message
+
+# Votes are read from the database in chunks of this size, in sequence number order
+LOCAL_CHUNK_SIZE = 1000
+# How often (in merged sequence numbers) a topic's progress is written to the checkpoint
+CHECKPOINT_EVERY = 1000
+
+def iter_local_votes(topic, after_sequence=0, chunk_size=LOCAL_CHUNK_SIZE):
+    """Yield a topic's anchored votes in sequence number order, one keyset chunk at a time"""
+    votes = (
+        Vote.objects.filter(proposal__topic=topic, hcs_sequence_number__isnull=False)
+        .select_related('voter')
+        .order_by('hcs_sequence_number')
+    )
+    last = after_sequence
+    while True:
+        chunk = list(votes.filter(hcs_sequence_number__gt=last)[:chunk_size])
+        if not chunk:
+            return
+        yield from chunk
+        last = chunk[-1].hcs_sequence_number
+
+def merge_by_sequence(votes, messages):
+    """Merge-join two streams already sorted by sequence number.
+
+    Yields (sequence_number, vote, message) with ``vote`` or ``message`` set
+    to None when only one side has that sequence number. Only the current
+    item of each stream is held in memory.
+    """
+    vote = next(votes, None)
+    message = next(messages, None)
+    while vote is not None or message is not None:
+        vote_seq = vote.hcs_sequence_number if vote is not None else None
+        message_seq = message['sequence_number'] if message is not None else None
+        if message is None or (vote is not None and vote_seq < message_seq):
+            yield vote_seq, vote, None
+            vote = next(votes, None)
+        elif vote is None or message_seq < vote_seq:
+            yield message_seq, None, message
+            message = next(messages, None)
+        else:
+            yield vote_seq, vote, message
+            vote = next(votes, None)
+            message = next(messages, None)
+
+def find_unsequenced_vote(text):
+    """The local vote for a ``VOTE:`` message that was anchored before sequence numbers were recorded"""
+    try:
+        _, proposal_id, username, choice, power = text.split(':')
+        proposal_id = int(proposal_id)
+    except ValueError:
+        return None
+    return (
+        Vote.objects.select_related('voter')
+        .filter(proposal_id=proposal_id, voter__username=username, hcs_sequence_number__isnull=True)
+        .first()
+    )
+
+def audit_topic(topic, messages, after_sequence=0, on_mismatch=None, on_progress=None, backfill=False):
+    """Compare one topic's votes with its on-chain messages. Returns a Counter of outcomes.
+
+    ``messages`` is a sequence-ordered stream such as
+    ``hiero.mirror_node.iter_topic_messages``. Outcomes:
+
+    - matched: the message at the vote's sequence number is the vote
+    - content_mismatch: a different message sits at the vote's sequence number
+    - missing_on_chain: the vote's sequence number has no message
+    - unknown_on_chain: a vote message with no local vote
+    - matched_legacy: a vote message for a local vote anchored before
+      sequence numbers were recorded (saved with ``backfill``)
+    - other_messages: results and other non-vote traffic on the topic
+    """
+    counts = Counter()
+    last_checkpoint = after_sequence
+
+    def report(kind, sequence_number, vote=None, message=None):
+        counts[kind] += 1
+        if on_mismatch:
+            on_mismatch({
+                'kind': kind,
+                'topic_id': topic.topic_id,
+                'sequence_number': sequence_number,
+                'vote_id': vote.id if vote else None,
+                'expected': vote_message(vote) if vote else None,
+                'found': message['message'] if message else None,
+            })
+
+    merged = merge_by_sequence(iter_local_votes(topic, after_sequence), messages)
+    for sequence_number, vote, message in merged:
+        if vote is not None and message is not None:
+            if message['message'] == vote_message(vote):
+                counts['matched'] += 1
+            else:
+                report('content_mismatch', sequence_number, vote, message)
+        elif vote is not None:
+            report('missing_on_chain', sequence_number, vote=vote)
+        elif not message['message'].startswith('VOTE:'):
+            counts['other_messages'] += 1
+        else:
+            legacy = find_unsequenced_vote(message['message'])
+            if legacy is not None and vote_message(legacy) == message['message']:
+                counts['matched_legacy'] += 1
+                if backfill:
+                    Vote.objects.filter(id=legacy.id).update(hcs_sequence_number=sequence_number)
+            else:
+                report('unknown_on_chain', sequence_number, message=message)
+
+        if on_progress and sequence_number - last_checkpoint >= CHECKPOINT_EVERY:
+            on_progress(topic.topic_id, sequence_number)
+            last_checkpoint = sequence_number
+
+    if on_progress and counts:
+        on_progress(topic.topic_id, max(last_checkpoint, sequence_number))
+    return counts
+
+class Checkpoint:
+    """Last verified sequence number per topic, saved to a JSON file so an audit can resume"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.positions = {}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.positions = json.load(f)
+
+    def get(self, topic_id):
+        return self.positions.get(topic_id, 0)
+
+    def update(self, topic_id, sequence_number):
+        with self._lock:
+            self.positions[topic_id] = sequence_number
+            if not self.path:
+                return
+            # Write then rename so an interrupted run never leaves a truncated file
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.positions, f)
+            os.replace(tmp_path, self.path)
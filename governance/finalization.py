@@ -0,0 +1,94 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+from core.fragment_cache import PROPOSAL_FEED, GOVERNANCE_STATS
+from hiero.governance import submit_message
+from .models import GovernanceProposal, Vote
+from .signals import invalidate_on_commit
+
+logger = logging.getLogger(__name__)
+
+FINALIZE_BATCH_SIZE = 1000
+RESULT_ANCHORING_WORKERS = 8
+
+TALLY_FIELDS = list(GovernanceProposal.TALLY_FIELDS.values()) + ['voter_count']
+
+def expired_proposals(now=None):
+    """Active proposals whose voting window has closed (served by proposal_status_end_idx)"""
+    return GovernanceProposal.objects.filter(status='active', voting_end__lte=now or timezone.now())
+
+def final_tallies(proposal_ids):
+    """{proposal_id: {tally field: value}} for many proposals in one grouped query"""
+    tallies = {proposal_id: dict.fromkeys(TALLY_FIELDS, 0) for proposal_id in proposal_ids}
+    rows = (
+        Vote.objects.filter(proposal_id__in=proposal_ids)
+        .values('proposal_id', 'vote')
+        .annotate(power=Sum('voting_power'), voters=Count('id'))
+    )
+    for row in rows:
+        field = GovernanceProposal.TALLY_FIELDS.get(row['vote'])
+        if field is None:
+            continue
+        tallies[row['proposal_id']][field] = row['power'] or 0
+        tallies[row['proposal_id']]['voter_count'] += row['voters']
+    return tallies
+
+def finalize_batch(now, batch_size=FINALIZE_BATCH_SIZE):
+    """Finalize up to ``batch_size`` expired proposals. Returns the finalized proposals."""
+    with transaction.atomic():
+        # skip_locked lets several finalizers run side by side without double work
+        batch = list(
+            expired_proposals(now)
+            .select_for_update(skip_locked=True)
+            .select_related('topic')
+            .order_by('voting_end', 'id')[:batch_size]
+        )
+        if not batch:
+            return []
+
+        tallies = final_tallies([proposal.id for proposal in batch])
+        for proposal in batch:
+            # The vote table is authoritative, so any counter drift is repaired here too
+            for field, value in tallies[proposal.id].items():
+                setattr(proposal, field, value)
+            passed = proposal.total_power > 0 and proposal.yes_percentage >= proposal.min_approval_percentage
+            proposal.status = 'passed' if passed else 'rejected'
+
+        GovernanceProposal.objects.bulk_update(batch, ['status'] + TALLY_FIELDS)
+        # bulk_update skips post_save, so invalidate the feed and stats explicitly
+        invalidate_on_commit((PROPOSAL_FEED, 'active'), (GOVERNANCE_STATS, 'all'))
+    return batch
+
+def finalize_expired_proposals(now=None, batch_size=FINALIZE_BATCH_SIZE):
+    """Finalize every proposal that has expired by ``now``, one batch at a time"""
+    now = now or timezone.now()
+    finalized = []
+    while True:
+        batch = finalize_batch(now, batch_size)
+        finalized.extend(batch)
+        if len(batch) < batch_size:
+            return finalized
+
+def result_message(proposal):
+    return (
+        f"RESULT:{proposal.id}:{proposal.status}:{proposal.yes_power}:"
+        f"{proposal.no_power}:{proposal.abstain_power}:{proposal.voter_count}"
+    )
+
+def anchor_results(proposals):
+    """Publish final results to each proposal's topic. Returns (anchored, failed) counts."""
+    def anchor(proposal):
+        try:
+            result = submit_message(result_message(proposal), proposal.topic.topic_id)
+        except Exception as e:
+            result = {'status': 'failed', 'message': str(e)}
+        if result['status'] != 'success':
+            logger.error(f"Result anchoring failed for proposal {proposal.id}: {result.get('message')}")
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=RESULT_ANCHORING_WORKERS) as executor:
+        outcomes = list(executor.map(anchor, proposals))
+    return outcomes.count(True), outcomes.count(False)
@@ -0,0 +1,46 @@
+from django.db.models import Count, F
+from core.fragment_cache import GOVERNANCE_STATS
+from .models import GovernanceNFT, TierInventory
+from .signals import invalidate_on_commit
+
+def reserve_tier_unit(tier):
+    """Claim one unit of a tier's supply. Returns False when the tier is sold out.
+
+    A single conditional UPDATE, so concurrent buyers can never take the
+    counter below zero. Run it outside a long transaction so the row lock is
+    released straight away rather than held across minting.
+    """
+    reserved = TierInventory.objects.filter(tier=tier, remaining__gt=0).update(remaining=F('remaining') - 1) == 1
+    if reserved:
+        invalidate_on_commit((GOVERNANCE_STATS, 'all'))
+    return reserved
+
+def release_tier_unit(tier):
+    """Return a reserved unit after a failed mint"""
+    if TierInventory.objects.filter(tier=tier, remaining__lt=F('total')).update(remaining=F('remaining') + 1):
+        invalidate_on_commit((GOVERNANCE_STATS, 'all'))
+
+def get_tier_inventory():
+    """{tier: {'total': n, 'remaining': n}} from the inventory rows"""
+    return {
+        row['tier']: {'total': row['total'], 'remaining': row['remaining']}
+        for row in TierInventory.objects.values('tier', 'total', 'remaining')
+    }
+
+def sync_tier_inventory():
+    """Reset every tier's counter from GovernanceConfig.NFT_LIMITS and the active NFTs"""
+    from .views import GovernanceConfig
+    minted = dict(
+        GovernanceNFT.objects.filter(is_active=True).values_list('tier').annotate(count=Count('id'))
+    )
+    TierInventory.objects.bulk_create(
+        [
+            TierInventory(tier=tier, total=limit, remaining=max(limit - minted.get(tier, 0), 0))
+            for tier, limit in GovernanceConfig.NFT_LIMITS.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['tier'],
+        update_fields=['total', 'remaining', 'updated_at'],
+    )
+    invalidate_on_commit((GOVERNANCE_STATS, 'all'))
+    return get_tier_inventory()
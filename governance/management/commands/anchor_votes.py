@@ -0,0 +1,41 @@
+# management/commands/anchor_votes.py
+from django.core.management.base import BaseCommand
+from governance.models import Vote
+from governance.vote_anchoring import anchor_vote, MAX_ANCHOR_ATTEMPTS
+
+class Command(BaseCommand):
+    help = 'Anchor pending (and optionally failed) votes on their proposal HCS topics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Also retry votes whose background anchoring gave up')
+        parser.add_argument('--reset-stuck', action='store_true',
+                            help='Requeue votes left in "anchoring" by a crashed worker '
+                                 '(only run when no web workers are anchoring)')
+        parser.add_argument('--max-attempts', type=int, default=MAX_ANCHOR_ATTEMPTS)
+        parser.add_argument('--limit', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['reset_stuck']:
+            reset = Vote.objects.filter(status='anchoring').update(status='pending_anchor')
+            self.stdout.write(f"Requeued {reset} stuck votes")
+
+        statuses = ['pending_anchor', 'anchor_failed'] if options['retry_failed'] else ['pending_anchor']
+        vote_ids = list(
+            Vote.objects.filter(status__in=statuses)
+            .order_by('voted_at')
+            .values_list('id', flat=True)[:options['limit']]
+        )
+
+        anchored = failed = 0
+        for vote_id in vote_ids:
+            vote = anchor_vote(vote_id, max_attempts=options['max_attempts'])
+            if vote is None:
+                continue
+            if vote.status == 'anchored':
+                anchored += 1
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"Failed to anchor vote {vote.id}: {vote.anchor_error}"))
+
+        self.stdout.write(self.style.SUCCESS(f'Anchored {anchored} votes, {failed} failed'))
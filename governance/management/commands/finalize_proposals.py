@@ -0,0 +1,36 @@
+# management/commands/finalize_proposals.py
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from governance.finalization import finalize_expired_proposals, anchor_results, FINALIZE_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Close expired proposals: tally their votes and mark them passed or rejected'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=FINALIZE_BATCH_SIZE)
+        parser.add_argument('--anchor-results', action='store_true',
+                            help='Publish each final result to the proposal topic on Hedera')
+        parser.add_argument('--loop', action='store_true', help='Keep running as a scheduler')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between runs with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            self.run_once(options)
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
+
+    def run_once(self, options):
+        started = time.perf_counter()
+        finalized = finalize_expired_proposals(batch_size=options['batch_size'])
+        passed = sum(1 for proposal in finalized if proposal.status == 'passed')
+        self.stdout.write(self.style.SUCCESS(
+            f'Finalized {len(finalized)} proposals ({passed} passed, {len(finalized) - passed} rejected) '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
+
+        if options['anchor_results'] and finalized:
+            anchored, failed = anchor_results(finalized)
+            self.stdout.write(f'Anchored {anchored} results on Hedera, {failed} failed')
@@ -0,0 +1,66 @@
+# management/commands/rebuild_voting_power.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core.fragment_cache import GOVERNANCE_STATS
+from core.models import UserWallet
+from governance.models import GovernanceNFT
+from governance.signals import invalidate_on_commit
+from governance.voting_power import rebuild_voting_power
+from hiero.mirror_node import get_nft_owners
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-user voting power index, optionally syncing NFT ownership from the mirror node first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync-chain', action='store_true',
+                            help='Reassign or deactivate NFTs whose on-chain owner differs from the database')
+        parser.add_argument('--dry-run', action='store_true', help='Report ownership drift without fixing it')
+
+    def handle(self, *args, **options):
+        if options['sync_chain']:
+            self.sync_chain(options['dry_run'])
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS('Dry run: voting power index left unchanged'))
+            return
+
+        holders = rebuild_voting_power()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt voting power for {holders} NFT holders'))
+
+    def sync_chain(self, dry_run):
+        users_by_account = dict(
+            UserWallet.objects.exclude(recipient_id__isnull=True).values_list('recipient_id', 'user_id')
+        )
+        changed = []
+
+        for token_id in GovernanceNFT.objects.values_list('token_id', flat=True).distinct():
+            owners = get_nft_owners(token_id)
+            if owners is None:
+                self.stdout.write(self.style.WARNING(f'Could not fetch owners for token {token_id}, skipping'))
+                continue
+
+            for nft in GovernanceNFT.objects.filter(token_id=token_id).only('id', 'user_id', 'serial_number', 'is_active'):
+                owner_id = users_by_account.get(owners.get(nft.serial_number))
+                if owner_id is None:
+                    # Burned, or held by an account that isn't one of our users
+                    if not nft.is_active:
+                        continue
+                    self.stdout.write(self.style.WARNING(f'NFT {token_id}#{nft.serial_number}: no local owner, deactivating'))
+                    nft.is_active = False
+                elif owner_id != nft.user_id:
+                    self.stdout.write(self.style.WARNING(
+                        f'NFT {token_id}#{nft.serial_number}: owned by user {owner_id} on chain, not {nft.user_id}'
+                    ))
+                    nft.user_id = owner_id
+                else:
+                    continue
+                changed.append(nft)
+
+        if changed and not dry_run:
+            with transaction.atomic():
+                # bulk_update skips the NFT signals; the rebuild that follows covers voting power
+                GovernanceNFT.objects.bulk_update(changed, ['user', 'is_active'], batch_size=500)
+                invalidate_on_commit((GOVERNANCE_STATS, 'all'))
+
+        action = 'Found' if dry_run else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f'{action} {len(changed)} NFTs out of sync with the chain'))
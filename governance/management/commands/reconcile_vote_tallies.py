@@ -0,0 +1,57 @@
+# management/commands/reconcile_vote_tallies.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Sum
+from governance.models import GovernanceProposal, Vote
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized vote tallies on proposals from the Vote table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--proposal', type=int, action='append', dest='proposal_ids',
+                            help='Only reconcile this proposal id (repeatable)')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        tally_fields = list(GovernanceProposal.TALLY_FIELDS.values()) + ['voter_count']
+
+        proposals = GovernanceProposal.objects.all()
+        votes = Vote.objects.all()
+        if options['proposal_ids']:
+            proposals = proposals.filter(id__in=options['proposal_ids'])
+            votes = votes.filter(proposal_id__in=options['proposal_ids'])
+
+        with transaction.atomic():
+            # Lock the rows so a vote landing mid-reconcile isn't overwritten
+            proposals = list(proposals.select_for_update().only('id', 'title', *tally_fields))
+
+            expected = {}
+            rows = votes.values('proposal_id', 'vote').annotate(power=Sum('voting_power'), voters=Count('id'))
+            for row in rows:
+                field = GovernanceProposal.TALLY_FIELDS.get(row['vote'])
+                if field is None:
+                    continue
+                tally = expected.setdefault(row['proposal_id'], dict.fromkeys(tally_fields, 0))
+                tally[field] = row['power'] or 0
+                tally['voter_count'] += row['voters']
+
+            drifted = []
+            for proposal in proposals:
+                tally = expected.get(proposal.id, dict.fromkeys(tally_fields, 0))
+                current = {field: getattr(proposal, field) for field in tally_fields}
+                if current == tally:
+                    continue
+                self.stdout.write(self.style.WARNING(
+                    f"Proposal {proposal.id} ({proposal.title}): stored {current}, actual {tally}"
+                ))
+                for field, value in tally.items():
+                    setattr(proposal, field, value)
+                drifted.append(proposal)
+
+            if drifted and not options['dry_run']:
+                GovernanceProposal.objects.bulk_update(drifted, tally_fields, batch_size=500)
+
+        action = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f'Checked {len(proposals)} proposals. {action} {len(drifted)} with drifted tallies'
+        ))
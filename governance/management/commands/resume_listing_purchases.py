@@ -0,0 +1,48 @@
+# management/commands/resume_listing_purchases.py
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from governance.marketplace import (
+    release_expired_reservations, resume_listing, set_stage, PurchaseError, LISTING_RESERVATION_TIMEOUT,
+)
+from governance.models import NFTMarketplace
+
+class Command(BaseCommand):
+    help = 'Release expired marketplace reservations and resume purchases interrupted mid-settlement'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100)
+
+    def handle(self, *args, **options):
+        released = release_expired_reservations()
+        self.stdout.write(f"Released {released} expired reservations")
+
+        cutoff = timezone.now() - LISTING_RESERVATION_TIMEOUT
+        settling = NFTMarketplace.objects.filter(is_sold=False, reserved_at__lt=cutoff)
+
+        # The payment may or may not have gone through; only the chain can tell
+        unknown = 0
+        for listing in settling.filter(settlement_stage='paying').order_by('reserved_at')[:options['limit']]:
+            unknown += 1
+            if not listing.settlement_error:
+                set_stage(listing, 'paying', 'Payment outcome unknown, check the buyer\'s transfers and resolve by hand')
+            self.stdout.write(self.style.WARNING(f"Listing {listing.id} needs manual review: {listing.settlement_error}"))
+
+        outcomes = {'sold': 0, 'released': 0}
+        failed = 0
+        resumable = (
+            NFTMarketplace.objects.filter(is_sold=False)
+            .filter(Q(settlement_stage='refund_failed') | Q(settlement_stage='paid', reserved_at__lt=cutoff))
+            .select_related('nft').order_by('reserved_at')[:options['limit']]
+        )
+        for listing in resumable:
+            try:
+                outcomes[resume_listing(listing)] += 1
+            except PurchaseError as e:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"Listing {listing.id} {listing.settlement_stage}: {e}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Settled {outcomes['sold']} purchases, refunded {outcomes['released']}, "
+            f"{failed} still failing, {unknown} need manual review"
+        ))
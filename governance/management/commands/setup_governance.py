@@ -1,6 +1,7 @@
 # management/commands/setup_governance.py
 from django.core.management.base import BaseCommand
 from governance.models import GovernanceTopic
+from governance.inventory import sync_tier_inventory
 
 class Command(BaseCommand):
     help = 'Setup initial governance topics'
@@ -37,4 +38,8 @@ class Command(BaseCommand):
             if created:
                 self.stdout.write(f"Created topic: {topic.name}")
         
-        self.stdout.write(self.style.SUCCESS('Successfully setup governance topics'))
\ No newline at end of file
+        # Recount remaining supply per tier from NFT_LIMITS and the NFTs already minted
+        for tier, counts in sync_tier_inventory().items():
+            self.stdout.write(f"Tier {tier}: {counts['remaining']}/{counts['total']} available")
+        
+        self.stdout.write(self.style.SUCCESS('Successfully setup governance topics and tier inventory'))
\ No newline at end of file
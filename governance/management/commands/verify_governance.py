@@ -0,0 +1,93 @@
+# management/commands/verify_governance.py
+import json
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from governance.audit import audit_topic, Checkpoint
+from governance.models import GovernanceTopic
+from hiero.mirror_node import iter_topic_messages
+
+class Command(BaseCommand):
+    help = 'Verify local votes against the messages anchored on the governance topics'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--topic', action='append', dest='topic_ids', help='Only verify this topic id (repeatable)')
+        parser.add_argument('--workers', type=int, default=4, help='Topics verified in parallel')
+        parser.add_argument('--checkpoint', help='JSON file recording progress per topic; an audit resumes from it')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and verify from the start')
+        parser.add_argument('--report', help='Write every mismatch to this file as JSON lines')
+        parser.add_argument('--max-report', type=int, default=20, help='Mismatches printed to the console')
+        parser.add_argument('--backfill', action='store_true',
+                            help='Record sequence numbers for votes anchored before they were stored')
+
+    def handle(self, *args, **options):
+        topics = GovernanceTopic.objects.all()
+        if options['topic_ids']:
+            topics = topics.filter(topic_id__in=options['topic_ids'])
+        topics = list(topics)
+
+        checkpoint = Checkpoint(options['checkpoint'])
+        if options['restart']:
+            checkpoint.positions = {}
+
+        lock = threading.Lock()
+        printed = Counter()
+        report_file = open(options['report'], 'a') if options['report'] else None
+
+        def on_mismatch(mismatch):
+            with lock:
+                if report_file:
+                    report_file.write(json.dumps(mismatch) + '\n')
+                if printed['mismatches'] < options['max_report']:
+                    printed['mismatches'] += 1
+                    self.stdout.write(self.style.WARNING(
+                        f"{mismatch['kind']}: topic {mismatch['topic_id']} #{mismatch['sequence_number']} "
+                        f"vote {mismatch['vote_id']} expected {mismatch['expected']!r} found {mismatch['found']!r}"
+                    ))
+
+        def verify(topic):
+            session = requests.Session()
+            try:
+                start = checkpoint.get(topic.topic_id)
+                messages = iter_topic_messages(topic.topic_id, after_sequence=start, session=session)
+                return audit_topic(
+                    topic, messages, after_sequence=start,
+                    on_mismatch=on_mismatch, on_progress=checkpoint.update, backfill=options['backfill'],
+                )
+            finally:
+                session.close()
+                close_old_connections()
+
+        totals = Counter()
+        failed = []
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, options['workers'])) as executor:
+                futures = {executor.submit(verify, topic): topic for topic in topics}
+                for future in as_completed(futures):
+                    topic = futures[future]
+                    try:
+                        counts = future.result()
+                    except Exception as e:
+                        failed.append(topic.topic_id)
+                        self.stdout.write(self.style.ERROR(
+                            f"Topic {topic.topic_id} stopped at #{checkpoint.get(topic.topic_id)}: {e}"
+                        ))
+                        continue
+                    totals.update(counts)
+                    self.stdout.write(f"Topic {topic.topic_id} ({topic.name}): {dict(counts) or 'nothing new'}")
+        finally:
+            if report_file:
+                report_file.close()
+
+        mismatches = totals['content_mismatch'] + totals['missing_on_chain'] + totals['unknown_on_chain']
+        summary = (
+            f"Verified {len(topics) - len(failed)}/{len(topics)} topics: {totals['matched']} matched, "
+            f"{totals['matched_legacy']} matched without sequence numbers, {mismatches} mismatches "
+            f"({totals['content_mismatch']} content, {totals['missing_on_chain']} missing on chain, "
+            f"{totals['unknown_on_chain']} unknown on chain)"
+        )
+        style = self.style.SUCCESS if not mismatches and not failed else self.style.WARNING
+        self.stdout.write(style(summary))
@@ -0,0 +1,280 @@
+import base64
+import json
+import logging
+from datetime import timedelta
+from decimal import Decimal, InvalidOperation
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+from core.fragment_cache import get_fragment_version, NFT_MARKET, USER_WALLET
+from core.models import UserWallet
+from hiero.ft import transfer_between
+from hiero.governance import transfer_nft
+from hiero.mirror_node import get_nft_owners
+from .models import GovernanceNFT, NFTMarketplace
+from .signals import invalidate_on_commit
+
+logger = logging.getLogger(__name__)
+
+# The order book is read live in keyset pages over the partial open-listing
+# indexes on ([tier,] price, id); only the per-tier floor/depth summary is cached. governance.signals
+# bumps its version whenever a listing is written.
+LISTINGS_PAGE_SIZE = 20
+MAX_LISTINGS_PAGE_SIZE = 100
+MARKET_SUMMARY_TIMEOUT = 300
+# A reservation that never reached the chain is released after this long
+LISTING_RESERVATION_TIMEOUT = timedelta(minutes=15)
+
+class PurchaseError(Exception):
+    """A marketplace purchase that could not go through, with the HTTP status to report"""
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def open_listings(tier=None):
+    """Unsold, unreserved listings, cheapest first with id as tie-breaker"""
+    listings = NFTMarketplace.objects.filter(is_sold=False, reserved_at__isnull=True)
+    if tier:
+        listings = listings.filter(tier=tier)
+    return listings.order_by('price', 'id')
+
+def encode_cursor(listing):
+    position = [str(listing['price']), listing['id']]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_cursor(cursor):
+    """Return (price, id) from a cursor, raising ValueError if it is malformed"""
+    try:
+        price, listing_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return Decimal(price), int(listing_id)
+    except (TypeError, ValueError, UnicodeError, InvalidOperation) as e:
+        raise ValueError('Invalid cursor') from e
+
+def get_listings_page(tier=None, cursor=None, limit=LISTINGS_PAGE_SIZE):
+    """One page of the order book: {'listings': [...], 'next_cursor': str|None}"""
+    listings = open_listings(tier)
+    if cursor:
+        price, listing_id = decode_cursor(cursor)
+        listings = listings.filter(Q(price__gt=price) | Q(price=price, id__gt=listing_id))
+
+    rows = list(listings.values(
+        'id', 'tier', 'price', 'listed_at', 'seller__username',
+        'nft__serial_number', 'nft__token_id', 'nft__voting_power',
+    )[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'listings': [
+            {
+                'id': row['id'],
+                'tier': row['tier'],
+                'price': row['price'],
+                'listed_at': row['listed_at'],
+                'seller': row['seller__username'],
+                'serial_number': row['nft__serial_number'],
+                'token_id': row['nft__token_id'],
+                'voting_power': row['nft__voting_power'],
+            }
+            for row in rows
+        ],
+        'next_cursor': encode_cursor(rows[-1]) if has_more else None,
+    }
+
+def build_market_summary():
+    """Floor price and depth per tier from one grouped query"""
+    rows = open_listings().order_by().values('tier').annotate(floor_price=Min('price'), depth=Count('id'))
+    summary = {tier: {'floor_price': None, 'depth': 0} for tier, _ in GovernanceNFT.TIER_CHOICES}
+    for row in rows:
+        summary[row['tier']] = {'floor_price': row['floor_price'], 'depth': row['depth']}
+    return summary
+
+def get_market_summary():
+    cache_key = f"nft_market_summary:{get_fragment_version(NFT_MARKET, 'summary')}"
+    summary = cache.get(cache_key)
+    if summary is None:
+        summary = build_market_summary()
+        cache.set(cache_key, summary, MARKET_SUMMARY_TIMEOUT)
+    return summary
+
+def reserve_listing(listing_id, buyer):
+    """Take a listing off the book for ``buyer``.
+
+    The row lock is held only for this short transaction; skip_locked makes a
+    second buyer racing for the same listing fail fast instead of queueing.
+    """
+    with transaction.atomic():
+        listing = (
+            NFTMarketplace.objects.select_for_update(skip_locked=True, of=('self',))
+            .select_related('nft')
+            .filter(id=listing_id, is_sold=False, reserved_at__isnull=True)
+            .first()
+        )
+        if listing is None:
+            raise PurchaseError('Listing is no longer available', status=409)
+        if listing.seller_id == buyer.id:
+            raise PurchaseError('You cannot buy your own listing')
+        if not listing.nft.is_active or listing.nft.user_id != listing.seller_id:
+            raise PurchaseError('Listing is no longer available', status=409)
+
+        listing.buyer = buyer
+        listing.reserved_at = timezone.now()
+        listing.settlement_stage = 'reserved'
+        listing.settlement_error = ''
+        listing.save(update_fields=['buyer', 'reserved_at', 'settlement_stage', 'settlement_error'])
+    return listing
+
+def release_listing(listing, error):
+    """Put a reserved listing back on the book after a failed purchase"""
+    listing.buyer = None
+    listing.reserved_at = None
+    listing.settlement_stage = ''
+    listing.settlement_error = error
+    listing.save(update_fields=['buyer', 'reserved_at', 'settlement_stage', 'settlement_error'])
+
+def set_stage(listing, stage, error=None):
+    listing.settlement_stage = stage
+    update_fields = ['settlement_stage']
+    if error is not None:
+        listing.settlement_error = error
+        update_fields.append('settlement_error')
+    listing.save(update_fields=update_fields)
+
+def start_payment(listing):
+    """Move a reservation to 'paying' unless it expired and was released meanwhile"""
+    started = NFTMarketplace.objects.filter(
+        id=listing.id, buyer_id=listing.buyer_id, reserved_at=listing.reserved_at, settlement_stage='reserved',
+    ).update(settlement_stage='paying')
+    if not started:
+        raise PurchaseError('Your reservation expired, please try again', status=409)
+    listing.settlement_stage = 'paying'
+
+def invalidate_wallets(listing):
+    """STAR moved between buyer and seller; their cached invest checks are stale"""
+    invalidate_on_commit((USER_WALLET, listing.buyer_id), (USER_WALLET, listing.seller_id))
+
+def refund_buyer(listing, seller_wallet, seller_key, buyer_wallet, error):
+    """Compensate a payment whose NFT transfer failed. Releases the listing on
+    success; otherwise leaves it in 'refund_failed' for recovery."""
+    amount = int(listing.price)
+    refund = transfer_between(seller_wallet.recipient_id, seller_key, buyer_wallet.recipient_id, amount)
+    if refund['status'] != 'success':
+        set_stage(listing, 'refund_failed',
+                  f"NFT transfer failed ({error}); refund of {amount} failed: {refund.get('error')}")
+        logger.error(f"Listing {listing.id} needs a refund to user {listing.buyer_id}: {listing.settlement_error}")
+        raise PurchaseError('NFT transfer failed and the refund could not be completed. Support has been notified.', status=500)
+    invalidate_wallets(listing)
+    release_listing(listing, f"NFT transfer failed: {error}")
+    raise PurchaseError(f'NFT transfer failed, your payment was refunded: {error}', status=500)
+
+def transfer_to_buyer(listing, seller_wallet, seller_key, buyer_wallet):
+    """Move the paid-for NFT to the buyer and settle, refunding if the transfer fails"""
+    nft = listing.nft
+    transfer = transfer_nft(
+        nft.token_id, nft.serial_number,
+        seller_wallet.recipient_id, seller_key, buyer_wallet.recipient_id,
+    )
+    if transfer['status'] != 'success':
+        refund_buyer(listing, seller_wallet, seller_key, buyer_wallet, transfer.get('message', 'Unknown error'))
+    settle_listing(listing)
+
+def settle_listing(listing):
+    with transaction.atomic():
+        listing.is_sold = True
+        listing.sold_at = timezone.now()
+        listing.settlement_stage = ''
+        listing.save(update_fields=['is_sold', 'sold_at', 'settlement_stage'])
+        # Saving the owner fires the NFT signals that move voting power to the buyer
+        nft = listing.nft
+        nft.user_id = listing.buyer_id
+        nft.save(update_fields=['user'])
+    logger.info(f"Listing {listing.id} sold to user {listing.buyer_id} for {listing.price}")
+
+def buy_listing(listing_id, buyer, buyer_wallet):
+    """Buy a listed NFT: reserve it, pay the seller, transfer the NFT, then settle.
+
+    The on-chain steps run outside any database lock. settlement_stage is
+    saved before each of them so resume_listing_purchases can finish or undo a
+    purchase whose worker died: 'reserved' (nothing on chain yet, released
+    once older than LISTING_RESERVATION_TIMEOUT), 'paying' (payment outcome
+    unknown), 'paid' (transfer the NFT or refund) and 'refund_failed'. If the
+    NFT transfer fails the payment is refunded (the compensating step) and the
+    listing is released.
+    """
+    listing = reserve_listing(listing_id, buyer)
+
+    seller_wallet = UserWallet.objects.filter(user_id=listing.seller_id, status='active').first()
+    if not seller_wallet:
+        release_listing(listing, 'Seller wallet unavailable')
+        raise PurchaseError('Seller wallet is unavailable', status=409)
+
+    try:
+        buyer_key = buyer_wallet.decrypt_key()
+        seller_key = seller_wallet.decrypt_key()
+    except Exception as e:
+        release_listing(listing, f'Wallet key unavailable: {e}')
+        raise PurchaseError('Wallet keys are unavailable, try again later', status=500)
+
+    start_payment(listing)
+    payment = transfer_between(buyer_wallet.recipient_id, buyer_key, seller_wallet.recipient_id, int(listing.price))
+    if payment['status'] != 'success':
+        release_listing(listing, f"Payment failed: {payment.get('error', 'Unknown error')}")
+        raise PurchaseError(f"Payment processing failed: {payment.get('error', 'Unknown error')}", status=500)
+    set_stage(listing, 'paid')
+    invalidate_wallets(listing)
+
+    transfer_to_buyer(listing, seller_wallet, seller_key, buyer_wallet)
+    return listing
+
+def release_expired_reservations(now=None):
+    """Put back listings reserved longer than LISTING_RESERVATION_TIMEOUT whose
+    purchase never reached the chain. Returns how many were released."""
+    cutoff = (now or timezone.now()) - LISTING_RESERVATION_TIMEOUT
+    return NFTMarketplace.objects.filter(
+        is_sold=False, settlement_stage='reserved', reserved_at__lt=cutoff,
+    ).update(buyer=None, reserved_at=None, settlement_stage='', settlement_error='Reservation expired')
+
+def resume_listing(listing):
+    """Finish or undo a 'paid' or 'refund_failed' purchase left by a failed or crashed worker.
+
+    Returns the listing's resulting state: 'sold', 'released' or the stage it
+    is still stuck in. Raises PurchaseError when a step fails again.
+    """
+    wallets = {
+        wallet.user_id: wallet
+        for wallet in UserWallet.objects.filter(user_id__in=[listing.seller_id, listing.buyer_id], status='active')
+    }
+    seller_wallet, buyer_wallet = wallets.get(listing.seller_id), wallets.get(listing.buyer_id)
+    if not seller_wallet or not buyer_wallet:
+        raise PurchaseError('Buyer or seller wallet is unavailable', status=409)
+    try:
+        seller_key = seller_wallet.decrypt_key()
+    except Exception as e:
+        raise PurchaseError(f'Seller wallet key unavailable: {e}', status=500)
+
+    if listing.settlement_stage == 'refund_failed':
+        try:
+            refund_buyer(listing, seller_wallet, seller_key, buyer_wallet, 'NFT transfer failed')
+        except PurchaseError:
+            if listing.settlement_stage == 'refund_failed':
+                raise
+        return 'released'
+
+    # 'paid': the transfer may or may not have landed before the worker died
+    owners = get_nft_owners(listing.nft.token_id)
+    if owners is None:
+        raise PurchaseError('Mirror node unavailable', status=503)
+    owner = owners.get(listing.nft.serial_number)
+    if owner == buyer_wallet.recipient_id:
+        settle_listing(listing)
+        return 'sold'
+    if owner != seller_wallet.recipient_id:
+        set_stage(listing, 'paid', f'NFT is held by {owner}, expected the seller or buyer')
+        raise PurchaseError(listing.settlement_error, status=409)
+    try:
+        transfer_to_buyer(listing, seller_wallet, seller_key, buyer_wallet)
+    except PurchaseError:
+        if listing.settlement_stage == 'refund_failed':
+            raise
+        return 'released'
+    return 'sold'
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:01
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_vote_tallies(apps, schema_editor):
+    GovernanceProposal = apps.get_model('governance', 'GovernanceProposal')
+    Vote = apps.get_model('governance', 'Vote')
+    fields = {'yes': 'yes_power', 'no': 'no_power', 'abstain': 'abstain_power'}
+
+    tallies = {}
+    rows = Vote.objects.values('proposal_id', 'vote').annotate(power=Sum('voting_power'), voters=Count('id'))
+    for row in rows:
+        if row['vote'] not in fields:
+            continue
+        tally = tallies.setdefault(row['proposal_id'], {'voter_count': 0})
+        tally[fields[row['vote']]] = row['power'] or 0
+        tally['voter_count'] += row['voters']
+
+    proposals = list(GovernanceProposal.objects.filter(id__in=tallies))
+    for proposal in proposals:
+        for field, value in tallies[proposal.id].items():
+            setattr(proposal, field, value)
+    GovernanceProposal.objects.bulk_update(proposals, list(fields.values()) + ['voter_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='governanceproposal',
+            name='abstain_power',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='governanceproposal',
+            name='no_power',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='governanceproposal',
+            name='voter_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='governanceproposal',
+            name='yes_power',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_vote_tallies, migrations.RunPython.noop),
+    ]
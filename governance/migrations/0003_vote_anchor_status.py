@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:05
+
+from django.db import migrations, models
+
+
+def mark_existing_votes_anchored(apps, schema_editor):
+    # Votes cast before write-behind anchoring were submitted to HCS synchronously
+    Vote = apps.get_model('governance', 'Vote')
+    Vote.objects.exclude(hedera_transaction_id__isnull=True).exclude(hedera_transaction_id='').update(status='anchored')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0002_proposal_vote_tallies'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='anchor_attempts',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='vote',
+            name='anchor_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='vote',
+            name='anchored_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='vote',
+            name='status',
+            field=models.CharField(choices=[('pending_anchor', 'Pending Anchor'), ('anchoring', 'Anchoring'), ('anchored', 'Anchored'), ('anchor_failed', 'Anchor Failed')], db_index=True, default='pending_anchor', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_votes_anchored, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0003_vote_anchor_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='governanceproposal',
+            index=models.Index(fields=['status', 'voting_end'], name='proposal_status_end_idx'),
+        ),
+    ]
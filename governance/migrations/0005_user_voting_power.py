@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_voting_power(apps, schema_editor):
+    GovernanceNFT = apps.get_model('governance', 'GovernanceNFT')
+    UserVotingPower = apps.get_model('governance', 'UserVotingPower')
+    rows = (
+        GovernanceNFT.objects.filter(is_active=True)
+        .values('user_id').annotate(power=Sum('voting_power'), nfts=Count('id'))
+    )
+    UserVotingPower.objects.bulk_create([
+        UserVotingPower(user_id=row['user_id'], voting_power=row['power'], nft_count=row['nfts'])
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('governance', '0004_proposal_status_voting_end_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserVotingPower',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='governance_power', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('voting_power', models.PositiveIntegerField(default=0)),
+                ('nft_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'governance_user_voting_power',
+            },
+        ),
+        migrations.RunPython(backfill_voting_power, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_listing_tier(apps, schema_editor):
+    GovernanceNFT = apps.get_model('governance', 'GovernanceNFT')
+    NFTMarketplace = apps.get_model('governance', 'NFTMarketplace')
+    NFTMarketplace.objects.update(
+        tier=Subquery(GovernanceNFT.objects.filter(pk=OuterRef('nft_id')).values('tier')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0005_user_voting_power'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nftmarketplace',
+            name='reserved_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='nftmarketplace',
+            name='settlement_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='nftmarketplace',
+            name='tier',
+            field=models.CharField(choices=[('celestial', 'Celestial Board'), ('stellar', 'Stellar Assembly'), ('cosmic', 'Cosmic Community')], default='cosmic', max_length=20),
+        ),
+        migrations.RunPython(backfill_listing_tier, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='nftmarketplace',
+            index=models.Index(condition=models.Q(('is_sold', False), ('reserved_at__isnull', True)), fields=['price', 'id'], name='listing_open_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='nftmarketplace',
+            index=models.Index(condition=models.Q(('is_sold', False), ('reserved_at__isnull', True)), fields=['tier', 'price', 'id'], name='listing_open_tier_price_idx'),
+        ),
+    ]
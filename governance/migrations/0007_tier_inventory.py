@@ -0,0 +1,43 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:14
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# GovernanceConfig.NFT_LIMITS at the time of this migration
+NFT_LIMITS = {'celestial': 10, 'stellar': 1000, 'cosmic': 10000}
+
+
+def create_inventory(apps, schema_editor):
+    GovernanceNFT = apps.get_model('governance', 'GovernanceNFT')
+    TierInventory = apps.get_model('governance', 'TierInventory')
+    minted = dict(
+        GovernanceNFT.objects.filter(is_active=True).values_list('tier').annotate(count=Count('id'))
+    )
+    TierInventory.objects.bulk_create([
+        TierInventory(tier=tier, total=limit, remaining=max(limit - minted.get(tier, 0), 0))
+        for tier, limit in NFT_LIMITS.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0006_marketplace_order_book'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TierInventory',
+            fields=[
+                ('tier', models.CharField(choices=[('celestial', 'Celestial Board'), ('stellar', 'Stellar Assembly'), ('cosmic', 'Cosmic Community')], max_length=20, primary_key=True, serialize=False)),
+                ('total', models.PositiveIntegerField()),
+                ('remaining', models.PositiveIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'governance_tier_inventory',
+                'constraints': [models.CheckConstraint(condition=models.Q(('remaining__lte', models.F('total'))), name='tier_remaining_lte_total')],
+            },
+        ),
+        migrations.RunPython(create_inventory, migrations.RunPython.noop),
+    ]
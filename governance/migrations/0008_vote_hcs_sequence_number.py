@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0007_tier_inventory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vote',
+            name='hcs_sequence_number',
+            field=models.PositiveBigIntegerField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def stage_reserved_listings(apps, schema_editor):
+    # Listings already reserved predate the stages: one with a settlement_error
+    # is a failed refund, the rest are in an unknown state and need review
+    NFTMarketplace = apps.get_model('governance', 'NFTMarketplace')
+    reserved = NFTMarketplace.objects.filter(is_sold=False, reserved_at__isnull=False)
+    reserved.exclude(settlement_error='').update(settlement_stage='refund_failed')
+    reserved.filter(settlement_error='').update(settlement_stage='paying')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('governance', '0008_vote_hcs_sequence_number'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nftmarketplace',
+            name='settlement_stage',
+            field=models.CharField(blank=True, choices=[('reserved', 'Reserved'), ('paying', 'Paying seller'), ('paid', 'Paid, NFT not yet transferred'), ('refund_failed', 'Refund failed')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='nftmarketplace',
+            index=models.Index(condition=models.Q(('is_sold', False), ('reserved_at__isnull', False)), fields=['settlement_stage', 'reserved_at'], name='listing_settling_idx'),
+        ),
+        migrations.RunPython(stage_reserved_listings, migrations.RunPython.noop),
+    ]
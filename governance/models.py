@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -23,6 +24,42 @@ class GovernanceNFT(models.Model):
     
     def __str__(self):
         return f"{self.get_tier_display()} - {self.user.username}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the owner as loaded so a transfer can refresh the previous owner's power
+        instance._loaded_user_id = instance.__dict__.get('user_id')
+        return instance
+
+class TierInventory(models.Model):
+    """Remaining mintable supply per NFT tier, claimed with a conditional decrement (see governance.inventory)"""
+    tier = models.CharField(max_length=20, choices=GovernanceNFT.TIER_CHOICES, primary_key=True)
+    total = models.PositiveIntegerField()
+    remaining = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'governance_tier_inventory'
+        constraints = [
+            models.CheckConstraint(condition=models.Q(remaining__lte=models.F('total')), name='tier_remaining_lte_total'),
+        ]
+    
+    def __str__(self):
+        return f"{self.tier} - {self.remaining}/{self.total}"
+
+class UserVotingPower(models.Model):
+    """Total active governance voting power per user, kept current by governance.signals"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='governance_power')
+    voting_power = models.PositiveIntegerField(default=0)
+    nft_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'governance_user_voting_power'
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.voting_power}"
 
 class GovernanceTopic(models.Model):
     topic_id = models.CharField(max_length=50, unique=True)
@@ -57,12 +94,48 @@ class GovernanceProposal(models.Model):
     min_approval_percentage = models.IntegerField(default=60)
     hedera_message_id = models.CharField(max_length=100, blank=True, null=True)
     
+    # Denormalized tallies, incremented by cast_vote (repair with reconcile_vote_tallies)
+    yes_power = models.PositiveIntegerField(default=0)
+    no_power = models.PositiveIntegerField(default=0)
+    abstain_power = models.PositiveIntegerField(default=0)
+    voter_count = models.PositiveIntegerField(default=0)
+    
+    TALLY_FIELDS = {'yes': 'yes_power', 'no': 'no_power', 'abstain': 'abstain_power'}
+    
     class Meta:
         db_table = 'governance_proposals'
         ordering = ['-created_date']
+        indexes = [
+            # Finalizer scan: active proposals whose voting window has closed
+            models.Index(fields=['status', 'voting_end'], name='proposal_status_end_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
+    
+    @property
+    def total_power(self):
+        return self.yes_power + self.no_power + self.abstain_power
+    
+    def power_percentage(self, vote_choice):
+        """Share of the total voting power cast for ``vote_choice``"""
+        total = self.total_power
+        if not total:
+            return 0
+        return getattr(self, self.TALLY_FIELDS[vote_choice]) / total * 100
+    
+    @property
+    def yes_percentage(self):
+        return self.power_percentage('yes')
+    
+    def record_vote(self, vote_choice, voting_power):
+        """Atomically add one vote to the tallies and refresh them on this instance"""
+        field = self.TALLY_FIELDS[vote_choice]
+        GovernanceProposal.objects.filter(pk=self.pk).update(**{
+            field: F(field) + voting_power,
+            'voter_count': F('voter_count') + 1,
+        })
+        self.refresh_from_db(fields=list(self.TALLY_FIELDS.values()) + ['voter_count'])
 
 class Vote(models.Model):
     VOTE_CHOICES = [
@@ -70,6 +143,12 @@ class Vote(models.Model):
         ('no', 'No'),
         ('abstain', 'Abstain'),
     ]
+    STATUS_CHOICES = [
+        ('pending_anchor', 'Pending Anchor'),
+        ('anchoring', 'Anchoring'),
+        ('anchored', 'Anchored'),
+        ('anchor_failed', 'Anchor Failed'),
+    ]
     
     proposal = models.ForeignKey(GovernanceProposal, on_delete=models.CASCADE)
     voter = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -78,6 +157,14 @@ class Vote(models.Model):
     voted_at = models.DateTimeField(auto_now_add=True)
     hedera_transaction_id = models.CharField(max_length=100, blank=True, null=True)
     
+    # HCS anchoring (runs in the background after the vote commits)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending_anchor', db_index=True)
+    anchor_attempts = models.IntegerField(default=0)
+    anchor_error = models.TextField(blank=True)
+    anchored_at = models.DateTimeField(blank=True, null=True)
+    # Position of the vote message on its topic, the join key for verify_governance
+    hcs_sequence_number = models.PositiveBigIntegerField(blank=True, null=True, db_index=True)
+    
     class Meta:
         db_table = 'governance_votes'
         unique_together = ['proposal', 'voter']
@@ -88,14 +175,43 @@ class Vote(models.Model):
 class NFTMarketplace(models.Model):
     nft = models.ForeignKey(GovernanceNFT, on_delete=models.CASCADE)
     seller = models.ForeignKey(User, on_delete=models.CASCADE, related_name='seller')
+    tier = models.CharField(max_length=20, choices=GovernanceNFT.TIER_CHOICES, default='cosmic')  # Copied from the NFT for the order book indexes
     price = models.DecimalField(max_digits=20, decimal_places=2)
     listed_at = models.DateTimeField(auto_now_add=True)
     is_sold = models.BooleanField(default=False)
     sold_at = models.DateTimeField(blank=True, null=True)
     buyer = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True, related_name='buyer')
+    SETTLEMENT_STAGES = [
+        ('reserved', 'Reserved'),
+        ('paying', 'Paying seller'),
+        ('paid', 'Paid, NFT not yet transferred'),
+        ('refund_failed', 'Refund failed'),
+    ]
+    # Set while a purchase is settling on chain; the listing is off the book until it completes or is released
+    reserved_at = models.DateTimeField(blank=True, null=True)
+    # Last purchase step reached, so resume_listing_purchases can finish or undo it
+    settlement_stage = models.CharField(max_length=20, choices=SETTLEMENT_STAGES, blank=True)
+    settlement_error = models.TextField(blank=True)
     
     class Meta:
         db_table = 'nft_marketplace'
+        # Partial indexes over the open book only. Their condition matches open_listings()
+        # in governance.marketplace, so browsing and floor prices never touch sold rows.
+        indexes = [
+            models.Index(
+                fields=['price', 'id'], name='listing_open_price_idx',
+                condition=models.Q(is_sold=False, reserved_at__isnull=True),
+            ),
+            models.Index(
+                fields=['tier', 'price', 'id'], name='listing_open_tier_price_idx',
+                condition=models.Q(is_sold=False, reserved_at__isnull=True),
+            ),
+            # Purchases still settling, for resume_listing_purchases
+            models.Index(
+                fields=['settlement_stage', 'reserved_at'], name='listing_settling_idx',
+                condition=models.Q(is_sold=False, reserved_at__isnull=False),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.nft.tier} - {self.price} ASTRA"
\ No newline at end of file
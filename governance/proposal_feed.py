@@ -0,0 +1,100 @@
+import base64
+import json
+from datetime import datetime
+from django.core.cache import cache
+from django.db.models import OuterRef, Q, Subquery
+from core.fragment_cache import get_fragment_version, PROPOSAL_FEED
+from .models import GovernanceProposal, Vote
+
+# Feed pages hold no per-user data, so one cached page serves every voter.
+# Versions are bumped by governance.signals whenever a proposal or vote changes.
+FEED_PAGE_SIZE = 20
+MAX_FEED_PAGE_SIZE = 100
+FEED_CACHE_TIMEOUT = 300
+
+def active_proposals():
+    """Active proposals in keyset order: soonest-ending first, id as tie-breaker"""
+    return (
+        GovernanceProposal.objects.filter(status='active')
+        .select_related('creator', 'topic')
+        .order_by('voting_end', 'id')
+    )
+
+def with_user_vote(queryset, user):
+    """Annotate each proposal with ``user_vote`` and ``user_voting_power`` for ``user``"""
+    user_votes = Vote.objects.filter(proposal=OuterRef('pk'), voter=user)
+    return queryset.annotate(
+        user_vote=Subquery(user_votes.values('vote')[:1]),
+        user_voting_power=Subquery(user_votes.values('voting_power')[:1]),
+    )
+
+def encode_cursor(proposal):
+    position = [proposal.voting_end.isoformat(), proposal.id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_cursor(cursor):
+    """Return (voting_end, id) from a cursor, raising ValueError if it is malformed"""
+    try:
+        voting_end, proposal_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(voting_end), int(proposal_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def serialize_proposal(proposal):
+    return {
+        'id': proposal.id,
+        'title': proposal.title,
+        'description': proposal.description,
+        'status': proposal.status,
+        'voting_start': proposal.voting_start,
+        'voting_end': proposal.voting_end,
+        'min_approval_percentage': proposal.min_approval_percentage,
+        'creator': {
+            'id': proposal.creator.id,
+            'username': proposal.creator.username
+        },
+        'topic': {
+            'id': proposal.topic.id,
+            'name': proposal.topic.name,
+            'topic_id': proposal.topic.topic_id
+        },
+        'total_votes': proposal.total_power,
+        'voter_count': proposal.voter_count,
+        'yes_percentage': round(proposal.yes_percentage, 2),
+    }
+
+def get_feed_page(cursor=None, limit=FEED_PAGE_SIZE):
+    """One page of the active proposal feed: {'proposals': [...], 'next_cursor': str|None}.
+
+    Costs a single query on a cache miss and none on a hit, however many
+    proposals are active.
+    """
+    position = decode_cursor(cursor) if cursor else None
+    version = get_fragment_version(PROPOSAL_FEED, 'active')
+    # Key on the decoded position so arbitrary cursor strings can't flood the cache
+    page_key = f"{position[0].isoformat()}:{position[1]}" if position else 'first'
+    cache_key = f"proposal_feed:{version}:{page_key}:{limit}"
+
+    page = cache.get(cache_key)
+    if page is None:
+        proposals = active_proposals()
+        if position:
+            voting_end, proposal_id = position
+            proposals = proposals.filter(
+                Q(voting_end__gt=voting_end) | Q(voting_end=voting_end, id__gt=proposal_id)
+            )
+        rows = list(proposals[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        page = {
+            'proposals': [serialize_proposal(proposal) for proposal in rows],
+            'next_cursor': encode_cursor(rows[-1]) if has_more else None,
+        }
+        cache.set(cache_key, page, FEED_CACHE_TIMEOUT)
+    return page
+
+def get_user_votes(user, proposal_ids):
+    """{proposal_id: vote} for the proposals on a page, in one query"""
+    return dict(
+        Vote.objects.filter(voter=user, proposal_id__in=proposal_ids).values_list('proposal_id', 'vote')
+    )
@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.fragment_cache import bump_fragment_version, PROPOSAL_FEED, GOVERNANCE_STATS, NFT_MARKET
+from .models import GovernanceNFT, GovernanceProposal, Vote, NFTMarketplace
+from .voting_power import refresh_voting_power
+
+def invalidate_on_commit(*fragments):
+    # Bump after commit so a concurrent reader can't re-cache the old rows under the new version
+    def bump():
+        for namespace, key in fragments:
+            bump_fragment_version(namespace, key)
+    transaction.on_commit(bump)
+
+@receiver([post_save, post_delete], sender=GovernanceProposal)
+def invalidate_on_proposal_change(sender, instance, **kwargs):
+    """Proposals entering or leaving voting, or edited"""
+    invalidate_on_commit((PROPOSAL_FEED, 'active'), (GOVERNANCE_STATS, 'all'))
+
+@receiver([post_save, post_delete], sender=Vote)
+def invalidate_on_vote(sender, instance, **kwargs):
+    """Votes change the feed tallies and the voting stats"""
+    invalidate_on_commit((PROPOSAL_FEED, 'active'), (GOVERNANCE_STATS, 'all'))
+
+@receiver([post_save, post_delete], sender=GovernanceNFT)
+def invalidate_on_nft_change(sender, instance, **kwargs):
+    """Purchases and transfers change the NFT supply stats"""
+    invalidate_on_commit((GOVERNANCE_STATS, 'all'))
+
+@receiver([post_save, post_delete], sender=GovernanceNFT)
+def refresh_voting_power_on_nft_change(sender, instance, **kwargs):
+    """Purchases, transfers (old and new owner) and deactivations change voting power"""
+    refresh_voting_power({instance.user_id, getattr(instance, '_loaded_user_id', None)})
+    instance._loaded_user_id = instance.user_id
+
+@receiver([post_save, post_delete], sender=NFTMarketplace)
+def invalidate_on_listing_change(sender, instance, **kwargs):
+    """Listings, reservations and sales move the floor price and depth"""
+    invalidate_on_commit((NFT_MARKET, 'summary'))
@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.db.models import Count, Sum
+from core.fragment_cache import get_fragment_version, GOVERNANCE_STATS
+from .models import GovernanceProposal, Vote
+from .inventory import get_tier_inventory
+from .voting_power import get_voting_power
+
+# The global stats are a cached snapshot rebuilt from three queries. Its version is
+# bumped by governance.signals whenever an NFT, proposal or vote is written, and by
+# governance.inventory whenever tier supply is reserved or released.
+STATS_SNAPSHOT_TIMEOUT = 3600
+
+def build_stats_snapshot():
+    """Global governance stats: the tier inventory plus one aggregate query each for proposals and votes"""
+    inventory = get_tier_inventory()
+    proposals_by_status = dict(
+        GovernanceProposal.objects.values_list('status').annotate(count=Count('id'))
+    )
+    votes = Vote.objects.aggregate(
+        total_votes=Count('id'),
+        total_voters=Count('voter', distinct=True),
+        total_voting_power=Sum('voting_power'),
+    )
+
+    nft_stats = {}
+    for tier in ['celestial', 'stellar', 'cosmic']:
+        counts = inventory.get(tier, {'total': 0, 'remaining': 0})
+        nft_stats[tier] = {
+            'available': counts['remaining'],
+            'total': counts['total'],
+            'sold': counts['total'] - counts['remaining']
+        }
+
+    return {
+        'nft_stats': nft_stats,
+        'proposal_stats': {
+            'active': proposals_by_status.get('active', 0),
+            'passed': proposals_by_status.get('passed', 0),
+            'rejected': proposals_by_status.get('rejected', 0),
+            'total': sum(proposals_by_status.values())
+        },
+        'voting_stats': {
+            'total_votes': votes['total_votes'],
+            'total_voters': votes['total_voters'],
+            'total_voting_power': votes['total_voting_power'] or 0
+        },
+    }
+
+def get_stats_snapshot():
+    version = get_fragment_version(GOVERNANCE_STATS, 'all')
+    cache_key = f"governance_stats:{version}"
+    snapshot = cache.get(cache_key)
+    if snapshot is None:
+        snapshot = build_stats_snapshot()
+        cache.set(cache_key, snapshot, STATS_SNAPSHOT_TIMEOUT)
+    return snapshot
+
+def get_user_stats(user):
+    """The per-user slice, always computed live"""
+    voting_power, nft_count = get_voting_power(user)
+    return {
+        'has_nft': nft_count > 0,
+        'user_votes': Vote.objects.filter(voter=user).count(),
+        'user_voting_power': voting_power
+    }
@@ -1,3 +1,240 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from hiero_sdk_python.response_code import ResponseCode
+from hiero.ft import transfer_between
+from core.fragment_cache import get_fragment_version, USER_WALLET
+from core.models import UserWallet
+from .inventory import get_tier_inventory, sync_tier_inventory
+from .marketplace import buy_listing, reserve_listing, PurchaseError, LISTING_RESERVATION_TIMEOUT
+from .models import GovernanceNFT, NFTMarketplace, TierInventory, UserVotingPower
 
-# Create your tests here.
+SUCCESS = {'status': 'success'}
+FAILED = {'status': 'failed', 'error': 'network down', 'message': 'network down'}
+
+def receipt_status(status):
+    """Run hiero.ft transfers offline, each returning a receipt with ``status``"""
+    transaction = mock.MagicMock()
+    for method in ('add_token_transfer', 'set_transaction_memo', 'freeze_with', 'sign'):
+        getattr(transaction, method).return_value = transaction
+    transaction.execute.return_value = mock.Mock(status=status)
+    return mock.patch.multiple(
+        'hiero.ft', Client=mock.DEFAULT, Network=mock.DEFAULT, PrivateKey=mock.DEFAULT,
+        TransferTransaction=mock.Mock(return_value=transaction),
+    )
+
+def make_user(username, account_id):
+    user = User.objects.create(username=username)
+    UserWallet.objects.create(user=user, status='active', recipient_id=account_id, private_key='hex=abcd')
+    return user
+
+class TransferReceiptTests(TestCase):
+    def test_failed_receipt_is_a_failed_transfer(self):
+        with receipt_status(ResponseCode.INSUFFICIENT_TOKEN_BALANCE):
+            result = transfer_between('0.0.200', 'hex=abcd', '0.0.100', 50)
+        self.assertEqual(result, {'status': 'failed', 'error': 'INSUFFICIENT_TOKEN_BALANCE'})
+
+    def test_successful_receipt(self):
+        with receipt_status(ResponseCode.SUCCESS):
+            self.assertEqual(transfer_between('0.0.200', 'hex=abcd', '0.0.100', 50)['status'], 'success')
+
+class MarketplacePurchaseTests(TestCase):
+    def setUp(self):
+        self.seller = make_user('seller', '0.0.100')
+        self.buyer = make_user('buyer', '0.0.200')
+        self.buyer_wallet = UserWallet.objects.get(user=self.buyer)
+        self.nft = GovernanceNFT.objects.create(
+            user=self.seller, tier='cosmic', nft_id='0.0.9-1', serial_number=1, token_id='0.0.9',
+        )
+        self.listing = NFTMarketplace.objects.create(nft=self.nft, seller=self.seller, tier='cosmic', price=Decimal('50'))
+
+    def patch_chain(self, payments=(SUCCESS,), transfer=SUCCESS, owners=None):
+        patches = [
+            mock.patch('governance.marketplace.transfer_between', side_effect=list(payments)),
+            mock.patch('governance.marketplace.transfer_nft', return_value=transfer),
+            mock.patch('governance.marketplace.get_nft_owners', return_value=owners),
+        ]
+        mocks = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+        return mocks
+
+    def reload(self):
+        return NFTMarketplace.objects.get(id=self.listing.id)
+
+    def resume(self):
+        out = StringIO()
+        call_command('resume_listing_purchases', stdout=out)
+        return out.getvalue()
+
+    def age(self, stage, **fields):
+        NFTMarketplace.objects.filter(id=self.listing.id).update(
+            buyer=self.buyer, reserved_at=timezone.now() - LISTING_RESERVATION_TIMEOUT - timedelta(minutes=1),
+            settlement_stage=stage, **fields,
+        )
+
+    def test_purchase_settles(self):
+        self.patch_chain()
+        buy_listing(self.listing.id, self.buyer, self.buyer_wallet)
+        listing = self.reload()
+        self.assertTrue(listing.is_sold)
+        self.assertEqual(listing.settlement_stage, '')
+        self.assertEqual(GovernanceNFT.objects.get(id=self.nft.id).user, self.buyer)
+
+    def test_unfunded_payment_does_not_buy_the_nft(self):
+        transfer_nft = mock.patch('governance.marketplace.transfer_nft', return_value=SUCCESS).start()
+        self.addCleanup(mock.patch.stopall)
+        with receipt_status(ResponseCode.INSUFFICIENT_TOKEN_BALANCE):
+            with self.assertRaisesMessage(PurchaseError, 'INSUFFICIENT_TOKEN_BALANCE'):
+                buy_listing(self.listing.id, self.buyer, self.buyer_wallet)
+        listing = self.reload()
+        self.assertEqual((listing.is_sold, listing.settlement_stage, listing.reserved_at), (False, '', None))
+        self.assertEqual(GovernanceNFT.objects.get(id=self.nft.id).user, self.seller)
+        transfer_nft.assert_not_called()
+
+    def wallet_versions(self):
+        return [get_fragment_version(USER_WALLET, user.id) for user in (self.buyer, self.seller)]
+
+    def test_purchase_invalidates_both_wallets(self):
+        self.patch_chain()
+        before = self.wallet_versions()
+        with self.captureOnCommitCallbacks(execute=True):
+            buy_listing(self.listing.id, self.buyer, self.buyer_wallet)
+        self.assertTrue(all(after > old for after, old in zip(self.wallet_versions(), before)))
+
+    def test_failed_transfer_refunds_and_releases(self):
+        transfer_between, _, _ = self.patch_chain(payments=[SUCCESS, SUCCESS], transfer=FAILED)
+        with self.assertRaisesMessage(PurchaseError, 'refunded'):
+            buy_listing(self.listing.id, self.buyer, self.buyer_wallet)
+        listing = self.reload()
+        self.assertEqual((listing.reserved_at, listing.settlement_stage, listing.buyer), (None, '', None))
+        self.assertEqual(transfer_between.call_count, 2)
+
+    def test_failed_refund_is_kept_for_recovery(self):
+        self.patch_chain(payments=[SUCCESS, FAILED], transfer=FAILED)
+        with self.assertRaises(PurchaseError):
+            buy_listing(self.listing.id, self.buyer, self.buyer_wallet)
+        listing = self.reload()
+        self.assertEqual(listing.settlement_stage, 'refund_failed')
+        self.assertIsNotNone(listing.reserved_at)
+
+    def test_expired_reservation_is_released(self):
+        self.age('reserved')
+        self.assertIn('Released 1 expired reservations', self.resume())
+        listing = self.reload()
+        self.assertEqual((listing.reserved_at, listing.settlement_stage, listing.buyer), (None, '', None))
+
+    def test_fresh_reservation_is_left_alone(self):
+        NFTMarketplace.objects.filter(id=self.listing.id).update(
+            buyer=self.buyer, reserved_at=timezone.now(), settlement_stage='reserved',
+        )
+        self.assertIn('Released 0 expired reservations', self.resume())
+        self.assertEqual(self.reload().settlement_stage, 'reserved')
+
+    def test_expired_reservation_cannot_start_payment(self):
+        transfer_between, _, _ = self.patch_chain()
+
+        def reserve_then_expire(listing_id, buyer):
+            listing = reserve_listing(listing_id, buyer)
+            self.age('reserved')
+            call_command('resume_listing_purchases', stdout=StringIO())
+            return listing
+
+        with mock.patch('governance.marketplace.reserve_listing', side_effect=reserve_then_expire):
+            with self.assertRaisesMessage(PurchaseError, 'reservation expired'):
+                buy_listing(self.listing.id, self.buyer, self.buyer_wallet)
+        transfer_between.assert_not_called()
+
+    def test_paid_purchase_settles_when_buyer_already_holds_the_nft(self):
+        _, transfer_nft, _ = self.patch_chain(owners={1: '0.0.200'})
+        self.age('paid')
+        self.assertIn('Settled 1 purchases', self.resume())
+        self.assertTrue(self.reload().is_sold)
+        transfer_nft.assert_not_called()
+
+    def test_paid_purchase_retries_the_transfer(self):
+        _, transfer_nft, _ = self.patch_chain(owners={1: '0.0.100'})
+        self.age('paid')
+        self.resume()
+        self.assertTrue(self.reload().is_sold)
+        self.assertEqual(GovernanceNFT.objects.get(id=self.nft.id).user, self.buyer)
+        transfer_nft.assert_called_once()
+
+    def test_failed_refund_is_retried(self):
+        self.patch_chain(payments=[SUCCESS])
+        self.age('refund_failed', settlement_error='refund failed')
+        self.assertIn('refunded 1', self.resume())
+        listing = self.reload()
+        self.assertEqual((listing.reserved_at, listing.settlement_stage, listing.is_sold), (None, '', False))
+
+    def test_unknown_payment_is_flagged(self):
+        transfer_between, _, _ = self.patch_chain()
+        self.age('paying')
+        self.assertIn('needs manual review', self.resume())
+        listing = self.reload()
+        self.assertEqual(listing.settlement_stage, 'paying')
+        self.assertIn('Payment outcome unknown', listing.settlement_error)
+        transfer_between.assert_not_called()
+
+
+class PurchaseNFTTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user('member', '0.0.300')
+        self.client.force_login(self.user)
+        sync_tier_inventory()
+        self.patches = {
+            name: mock.patch(f'governance.views.{name}', return_value=value)
+            for name, value in {
+                'get_balance': 100000,
+                'mint_nft': {'status': 'success', 'message': '0.0.7181084@1', 'serial': 1},
+                'associate_nft': SUCCESS,
+                'fund_pool': SUCCESS,
+            }.items()
+        }
+        self.mocks = {name: patch.start() for name, patch in self.patches.items()}
+        for patch in self.patches.values():
+            self.addCleanup(patch.stop)
+
+    def remaining(self):
+        return get_tier_inventory()['cosmic']['remaining']
+
+    def purchase(self):
+        return self.client.post(reverse('purchase_nft', args=['cosmic']))
+
+    def test_purchase_takes_a_unit(self):
+        before = self.remaining()
+        wallet_version = get_fragment_version(USER_WALLET, self.user.id)
+        response = self.purchase()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.remaining(), before - 1)
+        self.assertEqual(UserVotingPower.objects.get(user=self.user).nft_count, 1)
+        self.assertGreater(get_fragment_version(USER_WALLET, self.user.id), wallet_version)
+
+    def test_failed_mint_returns_the_unit(self):
+        self.mocks['mint_nft'].return_value = {'status': 'failed', 'message': 'network down'}
+        before = self.remaining()
+        self.assertEqual(self.purchase().status_code, 500)
+        self.assertEqual(self.remaining(), before)
+
+    def test_failed_record_write_returns_the_unit(self):
+        # The minted id is already recorded, so the insert hits the unique constraint
+        other = make_user('other', '0.0.400')
+        GovernanceNFT.objects.create(user=other, tier='stellar', nft_id='0.0.7181084@1', serial_number=1, token_id='0.0.7181084')
+        before = self.remaining()
+        self.assertEqual(self.purchase().status_code, 500)
+        self.assertEqual(self.remaining(), before)
+        self.assertFalse(UserVotingPower.objects.filter(user=self.user, nft_count__gt=0).exists())
+
+    def test_sold_out_tier_is_not_minted(self):
+        TierInventory.objects.filter(tier='cosmic').update(remaining=0)
+        response = self.purchase()
+        self.assertEqual(response.status_code, 400)
+        self.mocks['mint_nft'].assert_not_called()
@@ -13,6 +13,9 @@ urlpatterns = [
     path('api/governance/nft/purchase/<str:tier>/', views.purchase_nft, name='purchase_nft'),
     path('api/governance/nft/my-nfts/', views.get_user_nfts, name='user_nfts'),
     path('api/governance/nft/<int:nft_id>/list/', views.list_nft_for_sale, name='list_nft'),
+    path('api/governance/marketplace/', views.browse_nft_marketplace, name='nft_marketplace'),
+    path('api/governance/marketplace/summary/', views.nft_market_summary, name='nft_market_summary'),
+    path('api/governance/marketplace/<int:listing_id>/buy/', views.buy_nft_listing, name='buy_nft_listing'),
     
     # Stats and info endpoints
     path('api/governance/stats/', views.governance_stats, name='governance_stats'),
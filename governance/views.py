@@ -10,11 +10,24 @@ from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 import json
 import logging
+from decimal import Decimal, InvalidOperation
 from .models import GovernanceNFT, GovernanceTopic, GovernanceProposal, Vote, NFTMarketplace
 from hiero.governance import submit_message, mint_nft, associate_nft
 from core.models import UserWallet
+from core.fragment_cache import bump_fragment_version, USER_WALLET
+from core.rate_limit import rate_limit
 from hiero.ft import fund_pool
 from hiero.mirror_node import get_balance
+from .stats import get_stats_snapshot, get_user_stats
+from .vote_anchoring import schedule_vote_anchoring
+from .voting_power import get_voting_power
+from .inventory import get_tier_inventory, release_tier_unit, reserve_tier_unit
+from .marketplace import (
+    buy_listing, get_listings_page, get_market_summary, PurchaseError, LISTINGS_PAGE_SIZE, MAX_LISTINGS_PAGE_SIZE,
+)
+from .proposal_feed import (
+    get_feed_page, get_user_votes, with_user_vote, FEED_PAGE_SIZE, MAX_FEED_PAGE_SIZE,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -40,22 +53,6 @@ class GovernanceConfig:
     MAX_PROPOSAL_TITLE_LENGTH = 200
     MIN_PROPOSAL_DESC_LENGTH = 10
     MAX_PROPOSAL_DESC_LENGTH = 2000
-    RATE_LIMITS = {
-        'create_proposal': {'limit': 3, 'timeout': 3600},  # 3 per hour
-        'cast_vote': {'limit': 10, 'timeout': 300},       # 10 per 5 minutes
-        'purchase_nft': {'limit': 5, 'timeout': 3600},    # 5 per hour
-    }
-
-def rate_limit_check(user_id, action):
-    """Check if user has exceeded rate limits for an action"""
-    limit_config = GovernanceConfig.RATE_LIMITS.get(action, {'limit': 5, 'timeout': 300})
-    key = f"rate_limit:{action}:{user_id}"
-    count = cache.get(key, 0)
-    
-    if count >= limit_config['limit']:
-        return True
-    cache.set(key, count + 1, limit_config['timeout'])
-    return False
 
 def validate_proposal_data(data):
     """Validate proposal creation data"""
@@ -97,32 +94,30 @@ def validate_vote_data(data):
     return vote_choice
 
 def get_user_wallet(user):
-    """Get user's wallet or return error response"""
+    """Get user's provisioned wallet or None"""
     try:
-        return UserWallet.objects.get(user=user)
+        wallet = UserWallet.objects.get(user=user)
     except UserWallet.DoesNotExist:
         logger.warning(f"User {user.id} attempted action without wallet")
         return None
+    if not wallet.is_provisioned:
+        logger.info(f"User {user.id} attempted action while wallet is {wallet.status}")
+        return None
+    return wallet
 
 @csrf_exempt
 @require_http_methods(["POST"])
 @login_required
+@rate_limit('create_proposal', 'Rate limit exceeded. Please wait before creating another proposal.')
 def create_proposal(request):
     """Create a new governance proposal"""
     try:
-        # Rate limiting check
-        if rate_limit_check(request.user.id, 'create_proposal'):
-            return JsonResponse({
-                'success': False,
-                'error': 'Rate limit exceeded. Please wait before creating another proposal.'
-            }, status=429)
-        
         data = json.loads(request.body)
         validated_data = validate_proposal_data(data)
         
         # Check if user has governance NFT
-        user_nft = GovernanceNFT.objects.filter(user=request.user, is_active=True).first()
-        if not user_nft:
+        _, nft_count = get_voting_power(request.user)
+        if not nft_count:
             logger.warning(f"User {request.user.id} attempted to create proposal without NFT")
             return JsonResponse({
                 'success': False,
@@ -190,16 +185,10 @@ def create_proposal(request):
 @csrf_exempt
 @require_http_methods(["POST"])
 @login_required
+@rate_limit('cast_vote', 'Rate limit exceeded. Please wait before voting again.')
 def cast_vote(request, proposal_id):
     """Cast a vote on a proposal"""
     try:
-        # Rate limiting check
-        if rate_limit_check(request.user.id, 'cast_vote'):
-            return JsonResponse({
-                'success': False,
-                'error': 'Rate limit exceeded. Please wait before voting again.'
-            }, status=429)
-        
         data = json.loads(request.body)
         vote_choice = validate_vote_data(data)
         
@@ -212,9 +201,8 @@ def cast_vote(request, proposal_id):
                 'error': 'Voting is not active for this proposal'
             }, status=400)
         
+        # The finalize_proposals job closes the proposal and records its result
         if timezone.now() > proposal.voting_end:
-            proposal.status = 'ended'
-            proposal.save()
             return JsonResponse({
                 'success': False,
                 'error': 'Voting period has ended'
@@ -228,17 +216,15 @@ def cast_vote(request, proposal_id):
                 'error': 'You have already voted on this proposal'
             }, status=400)
         
-        # Get user's voting power
-        user_nft = GovernanceNFT.objects.filter(user=request.user, is_active=True).first()
-        if not user_nft:
+        # Get user's voting power, summed over all of their active NFTs
+        voting_power, nft_count = get_voting_power(request.user)
+        if not nft_count:
             return JsonResponse({
                 'success': False,
                 'error': 'Governance NFT required to vote'
             }, status=403)
         
-        voting_power = user_nft.voting_power
-        
-        # Create vote
+        # Commit the vote locally; HCS anchoring happens in the background
         with transaction.atomic():
             vote = Vote.objects.create(
                 proposal=proposal,
@@ -247,32 +233,20 @@ def cast_vote(request, proposal_id):
                 voting_power=voting_power
             )
             
-            # Submit to Hedera
-            message = f"VOTE:{proposal.id}:{request.user.username}:{vote_choice}:{voting_power}"
-            hedera_result = submit_message(message, proposal.topic.topic_id)
+            # Tallies are bumped in SQL so concurrent votes never overwrite each other
+            proposal.record_vote(vote_choice, voting_power)
             
-            if hedera_result['status'] == 'success':
-                vote.hedera_transaction_id = str(hedera_result['topic'])
-                vote.save()
-                
-                # Update proposal status if needed
-                update_proposal_status(proposal)
-                
-                logger.info(f"Vote cast by user {request.user.id} on proposal {proposal.id}")
-                
-                return JsonResponse({
-                    'success': True,
-                    'vote_id': vote.id,
-                    'hedera_transaction_id': vote.hedera_transaction_id,
-                    'message': 'Vote recorded on blockchain'
-                })
-            else:
-                vote.delete()
-                logger.error(f"Hedera submission failed for vote by user {request.user.id}: {hedera_result}")
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Failed to record vote on blockchain'
-                }, status=500)
+            schedule_vote_anchoring(vote.id)
+        
+        logger.info(f"Vote cast by user {request.user.id} on proposal {proposal.id}")
+        
+        return JsonResponse({
+            'success': True,
+            'vote_id': vote.id,
+            'status': vote.status,
+            'hedera_transaction_id': None,
+            'message': 'Vote recorded. It will be anchored on Hedera shortly.'
+        })
                 
     except json.JSONDecodeError:
         logger.error(f"Invalid JSON from user {request.user.id} for voting")
@@ -296,17 +270,18 @@ def cast_vote(request, proposal_id):
 @csrf_exempt
 @require_http_methods(["POST"])
 @login_required
-@transaction.atomic
+@rate_limit('purchase_nft', 'Rate limit exceeded. Please wait before purchasing another NFT.')
 def purchase_nft(request, tier):
-    """Purchase a governance NFT"""
+    """Purchase a governance NFT.
+
+    Not one transaction: the tier unit is claimed with a single UPDATE before
+    minting so no lock is held across the Hedera calls. Until the NFT record
+    exists the claim is compensated in ``finally`` (failed mint, association
+    or record write); the record and the voting-power rows its signals write
+    commit atomically together. A worker that dies in between leaves the
+    counter one short until sync_tier_inventory recounts it.
+    """
     try:
-        # Rate limiting check
-        if rate_limit_check(request.user.id, 'purchase_nft'):
-            return JsonResponse({
-                'success': False,
-                'error': 'Rate limit exceeded. Please wait before purchasing another NFT.'
-            }, status=429)
-        
         tier = tier.lower()
         price = GovernanceConfig.NFT_PRICES.get(tier)
         if not price:
@@ -336,16 +311,6 @@ def purchase_nft(request, tier):
                 'error': f'Insufficient balance. Need {price} ASTRA, have {astra_bal} ASTRA'
             }, status=400)
         
-        # Check availability
-        existing_count = GovernanceNFT.objects.filter(tier=tier, is_active=True).count()
-        max_count = GovernanceConfig.NFT_LIMITS.get(tier, 0)
-        
-        if existing_count >= max_count:
-            return JsonResponse({
-                'success': False,
-                'error': 'No NFTs available for this tier'
-            }, status=400)
-        
         # Check if user already has an NFT of this tier
         existing_user_nft = GovernanceNFT.objects.filter(user=request.user, tier=tier, is_active=True).first()
         if existing_user_nft:
@@ -354,85 +319,100 @@ def purchase_nft(request, tier):
                 'error': f'You already own a {tier} NFT'
             }, status=400)
         
-        # Mint NFT on Hedera
-        token_ids = {
-            'celestial': '0.0.7174407',
-            'stellar': '0.0.7174419',
-            'cosmic': '0.0.7181084'
-        }
-        
-        token_id = token_ids.get(tier)
-        if not token_id:
+        # Reserve a unit of supply before minting; it is released again if no NFT is created
+        if not reserve_tier_unit(tier):
             return JsonResponse({
                 'success': False,
-                'error': 'Invalid token configuration'
-            }, status=500)
-            
-        metadata = json.dumps({
-            "tier": tier,
-            "owner": user_wallet.recipient_id,
-            "timestamp": str(timezone.now()),
-        })
-        print(token_id)
-        mint_result = mint_nft(token_id, metadata)
-        
-        if mint_result['status'] == 'success':
-            # Associate NFT with user's wallet
-            assc = associate_nft(
-                account_id=user_wallet.recipient_id, 
-                token_id=token_id, 
-                account_private_key=user_wallet.decrypt_key(), 
-                nft_id=mint_result['message']
-            )
+                'error': 'No NFTs available for this tier'
+            }, status=400)
+        
+        nft = None
+        try:
+            # Mint NFT on Hedera
+            token_ids = {
+                'celestial': '0.0.7174407',
+                'stellar': '0.0.7174419',
+                'cosmic': '0.0.7181084'
+            }
+        
+            token_id = token_ids.get(tier)
+            if not token_id:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid token configuration'
+                }, status=500)
             
-            if assc['status'] == 'success':
-                # Create NFT record
-                nft = GovernanceNFT.objects.create(
-                    user=request.user,
-                    tier=tier,
-                    nft_id=str(mint_result['message']),
-                    serial_number=mint_result['serial'],
-                    token_id=token_id,
-                    voting_power=GovernanceConfig.VOTING_POWER.get(tier, 1)
+            metadata = json.dumps({
+                "tier": tier,
+                "owner": user_wallet.recipient_id,
+                "timestamp": str(timezone.now()),
+            })
+            print(token_id)
+            mint_result = mint_nft(token_id, metadata)
+        
+            if mint_result['status'] == 'success':
+                # Associate NFT with user's wallet
+                assc = associate_nft(
+                    account_id=user_wallet.recipient_id, 
+                    token_id=token_id, 
+                    account_private_key=user_wallet.decrypt_key(), 
+                    nft_id=mint_result['message']
                 )
+            
+                if assc['status'] == 'success':
+                    # Create NFT record together with the voting power its signals add
+                    with transaction.atomic():
+                        nft = GovernanceNFT.objects.create(
+                            user=request.user,
+                            tier=tier,
+                            nft_id=str(mint_result['message']),
+                            serial_number=mint_result['serial'],
+                            token_id=token_id,
+                            voting_power=GovernanceConfig.VOTING_POWER.get(tier, 1)
+                        )
 
-                # Deduct balance 
-                transfer = fund_pool(
-                    recipient_id=user_wallet.recipient_id, 
-                    amount=price, 
-                    account_private_key=user_wallet.decrypt_key()
-                )
+                    # Deduct balance 
+                    transfer = fund_pool(
+                        recipient_id=user_wallet.recipient_id, 
+                        amount=price, 
+                        account_private_key=user_wallet.decrypt_key()
+                    )
+                    # Whatever the outcome, the cached balance behind the user's invest checks is suspect
+                    bump_fragment_version(USER_WALLET, request.user.id)
+                
+                    if transfer['status'] == 'failed':
+                        logger.error(f"Balance transfer failed for user {request.user.id}: {transfer}")
+                        return JsonResponse({
+                            'success': False,
+                            'error': f'Payment processing failed: {transfer.get("message", "Unknown error")}'
+                        }, status=500)
+
+                    logger.info(f"NFT purchased by user {request.user.id}: {tier} tier")
                 
-                if transfer['status'] == 'failed':
-                    logger.error(f"Balance transfer failed for user {request.user.id}: {transfer}")
+                    return JsonResponse({
+                        'success': True,
+                        'nft_id': nft.id,
+                        'hedera_nft_id': nft.nft_id,
+                        'serial_number': nft.serial_number,
+                        'tier': nft.tier,
+                        'voting_power': nft.voting_power,
+                        'message': f'Successfully purchased {tier} NFT'
+                    })
+                else:
+                    logger.error(f"NFT association failed for user {request.user.id}: {assc}")
                     return JsonResponse({
                         'success': False,
-                        'error': f'Payment processing failed: {transfer.get("message", "Unknown error")}'
+                        'error': f'NFT Association failed: {assc.get("message", "Unknown error")}'
                     }, status=500)
-
-                logger.info(f"NFT purchased by user {request.user.id}: {tier} tier")
-                
-                return JsonResponse({
-                    'success': True,
-                    'nft_id': nft.id,
-                    'hedera_nft_id': nft.nft_id,
-                    'serial_number': nft.serial_number,
-                    'tier': nft.tier,
-                    'voting_power': nft.voting_power,
-                    'message': f'Successfully purchased {tier} NFT'
-                })
             else:
-                logger.error(f"NFT association failed for user {request.user.id}: {assc}")
+                logger.error(f"NFT minting failed for user {request.user.id}: {mint_result}")
                 return JsonResponse({
                     'success': False,
-                    'error': f'NFT Association failed: {assc.get("message", "Unknown error")}'
+                    'error': f'NFT minting failed: {mint_result.get("message", "Unknown error")}'
                 }, status=500)
-        else:
-            logger.error(f"NFT minting failed for user {request.user.id}: {mint_result}")
-            return JsonResponse({
-                'success': False,
-                'error': f'NFT minting failed: {mint_result.get("message", "Unknown error")}'
-            }, status=500)
+        finally:
+            if nft is None:
+                release_tier_unit(tier)
                 
     except Exception as e:
         logger.error(f"Unexpected error in purchase_nft for user {request.user.id}: {str(e)}")
@@ -448,12 +428,16 @@ def list_nft_for_sale(request, nft_id):
     """List an NFT for sale on marketplace"""
     try:
         data = json.loads(request.body)
-        price = data.get('price')
+        try:
+            price = Decimal(str(data.get('price')))
+        except InvalidOperation:
+            price = None
         
-        if not price or price <= 0:
+        # Settlement moves whole ASTRA on chain
+        if not price or not price.is_finite() or price <= 0 or price != price.to_integral_value():
             return JsonResponse({
                 'success': False,
-                'error': 'Valid price is required'
+                'error': 'Valid price is required (a whole number of ASTRA)'
             }, status=400)
         
         nft = get_object_or_404(GovernanceNFT, id=nft_id, user=request.user, is_active=True)
@@ -470,6 +454,7 @@ def list_nft_for_sale(request, nft_id):
         listing = NFTMarketplace.objects.create(
             nft=nft,
             seller=request.user,
+            tier=nft.tier,
             price=price
         )
         
@@ -479,7 +464,7 @@ def list_nft_for_sale(request, nft_id):
             'success': True,
             'listing_id': listing.id,
             'price': listing.price,
-            'listed_at': listing.created_at,
+            'listed_at': listing.listed_at,
             'message': 'NFT listed for sale successfully'
         })
         
@@ -497,37 +482,122 @@ def list_nft_for_sale(request, nft_id):
 
 @require_http_methods(["GET"])
 @login_required
-def get_proposal_results(request, proposal_id):
-    """Get voting results for a proposal"""
+def browse_nft_marketplace(request):
+    """Open listings, cheapest first. Filter with ``?tier=`` and paginate
+    with ``?cursor=<next_cursor>&limit=<n>``."""
     try:
-        proposal = get_object_or_404(GovernanceProposal, id=proposal_id)
+        tier = request.GET.get('tier') or None
+        if tier and tier not in GovernanceConfig.NFT_PRICES:
+            return JsonResponse({
+                'success': False,
+                'error': 'Invalid NFT tier'
+            }, status=400)
         
-        votes = Vote.objects.filter(proposal=proposal)
-        total_votes = sum(vote.voting_power for vote in votes)
+        limit = request.GET.get('limit', str(LISTINGS_PAGE_SIZE))
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_LISTINGS_PAGE_SIZE:
+            return JsonResponse({
+                'success': False,
+                'error': f'limit must be between 1 and {MAX_LISTINGS_PAGE_SIZE}'
+            }, status=400)
         
-        yes_votes = sum(vote.voting_power for vote in votes if vote.vote == 'yes')
-        no_votes = sum(vote.voting_power for vote in votes if vote.vote == 'no')
-        abstain_votes = sum(vote.voting_power for vote in votes if vote.vote == 'abstain')
+        try:
+            page = get_listings_page(tier, request.GET.get('cursor'), int(limit))
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
         
-        yes_percentage = (yes_votes / total_votes * 100) if total_votes > 0 else 0
-        no_percentage = (no_votes / total_votes * 100) if total_votes > 0 else 0
-        abstain_percentage = (abstain_votes / total_votes * 100) if total_votes > 0 else 0
+        return JsonResponse({
+            'success': True,
+            'listings': page['listings'],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['next_cursor'] is not None,
+        })
+        
+    except Exception as e:
+        logger.error(f"Error browsing NFT marketplace: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Failed to load marketplace'
+        }, status=500)
+
+@require_http_methods(["GET"])
+@login_required
+def nft_market_summary(request):
+    """Floor price and number of open listings per tier"""
+    try:
+        return JsonResponse({
+            'success': True,
+            'tiers': get_market_summary()
+        })
+    except Exception as e:
+        logger.error(f"Error getting NFT market summary: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Failed to load market summary'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@login_required
+@rate_limit('buy_nft_listing', 'Rate limit exceeded. Please wait before buying another NFT.')
+def buy_nft_listing(request, listing_id):
+    """Buy an NFT listed on the marketplace"""
+    try:
+        user_wallet = get_user_wallet(request.user)
+        if not user_wallet:
+            return JsonResponse({
+                'success': False,
+                'error': 'Hedera Wallet not initiated, try again later!'
+            }, status=400)
+        
+        try:
+            listing = buy_listing(listing_id, request.user, user_wallet)
+        except PurchaseError as e:
+            logger.warning(f"Purchase of listing {listing_id} by user {request.user.id} failed: {e}")
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            }, status=e.status)
+        
+        return JsonResponse({
+            'success': True,
+            'listing_id': listing.id,
+            'nft_id': listing.nft_id,
+            'tier': listing.tier,
+            'price': listing.price,
+            'voting_power': listing.nft.voting_power,
+            'message': f'Successfully bought {listing.tier} NFT'
+        })
+        
+    except Exception as e:
+        logger.error(f"Unexpected error buying listing {listing_id} for user {request.user.id}: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Internal server error during NFT purchase'
+        }, status=500)
+
+@require_http_methods(["GET"])
+@login_required
+def get_proposal_results(request, proposal_id):
+    """Get voting results for a proposal"""
+    try:
+        proposal = get_object_or_404(GovernanceProposal, id=proposal_id)
+        yes_percentage = proposal.yes_percentage
         
         return JsonResponse({
             'proposal_id': proposal.id,
             'title': proposal.title,
             'status': proposal.status,
-            'total_votes': total_votes,
-            'yes_votes': yes_votes,
-            'no_votes': no_votes,
-            'abstain_votes': abstain_votes,
+            'total_votes': proposal.total_power,
+            'yes_votes': proposal.yes_power,
+            'no_votes': proposal.no_power,
+            'abstain_votes': proposal.abstain_power,
             'yes_percentage': round(yes_percentage, 2),
-            'no_percentage': round(no_percentage, 2),
-            'abstain_percentage': round(abstain_percentage, 2),
+            'no_percentage': round(proposal.power_percentage('no'), 2),
+            'abstain_percentage': round(proposal.power_percentage('abstain'), 2),
             'approval_threshold': proposal.min_approval_percentage,
             'is_passed': yes_percentage >= proposal.min_approval_percentage,
             'voting_end': proposal.voting_end,
-            'unique_voters': votes.values('voter').distinct().count()
+            'unique_voters': proposal.voter_count
         })
         
     except Exception as e:
@@ -569,60 +639,15 @@ def get_user_nfts(request):
             'error': 'Failed to get user NFTs'
         }, status=500)
 
-@require_http_methods(["GET"])
-@login_required
-def get_active_proposals(request):
-    """Get all active proposals"""
-    try:
-        proposals = GovernanceProposal.objects.filter(status='active').select_related('creator', 'topic')
-        proposal_data = []
-        for proposal in proposals:
-            # Check if user has voted on this proposal
-            user_vote = Vote.objects.filter(proposal=proposal, voter=request.user).first()
-            
-            proposal_data.append({
-                'id': proposal.id,
-                'title': proposal.title,
-                'description': proposal.description,
-                'creator': {
-                    'id': proposal.creator.id,
-                    'username': proposal.creator.username
-                },
-                'topic': {
-                    'id': proposal.topic.id,
-                    'name': proposal.topic.name,
-                    'topic_id': proposal.topic.topic_id
-                },
-                'voting_start': proposal.voting_start,
-                'voting_end': proposal.voting_end,
-                'min_approval_percentage': proposal.min_approval_percentage,
-                'hedera_message_id': proposal.hedera_message_id,
-                'created_at': proposal.created_at,
-                'has_voted': user_vote is not None,
-                'user_vote': user_vote.vote if user_vote else None,
-                'total_votes': Vote.objects.filter(proposal=proposal).count()
-            })
-        
-        return JsonResponse({
-            'success': True,
-            'proposals': proposal_data,
-            'total_active': len(proposal_data)
-        })
-        
-    except Exception as e:
-        logger.error(f"Error getting active proposals: {str(e)}")
-        return JsonResponse({
-            'success': False,
-            'error': 'Failed to get active proposals'
-        }, status=500)
-
 @require_http_methods(["GET"])
 @login_required
 def get_proposal_detail(request, proposal_id):
     """Get detailed information about a specific proposal"""
     try:
-        proposal = get_object_or_404(GovernanceProposal, id=proposal_id)
-        user_vote = Vote.objects.filter(proposal=proposal, voter=request.user).first()
+        proposal = get_object_or_404(
+            with_user_vote(GovernanceProposal.objects.select_related('creator', 'topic'), request.user),
+            id=proposal_id
+        )
         
         proposal_data = {
             'id': proposal.id,
@@ -643,9 +668,9 @@ def get_proposal_detail(request, proposal_id):
             'min_approval_percentage': proposal.min_approval_percentage,
             'hedera_message_id': proposal.hedera_message_id,
             'created_at': proposal.created_date,
-            'has_voted': user_vote is not None,
-            'user_vote': user_vote.vote if user_vote else None,
-            'user_voting_power': user_vote.voting_power if user_vote else 0
+            'has_voted': proposal.user_vote is not None,
+            'user_vote': proposal.user_vote,
+            'user_voting_power': proposal.user_voting_power or 0
         }
         
         return JsonResponse({
@@ -665,46 +690,10 @@ def get_proposal_detail(request, proposal_id):
 def governance_stats(request):
     """Get governance statistics"""
     try:
-        total_nfts = GovernanceNFT.objects.filter(is_active=True).count()
-        celestial_count = GovernanceNFT.objects.filter(tier='celestial', is_active=True).count()
-        stellar_count = GovernanceNFT.objects.filter(tier='stellar', is_active=True).count()
-        cosmic_count = GovernanceNFT.objects.filter(tier='cosmic', is_active=True).count()
-        
         stats = {
             'success': True,
-            'nft_stats': {
-                'celestial': {
-                    'available': GovernanceConfig.NFT_LIMITS['celestial'] - celestial_count,
-                    'total': GovernanceConfig.NFT_LIMITS['celestial'],
-                    'sold': celestial_count
-                },
-                'stellar': {
-                    'available': GovernanceConfig.NFT_LIMITS['stellar'] - stellar_count,
-                    'total': GovernanceConfig.NFT_LIMITS['stellar'],
-                    'sold': stellar_count
-                },
-                'cosmic': {
-                    'available': GovernanceConfig.NFT_LIMITS['cosmic'] - cosmic_count,
-                    'total': GovernanceConfig.NFT_LIMITS['cosmic'],
-                    'sold': cosmic_count
-                }
-            },
-            'proposal_stats': {
-                'active': GovernanceProposal.objects.filter(status='active').count(),
-                'passed': GovernanceProposal.objects.filter(status='passed').count(),
-                'rejected': GovernanceProposal.objects.filter(status='rejected').count(),
-                'total': GovernanceProposal.objects.count()
-            },
-            'voting_stats': {
-                'total_votes': Vote.objects.count(),
-                'total_voters': Vote.objects.values('voter').distinct().count(),
-                'total_voting_power': sum(vote.voting_power for vote in Vote.objects.all())
-            },
-            'user_stats': {
-                'has_nft': GovernanceNFT.objects.filter(user=request.user, is_active=True).exists(),
-                'user_votes': Vote.objects.filter(voter=request.user).count(),
-                'user_voting_power': sum(nft.voting_power for nft in GovernanceNFT.objects.filter(user=request.user, is_active=True))
-            }
+            **get_stats_snapshot(),
+            'user_stats': get_user_stats(request.user)
         }
         
         return JsonResponse(stats)
@@ -716,75 +705,45 @@ def governance_stats(request):
             'error': 'Failed to get governance statistics'
         }, status=500)
 
-def update_proposal_status(proposal):
-    """Update proposal status based on voting results"""
-    try:
-        votes = Vote.objects.filter(proposal=proposal)
-        total_votes = sum(vote.voting_power for vote in votes)
-        
-        if total_votes > 0:
-            yes_votes = sum(vote.voting_power for vote in votes if vote.vote == 'yes')
-            yes_percentage = (yes_votes / total_votes * 100)
-            
-            if yes_percentage >= proposal.min_approval_percentage:
-                proposal.status = 'passed'
-            else:
-                proposal.status = 'rejected'
-            
-            proposal.save()
-            logger.info(f"Proposal {proposal.id} status updated to {proposal.status}")
-            
-    except Exception as e:
-        logger.error(f"Error updating status for proposal {proposal.id}: {str(e)}")
-
-
 # views.py - Add these functions
 
 @require_http_methods(["GET"])
 @login_required
 def get_active_proposals(request):
-    """Get all active proposals for the dashboard"""
+    """Get active proposals for the dashboard, soonest-ending first.
+    Paginate with ``?cursor=<next_cursor>&limit=<n>``."""
     try:
-        proposals = GovernanceProposal.objects.filter(status='active').select_related('creator', 'topic')
-        proposal_data = []
-        
-        for proposal in proposals:
-            # Get vote counts
-            votes = Vote.objects.filter(proposal=proposal)
-            total_votes = sum(vote.voting_power for vote in votes)
-            yes_votes = sum(vote.voting_power for vote in votes if vote.vote == 'yes')
-            yes_percentage = (yes_votes / total_votes * 100) if total_votes > 0 else 0
-            
-            # Check if user has voted
-            user_vote = Vote.objects.filter(proposal=proposal, voter=request.user).first()
-            
-            proposal_data.append({
-                'id': proposal.id,
-                'title': proposal.title,
-                'description': proposal.description,
-                'status': proposal.status,
-                'voting_start': proposal.voting_start,
-                'voting_end': proposal.voting_end,
-                'min_approval_percentage': proposal.min_approval_percentage,
-                'creator': {
-                    'id': proposal.creator.id,
-                    'username': proposal.creator.username
-                },
-                'topic': {
-                    'id': proposal.topic.id,
-                    'name': proposal.topic.name,
-                    'topic_id': proposal.topic.topic_id
-                },
-                'total_votes': total_votes,
-                'yes_percentage': round(yes_percentage, 2),
-                'has_voted': user_vote is not None,
-                'user_vote': user_vote.vote if user_vote else None,
-                'is_urgent': timezone.now() > proposal.voting_end - timezone.timedelta(hours=24)
-            })
+        limit = request.GET.get('limit', str(FEED_PAGE_SIZE))
+        if not limit.isdigit() or not 1 <= int(limit) <= MAX_FEED_PAGE_SIZE:
+            return JsonResponse({
+                'success': False,
+                'error': f'limit must be between 1 and {MAX_FEED_PAGE_SIZE}'
+            }, status=400)
+        
+        try:
+            page = get_feed_page(request.GET.get('cursor'), int(limit))
+        except ValueError as e:
+            return JsonResponse({'success': False, 'error': str(e)}, status=400)
+        
+        # Only the caller's own votes are per-user; everything else comes from the shared page
+        user_votes = get_user_votes(request.user, [p['id'] for p in page['proposals']])
+        urgent_before = timezone.now() + timezone.timedelta(hours=24)
+        
+        proposal_data = [
+            {
+                **proposal,
+                'has_voted': proposal['id'] in user_votes,
+                'user_vote': user_votes.get(proposal['id']),
+                'is_urgent': proposal['voting_end'] < urgent_before,
+            }
+            for proposal in page['proposals']
+        ]
         
         return JsonResponse({
             'success': True,
-            'proposals': proposal_data
+            'proposals': proposal_data,
+            'next_cursor': page['next_cursor'],
+            'has_more': page['next_cursor'] is not None,
         })
         
     except Exception as e:
@@ -834,13 +793,6 @@ def get_user_activity(request):
         vote_data = []
         
         for vote in votes:
-            # Calculate proposal result
-            proposal_votes = Vote.objects.filter(proposal=vote.proposal)
-            total_votes = sum(v.voting_power for v in proposal_votes)
-            yes_votes = sum(v.voting_power for v in proposal_votes if v.vote == 'yes')
-            yes_percentage = (yes_votes / total_votes * 100) if total_votes > 0 else 0
-            passed = yes_percentage >= vote.proposal.min_approval_percentage
-            
             vote_data.append({
                 'id': vote.id,
                 'proposal_id': vote.proposal.id,
@@ -849,7 +801,9 @@ def get_user_activity(request):
                 'vote': vote.vote,
                 'voting_power': vote.voting_power,
                 'voted_at': vote.voted_at,
-                'proposal_passed': passed
+                'anchor_status': vote.status,
+                'hedera_transaction_id': vote.hedera_transaction_id,
+                'proposal_passed': vote.proposal.yes_percentage >= vote.proposal.min_approval_percentage
             })
         
         return JsonResponse({
@@ -895,14 +849,14 @@ def get_available_nfts(request):
         }
         
         available_nfts = []
+        inventory = get_tier_inventory()
+        owned_tiers = set(
+            GovernanceNFT.objects.filter(user=request.user, is_active=True).values_list('tier', flat=True)
+        )
         
         for tier, config in nft_config.items():
-            # Count existing NFTs of this tier
-            existing_count = GovernanceNFT.objects.filter(tier=tier, is_active=True).count()
-            available = config['max_supply'] - existing_count
-            
-            # Check if user already owns this tier
-            user_owns = GovernanceNFT.objects.filter(user=request.user, tier=tier, is_active=True).exists()
+            available = inventory.get(tier, {}).get('remaining', 0)
+            user_owns = tier in owned_tiers
             
             available_nfts.append({
                 'tier': tier,
@@ -0,0 +1,84 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.db import transaction, close_old_connections
+from django.utils import timezone
+from hiero.governance import submit_message
+from .models import Vote
+
+logger = logging.getLogger(__name__)
+
+# Background anchoring settings
+ANCHORING_WORKERS = 4
+MAX_ANCHOR_ATTEMPTS = 5
+RETRY_BACKOFF_SECONDS = 2  # Doubled after every failed attempt
+
+_executor = ThreadPoolExecutor(max_workers=ANCHORING_WORKERS, thread_name_prefix='vote-anchoring')
+
+def schedule_vote_anchoring(vote_id):
+    """Anchor the vote on HCS in a background worker once the vote transaction commits"""
+    transaction.on_commit(lambda: _executor.submit(_run_anchoring, vote_id))
+
+def _run_anchoring(vote_id):
+    try:
+        anchor_vote(vote_id)
+    except Exception as e:
+        logger.error(f"Vote anchoring crashed for vote {vote_id}: {e}")
+    finally:
+        close_old_connections()
+
+def vote_message(vote):
+    """The HCS message for a vote (same format votes were always anchored with)"""
+    return f"VOTE:{vote.proposal_id}:{vote.voter.username}:{vote.vote}:{vote.voting_power}"
+
+def anchor_vote(vote_id, max_attempts=MAX_ANCHOR_ATTEMPTS, backoff=RETRY_BACKOFF_SECONDS):
+    """Submit a pending vote to its proposal's topic, retrying with backoff.
+
+    Returns the vote, or None if another worker already claimed it. Status
+    changes use update() so they don't fire the vote signals that invalidate
+    the proposal feed and stats; anchoring changes neither.
+    """
+    # Claim the vote atomically so it is never submitted twice
+    claimed = Vote.objects.filter(
+        id=vote_id, status__in=['pending_anchor', 'anchor_failed']
+    ).update(status='anchoring')
+    if not claimed:
+        return None
+
+    vote = Vote.objects.select_related('voter', 'proposal__topic').get(id=vote_id)
+    message = vote_message(vote)
+
+    for attempt in range(1, max_attempts + 1):
+        vote.anchor_attempts += 1
+        try:
+            result = submit_message(message, vote.proposal.topic.topic_id)
+        except Exception as e:
+            result = {'status': 'failed', 'message': str(e)}
+
+        if result['status'] == 'success':
+            vote.status = 'anchored'
+            vote.hedera_transaction_id = str(result.get('transaction_id') or result['topic'])
+            vote.hcs_sequence_number = result.get('sequence_number')
+            vote.anchor_error = ''
+            vote.anchored_at = timezone.now()
+            Vote.objects.filter(id=vote.id).update(
+                status=vote.status,
+                hedera_transaction_id=vote.hedera_transaction_id,
+                hcs_sequence_number=vote.hcs_sequence_number,
+                anchor_attempts=vote.anchor_attempts,
+                anchor_error='',
+                anchored_at=vote.anchored_at,
+            )
+            logger.info(f"Vote {vote.id} anchored on topic {vote.proposal.topic.topic_id}")
+            return vote
+
+        vote.anchor_error = result.get('message', 'Unknown error')
+        logger.warning(f"Vote anchoring attempt {attempt} failed for vote {vote.id}: {vote.anchor_error}")
+        Vote.objects.filter(id=vote.id).update(anchor_attempts=vote.anchor_attempts, anchor_error=vote.anchor_error)
+        if attempt < max_attempts:
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+    vote.status = 'anchor_failed'
+    Vote.objects.filter(id=vote.id).update(status=vote.status)
+    logger.error(f"Vote anchoring gave up for vote {vote.id} after {max_attempts} attempts")
+    return vote
@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models import Count, Sum
+from .models import GovernanceNFT, UserVotingPower
+
+def get_voting_power(user):
+    """(voting_power, nft_count) for a user: a single primary-key read"""
+    row = UserVotingPower.objects.filter(pk=user.pk).values_list('voting_power', 'nft_count').first()
+    return row or (0, 0)
+
+def _active_power_by_user(user_ids=None):
+    nfts = GovernanceNFT.objects.filter(is_active=True)
+    if user_ids is not None:
+        nfts = nfts.filter(user_id__in=user_ids)
+    return {
+        row['user_id']: (row['power'] or 0, row['nfts'])
+        for row in nfts.values('user_id').annotate(power=Sum('voting_power'), nfts=Count('id'))
+    }
+
+def _upsert(power_by_user):
+    UserVotingPower.objects.bulk_create(
+        [
+            UserVotingPower(user_id=user_id, voting_power=power, nft_count=nfts)
+            for user_id, (power, nfts) in power_by_user.items()
+        ],
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['voting_power', 'nft_count', 'updated_at'],
+        batch_size=500,
+    )
+
+def refresh_voting_power(user_ids):
+    """Recompute the stored power for a few users from their active NFTs"""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    power_by_user = _active_power_by_user(user_ids)
+    _upsert(power_by_user)
+    # Zero out without inserting, so a user being deleted never gains a new row
+    UserVotingPower.objects.filter(user_id__in=user_ids - set(power_by_user)).update(voting_power=0, nft_count=0)
+
+def rebuild_voting_power():
+    """Recompute every user's stored power from one grouped query. Returns the number of holders."""
+    power_by_user = _active_power_by_user()
+    with transaction.atomic():
+        UserVotingPower.objects.update(voting_power=0, nft_count=0)
+        _upsert(power_by_user)
+    return len(power_by_user)
@@ -0,0 +1,65 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+import httpx
+from core.profiling import profile_external_call
+
+# Async counterpart of mirror_node.py for async views.
+# Under ASGI the event loop lives as long as the process, so asgi.py calls
+# enable_pooling() and one client per loop keeps connections to the mirror
+# node alive across requests. Under WSGI each async view runs in a throwaway
+# loop; a client cached there would never be closed, so each call opens and
+# closes its own.
+TESTNET_MIRROR_URL = "https://testnet.mirrornode.hedera.com/api/v1"
+STAR_TOKEN_ID = '0.0.6918197'
+
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+REQUEST_TIMEOUT_SECONDS = 10
+
+_clients = weakref.WeakKeyDictionary()
+_pooling = False
+
+def enable_pooling():
+    """Reuse one client per event loop. Only for servers whose loop is long-lived (ASGI)."""
+    global _pooling
+    _pooling = True
+
+def _new_client():
+    return httpx.AsyncClient(
+        base_url=TESTNET_MIRROR_URL,
+        timeout=REQUEST_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+def get_client():
+    """Return the pooled client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _new_client()
+        _clients[loop] = client
+    return client
+
+@asynccontextmanager
+async def client_session():
+    """The loop's pooled client when pooling is on, otherwise one closed on exit"""
+    if _pooling:
+        yield get_client()
+        return
+    async with _new_client() as client:
+        yield client
+
+@profile_external_call('mirror_node')
+async def aget_balance(account_id, token_id=STAR_TOKEN_ID):
+    """Token balance for an account; raises httpx.HTTPError like get_balance raises on failure"""
+    async with client_session() as client:
+        response = await client.get(f"/accounts/{account_id}/tokens", params={'token.id': token_id})
+    response.raise_for_status()
+    for token in response.json().get('tokens', []):
+        if token['token_id'] == token_id:
+            return token['balance']
+    return 0
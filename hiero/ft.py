@@ -1,6 +1,7 @@
 import os
 import sys
 from dotenv import load_dotenv
+from core.profiling import profile_external_call
 from hiero_sdk_python import (
     Client,
     AccountId,
@@ -24,6 +25,7 @@ token_id = TokenId.from_string(os.getenv('Token_ID'))
 nbl_id = AccountId.from_string(os.getenv('NBL_ID'))
 nbl_key = PrivateKey.from_string_ed25519(os.getenv('NBL_KEY'))
 
+@profile_external_call('hedera')
 def fund_pool(recipient_id, amount, account_private_key):
     network = Network(network='testnet')
     client = Client(network)
@@ -58,6 +60,7 @@ def fund_pool(recipient_id, amount, account_private_key):
             "error":str(e),
         }
     
+@profile_external_call('hedera')
 def transfer_tokens(recipient_id, amount):
     network = Network(network='testnet')
     client = Client(network)
@@ -88,6 +91,52 @@ def transfer_tokens(recipient_id, amount):
         }
 
 
+@profile_external_call('hedera')
+def transfer_between(sender_id, sender_private_key, recipient_id, amount, memo=''):
+    """Move ASTRA from one user account to another, signed by the sender.
+    A ``memo`` lets the transfer be found again on the mirror node."""
+    network = Network(network='testnet')
+    client = Client(network)
+
+    client.set_operator(operator_id, operator_key)
+    match = re.search(r"hex=([0-9a-fA-F]+)", sender_private_key)
+    if not match:
+        return {
+            "status":"failed",
+            "error":"No private key found",
+        }
+
+    try:
+        transaction = (
+            TransferTransaction()
+            .add_token_transfer(token_id, AccountId.from_string(sender_id), -amount)
+            .add_token_transfer(token_id, AccountId.from_string(recipient_id), amount)
+            .set_transaction_memo(memo)
+            .freeze_with(client)
+            .sign(PrivateKey.from_string(match.group(1)))
+        )
+        receipt = transaction.execute(client)
+    except Exception as e:
+        print(f"Token transfer failed: {str(e)}")
+        return {
+            "status":"failed",
+            "error":str(e),
+        }
+
+    # The SDK hands back failed receipts (e.g. INSUFFICIENT_TOKEN_BALANCE) instead of raising
+    if receipt.status != ResponseCode.SUCCESS:
+        print(f"Token transfer failed with status: {ResponseCode(receipt.status).name}")
+        return {
+            "status":"failed",
+            "error":ResponseCode(receipt.status).name,
+        }
+    return {
+        "status":"success",
+        "receipt":receipt,
+    }
+
+
+@profile_external_call('hedera')
 def associate_token(recipient_id_new, recipient_key_new):
     network = Network(network='testnet')
     client = Client(network)
@@ -104,11 +153,20 @@ def associate_token(recipient_id_new, recipient_key_new):
     try:
         receipt = transaction.execute(client)
         print("Token association successful.")
+        return {
+            "status":"success",
+            "receipt":receipt,
+        }
     except Exception as e:
         print(f"Token association failed: {str(e)}")
+        return {
+            "status":"failed",
+            "error":str(e),
+        }
 
 
 
+@profile_external_call('hedera')
 def create_token_fungible_finite():
     """Function to create a finite fungible token."""
     # Network Setup
@@ -1,6 +1,7 @@
 import os
 import sys
 from dotenv import load_dotenv
+from core.profiling import profile_external_call
 
 from hiero_sdk_python import (
     Client,
@@ -40,6 +41,7 @@ operator_key = PrivateKey.from_string_ed25519(os.getenv('OPERATOR_KEY'))
 
 
 
+@profile_external_call('hedera')
 def submit_message(message, topic):
     network = Network(network='testnet')
     client = Client(network)
@@ -59,7 +61,9 @@ def submit_message(message, topic):
         print(f"Message submitted to topic {topic_id}: {message}")
         return {
             'status':'success',
-            'topic':topic_id
+            'topic':topic_id,
+            'sequence_number':receipt._to_proto().topicSequenceNumber or None,
+            'transaction_id':receipt.transaction_id,
         }
     except Exception as e:
         print(f"Message submission failed: {str(e)}")
@@ -83,6 +87,7 @@ def setup_client():
     return client, operator_id, operator_key
 
 
+@profile_external_call('hedera')
 def mint_nft(nft_token_id, metadata):
     """Mint a non-fungible token"""
     client, operator_id, operator_key = setup_client()
@@ -114,6 +119,7 @@ def mint_nft(nft_token_id, metadata):
         'serial':receipt.serial_numbers[0],
     }
 
+@profile_external_call('hedera')
 def associate_nft(account_id, token_id, account_private_key, nft_id):
     """Associate a non-fungible token with an account"""
     # Associate the token_id with the new account
@@ -165,3 +171,45 @@ def associate_nft(account_id, token_id, account_private_key, nft_id):
         'status':'success',
         'message':f"Successfully transferred NFT to account {account_id}"
     }
+
+@profile_external_call('hedera')
+def transfer_nft(token_id, serial_number, sender_id, sender_private_key, recipient_id):
+    """Transfer an NFT between two accounts, signed by the sender"""
+    import re
+
+    match = re.search(r"hex=([0-9a-fA-F]+)", sender_private_key)
+    if not match:
+        return {
+            'status':'failed',
+            'message':'No private key found'
+        }
+
+    try:
+        client, operator_id, operator_key = setup_client()
+        nft_id = NftId(TokenId.from_string(token_id), serial_number)
+        transaction = (
+            TransferTransaction()
+            .add_nft_transfer(nft_id, AccountId.from_string(sender_id), AccountId.from_string(recipient_id))
+            .freeze_with(client)
+            .sign(PrivateKey.from_string(match.group(1)))
+        )
+        receipt = transaction.execute(client)
+    except Exception as e:
+        print(f"NFT transfer failed: {str(e)}")
+        return {
+            'status':'failed',
+            'message':f"NFT transfer failed: {str(e)}"
+        }
+
+    if receipt.status != ResponseCode.SUCCESS:
+        print(f"NFT transfer failed with status: {ResponseCode(receipt.status).name}")
+        return {
+            'status':'failed',
+            'message':f'NFT transfer failed with status: {ResponseCode(receipt.status).name}'
+        }
+
+    print(f"Successfully transferred NFT {nft_id} to account {recipient_id}")
+    return {
+        'status':'success',
+        'message':f"Successfully transferred NFT to account {recipient_id}"
+    }
@@ -11,6 +11,7 @@ from hiero_sdk_python import (
 import os
 from datetime import datetime
 from dotenv import load_dotenv
+from core.profiling import profile_external_call
 
 load_dotenv()
 
@@ -18,6 +19,7 @@ operator_id = AccountId.from_string(os.getenv('OPERATOR_ID'))
 operator_key = PrivateKey.from_string_ed25519(os.getenv('OPERATOR_KEY'))
 
 # Ventures
+@profile_external_call('hedera')
 def create_topic():
     network = Network(network='testnet')
     client = Client(network)
@@ -43,6 +45,7 @@ def create_topic():
     except Exception as e:
         print(f"Topic creation failed: {str(e)}")
 
+@profile_external_call('hedera')
 def submit_message(message):
     network = Network(network='testnet')
     client = Client(network)
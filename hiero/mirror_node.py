@@ -1,6 +1,8 @@
+import base64
 import requests
 import os
 from dotenv import load_dotenv
+from core.profiling import profile_external_call
 load_dotenv()
 
 # Configuration
@@ -8,6 +10,7 @@ TESTNET_MIRROR_URL = "https://testnet.mirrornode.hedera.com/api/v1"
 YOUR_ACCOUNT_ID = os.getenv('OPERATOR_ID')
 YOUR_TOKEN_ID = token_id = os.getenv('Token_ID')
 
+@profile_external_call('mirror_node')
 def get_token_balance_for_account(account_id, token_id):
     """Get balance of a specific token for a given account"""
     url = f"{TESTNET_MIRROR_URL}/accounts/{account_id}/tokens"
@@ -26,6 +29,7 @@ def get_token_balance_for_account(account_id, token_id):
         print(f"Error fetching balance: {e}")
         return None
 
+@profile_external_call('mirror_node')
 def get_token_info(token_id):
     """Get token metadata including total supply"""
     url = f"{TESTNET_MIRROR_URL}/tokens/{token_id}"
@@ -43,6 +47,7 @@ def get_token_info(token_id):
     except requests.exceptions.RequestException as e:
         print(f"Error fetching token info: {e}")
         return None
+@profile_external_call('mirror_node')
 def get_token_transactions(token_id, account_id=None, limit=100):
     """Get all transactions involving a specific token"""
     url = f"{TESTNET_MIRROR_URL}/transactions/{account_id}"
@@ -73,6 +78,7 @@ def get_token_transactions(token_id, account_id=None, limit=100):
         print(f"Error fetching transactions: {e}")
         return None
     
+@profile_external_call('mirror_node')
 def get_all_token_holders(token_id, limit=100):
     """Get all accounts holding the specified token"""
     url = f"{TESTNET_MIRROR_URL}/tokens/{token_id}/balances"
@@ -91,6 +97,110 @@ def get_all_token_holders(token_id, limit=100):
         print(f"Error fetching holders: {e}")
         return None
 
+@profile_external_call('mirror_node')
+def get_nft_owners(token_id, limit=100):
+    """Map each live serial number of an NFT token to its current owner account"""
+    url = f"{TESTNET_MIRROR_URL}/tokens/{token_id}/nfts"
+    params = {'limit': limit}
+    owners = {}
+    
+    try:
+        while url:
+            response = requests.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            for nft in data.get('nfts', []):
+                if not nft.get('deleted'):
+                    owners[int(nft['serial_number'])] = nft['account_id']
+            # links.next is a path on the mirror node host that already carries the query
+            next_link = (data.get('links') or {}).get('next')
+            url = f"{TESTNET_MIRROR_URL.rsplit('/api/v1', 1)[0]}{next_link}" if next_link else None
+            params = None
+        return owners
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching NFT owners: {e}")
+        return None
+
+@profile_external_call('mirror_node')
+def find_nfts_by_metadata(token_id, metadata, limit=100):
+    """Serial numbers of live NFTs of a token minted with ``metadata``.
+    Returns None if the mirror node could not be read."""
+    url = f"{TESTNET_MIRROR_URL}/tokens/{token_id}/nfts"
+    params = {'limit': limit}
+    metadata_base64 = base64.b64encode(metadata.encode('utf-8')).decode()
+    serials = []
+
+    try:
+        while url:
+            response = requests.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            serials.extend(
+                int(nft['serial_number']) for nft in data.get('nfts', [])
+                if not nft.get('deleted') and nft.get('metadata') == metadata_base64
+            )
+            next_link = (data.get('links') or {}).get('next')
+            url = f"{TESTNET_MIRROR_URL.rsplit('/api/v1', 1)[0]}{next_link}" if next_link else None
+            params = None
+        return serials
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching NFTs: {e}")
+        return None
+
+@profile_external_call('mirror_node')
+def find_transfers_by_memo(account_id, memo, since=None, limit=100):
+    """IDs of successful transfers involving an account that carry ``memo``, newest first.
+    Returns None if the mirror node could not be read."""
+    url = f"{TESTNET_MIRROR_URL}/transactions"
+    params = {'account.id': account_id, 'transactiontype': 'CRYPTOTRANSFER', 'result': 'success',
+              'order': 'desc', 'limit': limit}
+    if since is not None:
+        params['timestamp'] = f"gte:{since.timestamp():.9f}"
+    memo_base64 = base64.b64encode(memo.encode('utf-8')).decode()
+    matches = []
+
+    try:
+        while url:
+            response = requests.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            matches.extend(
+                tx['transaction_id'] for tx in data.get('transactions', [])
+                if tx.get('memo_base64') == memo_base64
+            )
+            next_link = (data.get('links') or {}).get('next')
+            url = f"{TESTNET_MIRROR_URL.rsplit('/api/v1', 1)[0]}{next_link}" if next_link else None
+            params = None
+        return matches
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching transactions: {e}")
+        return None
+
+def iter_topic_messages(topic_id, after_sequence=0, limit=100, session=None):
+    """Yield a topic's messages in sequence order, one mirror node page at a time.
+
+    Each item is {'sequence_number', 'consensus_timestamp', 'message'} with the
+    message decoded to text. Request errors are raised so a caller can stop
+    and resume from the last sequence number it processed.
+    """
+    session = session or requests.Session()
+    url = f"{TESTNET_MIRROR_URL}/topics/{topic_id}/messages"
+    params = {'limit': limit, 'order': 'asc', 'sequencenumber': f'gt:{after_sequence}'}
+    
+    while url:
+        response = session.get(url, params=params)
+        response.raise_for_status()
+        data = response.json()
+        for message in data.get('messages', []):
+            yield {
+                'sequence_number': int(message['sequence_number']),
+                'consensus_timestamp': message['consensus_timestamp'],
+                'message': base64.b64decode(message['message']).decode('utf-8', errors='replace'),
+            }
+        next_link = (data.get('links') or {}).get('next')
+        url = f"{TESTNET_MIRROR_URL.rsplit('/api/v1', 1)[0]}{next_link}" if next_link else None
+        params = None
+
 def display_balance_report():
     """Display comprehensive token balance report"""
     print("\n" + "="*50)
@@ -125,6 +235,7 @@ def display_balance_report():
         for holder in sorted(holders, key=lambda x: -x['balance'])[:5]:  # Show top 5
             print(f"   {holder['account']}: {holder['balance']:>12,} tokens")
 
+@profile_external_call('mirror_node')
 def get_balance(id):
     #id = '0.0.6918174'
     url = f"https://testnet.mirrornode.hedera.com/api/v1/accounts/{id}/tokens"
@@ -138,6 +249,7 @@ def get_balance(id):
             return balance
     return balance
 
+@profile_external_call('mirror_node')
 def transactions():
     url = f"https://testnet.mirrornode.hedera.com/api/v1/transactions"
     bal = requests.get(url=url)
@@ -1,6 +1,7 @@
 import os
 import sys
 from dotenv import load_dotenv
+from core.profiling import profile_external_call
 
 from hiero_sdk_python import (
     Client,
@@ -17,6 +18,7 @@ from hiero_sdk_python.response_code import ResponseCode
 from hiero_sdk_python.tokens.nft_id import NftId
 from hiero_sdk_python.tokens.supply_type import SupplyType
 from hiero_sdk_python.tokens.token_associate_transaction import TokenAssociateTransaction
+from hiero_sdk_python.tokens.token_burn_transaction import TokenBurnTransaction
 from hiero_sdk_python.tokens.token_create_transaction import TokenCreateTransaction
 from hiero_sdk_python.tokens.token_mint_transaction import TokenMintTransaction
 import json
@@ -36,6 +38,7 @@ def setup_client():
     
     return client, operator_id, operator_key
 
+@profile_external_call('hedera')
 def create_test_account(client):
     """Create a new account for testing"""
     # Generate private key for new account
@@ -67,6 +70,7 @@ def create_test_account(client):
 # Stellar Assembly SLA
 # Celestial Board CLB
 # Cosmic Community 
+@profile_external_call('hedera')
 def create_nft(title, symbol, max_tickets):
     """Create a non-fungible token EG"""
 
@@ -105,6 +109,7 @@ def create_nft(title, symbol, max_tickets):
         'status':'success',
     }
 
+@profile_external_call('hedera')
 def mint_nft(nft_token_id, metadata):
     """Mint a non-fungible token"""
     client, operator_id, operator_key = setup_client()
@@ -137,53 +142,152 @@ def mint_nft(nft_token_id, metadata):
     }
 
 def associate_nft(account_id, token_id, account_private_key, nft_id):
-    """Associate a non-fungible token with an account"""
-    # Associate the token_id with the new account
-    client, operator_id, operator_key = setup_client()
-    print(type(account_private_key))
+    """Associate a non-fungible token with an account and send it the NFT from the treasury"""
+    result = associate_token_with_account(account_id, token_id, account_private_key)
+    if result['status'] != 'success':
+        return result
+    return deliver_nft(nft_id, account_id)
+
+@profile_external_call('hedera')
+def associate_token_with_account(account_id, token_id, account_private_key):
+    """Associate a token with an account, signed by the account. Safe to repeat:
+    an account that is already associated counts as success."""
     import re
-    
+
     match = re.search(r"hex=([0-9a-fA-F]+)", account_private_key)
-    if match:
-        private_key_only = match.group(1)
-        print(private_key_only)
-    else:
-        private_key_only = None
-        print("No private key found")
-
-    associate_transaction = (
-        TokenAssociateTransaction()
-        .set_account_id(AccountId.from_string(account_id))
-        .add_token_id(TokenId.from_string(token_id))
-        .freeze_with(client)
-        .sign(PrivateKey.from_string(private_key_only)) # Has to be signed by new account's key
-    )
-    receipt = associate_transaction.execute(client)
-    
-    if receipt.status != ResponseCode.SUCCESS:
+    if not match:
+        return {
+            'status':'failed',
+            'message':'No private key found'
+        }
+
+    try:
+        client, operator_id, operator_key = setup_client()
+        transaction = (
+            TokenAssociateTransaction()
+            .set_account_id(AccountId.from_string(account_id))
+            .add_token_id(TokenId.from_string(token_id))
+            .freeze_with(client)
+            .sign(PrivateKey.from_string(match.group(1))) # Has to be signed by the account's key
+        )
+        receipt = transaction.execute(client)
+    except Exception as e:
+        print(f"NFT association failed: {str(e)}")
+        return {
+            'status':'failed',
+            'message':f"NFT association failed: {str(e)}"
+        }
+
+    if receipt.status not in (ResponseCode.SUCCESS, ResponseCode.TOKEN_ALREADY_ASSOCIATED_TO_ACCOUNT):
         print(f"NFT association failed with status: {ResponseCode(receipt.status).name}")
-        return None
-    print("NFT successfully associated with account")
-    # Transfer nft to the new account
-    print(type(nft_id))
-    transfer_transaction = (
-        TransferTransaction()
-        .add_nft_transfer(nft_id, operator_id, AccountId.from_string(account_id))
-        .freeze_with(client)
-    )
-    
-    receipt = transfer_transaction.execute(client)
-    
-    # Check if nft transfer was successful
+        return {
+            'status':'failed',
+            'message':f'NFT association failed with status: {ResponseCode(receipt.status).name}'
+        }
+
+    return {
+        'status':'success',
+        'message':f"Token {token_id} associated with account {account_id}"
+    }
+
+@profile_external_call('hedera')
+def deliver_nft(nft_id, account_id):
+    """Transfer an NFT from the treasury (operator) account to an associated account"""
+    try:
+        client, operator_id, operator_key = setup_client()
+        transaction = (
+            TransferTransaction()
+            .add_nft_transfer(nft_id, operator_id, AccountId.from_string(account_id))
+            .freeze_with(client)
+        )
+        receipt = transaction.execute(client)
+    except Exception as e:
+        print(f"NFT transfer failed: {str(e)}")
+        return {
+            'status':'failed',
+            'message':f"NFT transfer failed: {str(e)}"
+        }
+
     if receipt.status != ResponseCode.SUCCESS:
         print(f"NFT transfer failed with status: {ResponseCode(receipt.status).name}")
         return {
             'status':'failed',
-            'message':f'NFT transfer failed with status: {ResponseCode(receipt.status).name}"'
+            'message':f'NFT transfer failed with status: {ResponseCode(receipt.status).name}'
         }
-    
+
     print(f"Successfully transferred NFT to account {account_id}")
     return {
         'status':'success',
         'message':f"Successfully transferred NFT to account {account_id}"
-    }
\ No newline at end of file
+    }
+
+@profile_external_call('hedera')
+def return_nft(nft_token_id, serial_number, holder_id, holder_private_key):
+    """Send an NFT back to the treasury (operator) account, signed by its holder"""
+    import re
+
+    match = re.search(r"hex=([0-9a-fA-F]+)", holder_private_key)
+    if not match:
+        return {
+            'status':'failed',
+            'message':'No private key found'
+        }
+
+    try:
+        client, operator_id, operator_key = setup_client()
+        transaction = (
+            TransferTransaction()
+            .add_nft_transfer(NftId(TokenId.from_string(nft_token_id), serial_number), AccountId.from_string(holder_id), operator_id)
+            .freeze_with(client)
+            .sign(PrivateKey.from_string(match.group(1)))
+        )
+        receipt = transaction.execute(client)
+    except Exception as e:
+        print(f"NFT return failed: {str(e)}")
+        return {
+            'status':'failed',
+            'message':f"NFT return failed: {str(e)}"
+        }
+
+    if receipt.status != ResponseCode.SUCCESS:
+        print(f"NFT return failed with status: {ResponseCode(receipt.status).name}")
+        return {
+            'status':'failed',
+            'message':f'NFT return failed with status: {ResponseCode(receipt.status).name}'
+        }
+
+    return {
+        'status':'success',
+        'message':f"NFT returned to treasury from {holder_id}"
+    }
+
+@profile_external_call('hedera')
+def burn_nft(nft_token_id, serial_number):
+    """Burn a serial held by the treasury, giving its place back to a FINITE token's max supply"""
+    try:
+        client, operator_id, operator_key = setup_client()
+        transaction = (
+            TokenBurnTransaction()
+            .set_token_id(TokenId.from_string(nft_token_id))
+            .set_serials([int(serial_number)])
+            .freeze_with(client)
+        )
+        receipt = transaction.execute(client)
+    except Exception as e:
+        print(f"NFT burn failed: {str(e)}")
+        return {
+            'status':'failed',
+            'message':f"NFT burn failed: {str(e)}"
+        }
+
+    if receipt.status != ResponseCode.SUCCESS:
+        print(f"NFT burn failed with status: {ResponseCode(receipt.status).name}")
+        return {
+            'status':'failed',
+            'message':f'NFT burn failed with status: {ResponseCode(receipt.status).name}'
+        }
+
+    return {
+        'status':'success',
+        'message':f"Burned serial {serial_number} of {nft_token_id}"
+    }
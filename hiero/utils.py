@@ -14,12 +14,14 @@ from hiero_sdk_python import (
 
 import os, sys
 from dotenv import load_dotenv
+from core.profiling import profile_external_call
 
 load_dotenv()
 
 operator_id = AccountId.from_string(os.getenv('OPERATOR_ID'))
 operator_key = PrivateKey.from_string_ed25519(os.getenv('OPERATOR_KEY'))
 
+@profile_external_call('hedera')
 def create_new_account(name):
     network = Network(network='testnet')
     client = Client(network)
@@ -0,0 +1,147 @@
+import base64
+import hashlib
+import json
+import uuid
+from datetime import datetime
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from core.fragment_cache import get_fragment_version, get_fragment_versions, VENTURE_CARD, VENTURE_TICKETS
+from .funding import funding_totals, uses_shards
+from .models import Venture, VentureTicket
+from .search import LISTED_STATUSES
+
+# Read API for polling clients. Every response carries a weak ETag built from
+# the per-venture fragment versions that ventures.signals (and the queryset
+# updates that bypass it) already bump, so a client re-sending If-None-Match
+# gets a 304 after little more than a cache lookup.
+API_PAGE_SIZE = 20
+MAX_API_PAGE_SIZE = 100
+SLUG_CACHE_TIMEOUT = 3600
+
+def venture_id_for_slug(slug):
+    """Resolve a slug without a query when it was seen recently. Returns None if unknown."""
+    cache_key = f"venture_slug:{slug}"
+    venture_id = cache.get(cache_key)
+    if venture_id is None:
+        venture_id = Venture.objects.filter(slug=slug).values_list('id', flat=True).first()
+        if venture_id is not None:
+            cache.set(cache_key, venture_id, SLUG_CACHE_TIMEOUT)
+    return venture_id
+
+def weak_etag(*parts):
+    digest = hashlib.sha1(':'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+def conditional_json(request, etag, build):
+    """304 when the client already holds ``etag``; otherwise ``build()`` as compact JSON"""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse(build(), json_dumps_params={'separators': (',', ':')})
+    # A 304 repeats the validator so clients can keep revalidating with it
+    response['ETag'] = etag
+    # Clients may keep the body but must revalidate it on every use
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+def parse_limit(value):
+    """Page size from a query parameter, raising ValueError outside 1..MAX_API_PAGE_SIZE"""
+    value = value or str(API_PAGE_SIZE)
+    if not value.isdigit() or not 1 <= int(value) <= MAX_API_PAGE_SIZE:
+        raise ValueError(f'limit must be between 1 and {MAX_API_PAGE_SIZE}')
+    return int(value)
+
+def encode_cursor(*position):
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+def serialize_venture(venture):
+    tickets_sold, funding_raised = venture.tickets_sold, venture.funding_raised
+    if uses_shards(venture):
+        # Include sales not yet rolled up from the counter shards
+        tickets_sold, funding_raised = funding_totals(venture.id)
+    return {
+        'id': str(venture.id),
+        'slug': venture.slug,
+        'name': venture.name,
+        'status': venture.status,
+        'funding_goal': str(venture.funding_goal),
+        'funding_raised': str(funding_raised),
+        'ticket_price': str(venture.ticket_price),
+        'max_tickets': venture.max_tickets,
+        'tickets_sold': tickets_sold,
+        'funding_start': venture.funding_start.isoformat() if venture.funding_start else None,
+        'funding_end': venture.funding_end.isoformat() if venture.funding_end else None,
+    }
+
+def venture_list_page(request, status=None, cursor=None, limit=API_PAGE_SIZE):
+    """Newest ventures first, keyed on (created_at, id). The ETag covers the ids on the
+    page and each one's card version, so only the id query runs when nothing changed."""
+    ventures = Venture.objects.filter(status__in=[status] if status else LISTED_STATUSES)
+    if cursor:
+        try:
+            created_at, venture_id = decode_cursor(cursor)
+            created_at, venture_id = datetime.fromisoformat(created_at), uuid.UUID(venture_id)
+        except (TypeError, ValueError) as e:
+            raise ValueError('Invalid cursor') from e
+        ventures = ventures.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=venture_id))
+    ventures = ventures.order_by('-created_at', '-id')
+
+    rows = list(ventures.values_list('id', 'created_at')[:limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    venture_ids = [venture_id for venture_id, _ in rows]
+    versions = get_fragment_versions(VENTURE_CARD, venture_ids)
+    etag = weak_etag('ventures', *(f"{venture_id}.{versions[venture_id]}" for venture_id in venture_ids), has_more)
+
+    def build():
+        by_id = Venture.objects.in_bulk(venture_ids)
+        last = rows[-1] if rows else None
+        return {
+            'ventures': [serialize_venture(by_id[venture_id]) for venture_id in venture_ids if venture_id in by_id],
+            'next_cursor': encode_cursor(last[1].isoformat(), str(last[0])) if has_more else None,
+        }
+    return conditional_json(request, etag, build)
+
+def venture_detail_response(request, venture_id):
+    etag = weak_etag('venture', venture_id, get_fragment_version(VENTURE_CARD, venture_id))
+    return conditional_json(request, etag, lambda: serialize_venture(get_object_or_404(Venture, id=venture_id)))
+
+def ticket_page_response(request, venture_id, cursor=None, limit=API_PAGE_SIZE):
+    """A venture's purchased tickets in ticket number order"""
+    after = 0
+    if cursor:
+        position = decode_cursor(cursor)
+        if not isinstance(position, list) or len(position) != 1 or not isinstance(position[0], int):
+            raise ValueError('Invalid cursor')
+        after = position[0]
+    etag = weak_etag('tickets', venture_id, get_fragment_version(VENTURE_TICKETS, venture_id))
+
+    def build():
+        rows = list(
+            VentureTicket.objects.filter(venture_id=venture_id, status='purchased', ticket_number__gt=after)
+            .order_by('ticket_number')
+            .values_list('ticket_number', 'buyer__username', 'purchased_at', 'nft_token_id')[:limit + 1]
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'tickets': [
+                {
+                    'number': number,
+                    'owner': username,
+                    'purchased_at': purchased_at.isoformat() if purchased_at else None,
+                    'nft_id': nft_token_id or None,
+                }
+                for number, username, purchased_at, nft_token_id in rows
+            ],
+            'next_cursor': encode_cursor(rows[-1][0]) if has_more else None,
+        }
+    return conditional_json(request, etag, build)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VenturesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ventures'
+
+    def ready(self):
+        import ventures.signals
@@ -0,0 +1,153 @@
+import csv
+import numpy as np
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Max
+from gaming.models import PlayerSession
+from .models import Venture, VentureOwnership, CapTableSnapshot
+
+# The winning CEO receives CEO_EQUITY_PERCENTAGE of the venture and the ticket
+# holders share PARTICIPANT_EQUITY_PERCENTAGE in proportion to what each one
+# invested. Equity is worked out in whole units of 1/UNITS_PER_PERCENT of a
+# percent, and the largest remainders are rounded up, so a snapshot always
+# adds up to exactly 100%. A share that has no owner yet (no game winner, no
+# tickets sold) is reported as unallocated.
+CEO_EQUITY_PERCENTAGE = 20
+PARTICIPANT_EQUITY_PERCENTAGE = 80
+UNITS_PER_PERCENT = 1_000_000
+
+CSV_COLUMNS = ['user_id', 'username', 'role', 'invested', 'equity_percentage']
+
+INT64_MAX = np.iinfo(np.int64).max
+
+def allocate_units(weights, units):
+    """Split ``units`` over ``weights`` pro rata in whole units, summing exactly to ``units``"""
+    weights = np.asarray(weights, dtype=np.int64)
+    if weights.size and weights.min() < 0:
+        raise ValueError("Weights must not be negative")
+    if weights.size and int(weights.max()) > INT64_MAX // max(units, weights.size, 1):
+        # weights * units (or their sum) would overflow int64 silently; Python ints are exact
+        weights = weights.astype(object)
+    total = int(weights.sum())
+    if total <= 0:
+        return np.zeros(weights.shape, dtype=np.int64)
+
+    exact = weights * units
+    shares = exact // total
+    leftover = units - int(shares.sum())
+    if leftover:
+        # Largest remainders first; stable so equal remainders keep holder order
+        order = np.argsort(-(exact % total), kind='stable')
+        shares[order[:leftover]] += 1
+    return shares.astype(np.int64)
+
+def compute_cap_table(owner_ids, invested_cents, ceo_id=None):
+    """Vectorised distribution for one venture.
+
+    Returns (user_ids, invested_cents, equity_units, unallocated_units) with
+    one entry per holder. A CEO who holds no ticket is appended with nothing
+    invested.
+    """
+    user_ids = np.asarray(owner_ids, dtype=np.int64)
+    invested = np.asarray(invested_cents, dtype=np.int64)
+    participant_units = PARTICIPANT_EQUITY_PERCENTAGE * UNITS_PER_PERCENT
+    ceo_units = CEO_EQUITY_PERCENTAGE * UNITS_PER_PERCENT
+
+    equity = allocate_units(invested, participant_units)
+    unallocated = 0 if invested.sum() > 0 else participant_units
+
+    if ceo_id is None:
+        unallocated += ceo_units
+    else:
+        position = np.flatnonzero(user_ids == ceo_id)
+        if position.size:
+            equity[position[0]] += ceo_units
+        else:
+            user_ids = np.append(user_ids, np.int64(ceo_id))
+            invested = np.append(invested, np.int64(0))
+            equity = np.append(equity, np.int64(ceo_units))
+    return user_ids, invested, equity, unallocated
+
+def find_ceo(venture):
+    """The venture's game winner: best correct score, then fastest, then earliest. Returns (user_id, username)."""
+    winner = (
+        PlayerSession.objects.filter(venture_game__venture=venture, is_completed=True, is_correct=True)
+        .order_by('-total_score', 'time_spent_seconds', 'completed_at')
+        .values_list('player_id', 'player__username')
+        .first()
+    )
+    return winner or (None, None)
+
+def build_snapshot(venture):
+    """Compute the venture's cap table and store it as the next snapshot version"""
+    rows = list(
+        VentureOwnership.objects.filter(venture=venture)
+        .order_by('id')
+        .values_list('owner_id', 'owner__username', 'investment_amount')
+    )
+    owner_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    invested_cents = np.fromiter((int(row[2] * 100) for row in rows), dtype=np.int64, count=len(rows))
+    usernames = [row[1] for row in rows]
+
+    ceo_id, ceo_username = find_ceo(venture)
+    user_ids, invested, equity, unallocated = compute_cap_table(owner_ids, invested_cents, ceo_id)
+    if len(user_ids) > len(usernames):
+        usernames.append(ceo_username)
+
+    with transaction.atomic():
+        # Lock the venture so concurrent rebuilds get distinct versions
+        Venture.objects.select_for_update().filter(id=venture.id).first()
+        last_version = venture.cap_tables.aggregate(v=Max('version'))['v'] or 0
+        return CapTableSnapshot.objects.create(
+            venture=venture,
+            version=last_version + 1,
+            ceo_id=ceo_id,
+            holder_count=len(user_ids),
+            total_invested=Decimal(int(invested.sum())) / 100,
+            unallocated_percentage=Decimal(unallocated) / UNITS_PER_PERCENT,
+            holders={
+                'user_ids': user_ids.tolist(),
+                'usernames': usernames,
+                'invested_cents': invested.tolist(),
+                'equity_units': equity.tolist(),
+            },
+        )
+
+def latest_snapshot(venture):
+    return venture.cap_tables.order_by('-version').first()
+
+def snapshot_rows(snapshot):
+    """Export rows for a snapshot, largest holding first"""
+    holders = snapshot.holders
+    equity = np.asarray(holders['equity_units'], dtype=np.int64)
+    for i in np.argsort(-equity, kind='stable').tolist():
+        user_id = holders['user_ids'][i]
+        invested_cents = holders['invested_cents'][i]
+        if user_id == snapshot.ceo_id:
+            role = 'ceo+investor' if invested_cents else 'ceo'
+        else:
+            role = 'investor'
+        yield {
+            'user_id': user_id,
+            'username': holders['usernames'][i],
+            'role': role,
+            'invested': invested_cents / 100,
+            'equity_percentage': holders['equity_units'][i] / UNITS_PER_PERCENT,
+        }
+
+def write_csv(snapshot, file):
+    writer = csv.DictWriter(file, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    writer.writerows(snapshot_rows(snapshot))
+
+def write_parquet(snapshot, path):
+    """Write the snapshot as a Parquet file. Needs pyarrow, which is not a core dependency."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)") from e
+
+    rows = list(snapshot_rows(snapshot))
+    table = pa.table({column: [row[column] for row in rows] for column in CSV_COLUMNS})
+    pq.write_table(table, path)
@@ -0,0 +1,131 @@
+import httpx
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Subquery
+from django.utils import timezone
+from core.fragment_cache import aget_fragment_version, VENTURE_CARD, USER_WALLET
+from core.models import UserWallet
+from hiero.async_mirror_node import aget_balance
+from .funding import pending_totals, uses_shards
+from .models import Venture, VentureTicket, TicketInventory, TicketNumberCounter
+from .ticket_numbers import peek_next_ticket_number
+
+# The invest modal asks whether a user can buy a ticket on every open. The
+# answer is built once from a single query (venture state, the user's ticket,
+# their wallet and the next ticket number) plus one mirror-node balance read,
+# then cached per (user, venture) under the venture's VENTURE_CARD version and
+# the user's USER_WALLET version: a sale, a reservation taking the last place,
+# a purchase or a token transfer moves one of them, and the short timeout
+# bounds drift from outside transfers. The funding window is stored rather
+# than judged, so it is re-checked on every read and a cached answer never
+# outlives the window.
+ELIGIBILITY_CACHE_TIMEOUT = 30
+
+async def _cache_key(user_id, venture_id):
+    venture_version = await aget_fragment_version(VENTURE_CARD, venture_id)
+    wallet_version = await aget_fragment_version(USER_WALLET, user_id)
+    return f"investment_eligibility:{user_id}:{venture_id}:{venture_version}:{wallet_version}"
+
+def load_snapshot(user_id, venture_id):
+    """Everything but the balance, from one query. Returns None if the venture doesn't exist."""
+    wallets = UserWallet.objects.filter(user_id=user_id)
+    row = (
+        Venture.objects.filter(id=venture_id)
+        .annotate(
+            owns_ticket=Exists(VentureTicket.objects.filter(venture_id=OuterRef('pk'), buyer_id=user_id, status='purchased')),
+            next_number=Subquery(TicketNumberCounter.objects.filter(venture_id=OuterRef('pk')).values('next_number')[:1]),
+            places_remaining=Subquery(TicketInventory.objects.filter(venture_id=OuterRef('pk')).values('remaining')[:1]),
+            wallet_account=Subquery(wallets.values('recipient_id')[:1]),
+            wallet_status=Subquery(wallets.values('status')[:1]),
+        )
+        .only('id', 'name', 'status', 'funding_start', 'funding_end', 'ticket_price', 'max_tickets', 'tickets_sold')
+        .first()
+    )
+    if row is None:
+        return None
+
+    tickets_sold = row.tickets_sold
+    if uses_shards(row):
+        # Sales not yet rolled up still use up places
+        tickets_sold += pending_totals(row.id)[0]
+    return {
+        'venture_name': row.name,
+        'status': row.status,
+        'funding_start': row.funding_start,
+        'funding_end': row.funding_end,
+        'ticket_price': row.ticket_price,
+        'max_tickets': row.max_tickets,
+        'tickets_sold': tickets_sold,
+        # Places not held by a sold or reserved ticket (ventures.inventory); None until the row exists
+        'places_remaining': row.places_remaining,
+        'equity_per_ticket': row.equity_per_ticket,
+        'owns_ticket': row.owns_ticket,
+        'next_ticket_number': row.next_number or peek_next_ticket_number(row.id),
+        # Same test as UserWallet.is_provisioned; None means no balance to read
+        'wallet_account': row.wallet_account if row.wallet_status == 'active' and row.wallet_account else None,
+    }
+
+def blocking_reason(snapshot, now):
+    """Why the venture can't sell this user a ticket right now (as Venture.can_user_buy_ticket), or None"""
+    funding_active = (
+        snapshot['status'] == 'funding'
+        and snapshot['funding_start'] is not None and snapshot['funding_end'] is not None
+        and snapshot['funding_start'] <= now <= snapshot['funding_end']
+    )
+    if not funding_active:
+        return "Funding is not active"
+    if snapshot['places_remaining'] is not None:
+        sold_out = snapshot['places_remaining'] <= 0
+    else:
+        sold_out = snapshot['tickets_sold'] >= snapshot['max_tickets']
+    if sold_out:
+        # Same answer reserve_ticket would give, including places held by pending purchases
+        return "No tickets available"
+    if snapshot['owns_ticket']:
+        return "You already own a ticket for this venture"
+    return None
+
+def evaluate(snapshot, now):
+    """The api_check_investment response body for a snapshot"""
+    reason = blocking_reason(snapshot, now)
+    if reason:
+        return {'can_invest': False, 'message': reason}
+
+    balance = snapshot['balance']
+    if balance is None:
+        return {'can_invest': False, 'message': "Could not check your STAR balance. Please try again."}
+    if balance < float(snapshot['ticket_price']):
+        return {
+            'can_invest': False,
+            'message': f"Insufficient STAR tokens. Need {snapshot['ticket_price']}, have {balance}",
+        }
+    return {
+        'can_invest': True,
+        'venture_name': snapshot['venture_name'],
+        'ticket_price': float(snapshot['ticket_price']),
+        'equity_percentage': float(snapshot['equity_per_ticket']),
+        'next_ticket_number': snapshot['next_ticket_number'],
+        'equity_remaining': 100 - (snapshot['tickets_sold'] * snapshot['equity_per_ticket']),
+    }
+
+async def aget_eligibility(user_id, venture_id):
+    """Whether ``user_id`` can invest in ``venture_id``, as the api_check_investment body.
+    Returns None if the venture doesn't exist."""
+    cache_key = await _cache_key(user_id, venture_id)
+    snapshot = await cache.aget(cache_key)
+    if snapshot is None:
+        snapshot = await sync_to_async(load_snapshot)(user_id, venture_id)
+        if snapshot is None:
+            return None
+
+        snapshot['balance'] = 0
+        # Skip the mirror node when the answer is "no" whatever the balance
+        if snapshot['wallet_account'] and not snapshot['owns_ticket'] and snapshot['status'] == 'funding':
+            try:
+                snapshot['balance'] = await aget_balance(snapshot['wallet_account'])
+            except httpx.HTTPError:
+                snapshot['balance'] = None
+        if snapshot['balance'] is not None:
+            # A failed balance read is retried on the next open instead of being cached
+            await cache.aset(cache_key, snapshot, ELIGIBILITY_CACHE_TIMEOUT)
+    return evaluate(snapshot, timezone.now())
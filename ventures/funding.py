@@ -0,0 +1,98 @@
+import random
+from decimal import Decimal
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from core.fragment_cache import bump_fragment_version, VENTURE_CARD
+from .inventory import is_sold_out
+from .models import Venture, FundingCounterShard
+
+# Venture.tickets_sold and funding_raised only change through queryset F()
+# updates, never by saving an in-memory copy. A hot venture's sales go to
+# one of FUNDING_COUNTER_SHARDS shard rows, so concurrent purchases don't
+# queue on the venture row. Shards are rolled into the venture when its last
+# place is taken (checked on the single ventures.inventory row, not by summing
+# shards), when its funding window ends, and periodically by
+# rollup_funding_counters. Reads add the pending shard totals without writing.
+
+def uses_shards(venture):
+    return settings.FUNDING_COUNTER_SHARDS > 1 and venture.max_tickets >= settings.FUNDING_SHARD_MIN_TICKETS
+
+def record_sale(venture, amount):
+    """Count one sold ticket for ``venture``. Call inside the purchase transaction."""
+    if uses_shards(venture):
+        shard = random.randrange(settings.FUNDING_COUNTER_SHARDS)
+        shards = FundingCounterShard.objects.filter(venture_id=venture.id, shard=shard)
+        if not shards.update(tickets=F('tickets') + 1, amount=F('amount') + amount):
+            FundingCounterShard.objects.bulk_create(
+                [FundingCounterShard(venture_id=venture.id, shard=shard)], ignore_conflicts=True
+            )
+            shards.update(tickets=F('tickets') + 1, amount=F('amount') + amount)
+
+        # Only sales completing after every place is reserved pay for a rollup,
+        # which marks the venture funded once the last of them lands
+        if is_sold_out(venture.id):
+            rollup_funding(venture.id)
+    else:
+        Venture.objects.filter(id=venture.id).update(
+            tickets_sold=F('tickets_sold') + 1,
+            funding_raised=F('funding_raised') + amount,
+        )
+        mark_funded(venture.id)
+
+    # Queryset updates skip the Venture signal that re-renders the card
+    transaction.on_commit(lambda: bump_fragment_version(VENTURE_CARD, venture.id))
+
+def mark_funded(venture_id):
+    """Move a sold-out venture from funding to funded. Only one caller can win the update."""
+    return Venture.objects.filter(
+        id=venture_id, status='funding', tickets_sold__gte=F('max_tickets')
+    ).update(status='funded')
+
+def pending_totals(venture_id):
+    """(tickets, amount) sitting in shards that haven't been rolled up yet"""
+    pending = FundingCounterShard.objects.filter(venture_id=venture_id).aggregate(
+        tickets=Sum('tickets'), amount=Sum('amount')
+    )
+    return pending['tickets'] or 0, pending['amount'] or Decimal('0')
+
+def funding_totals(venture_id):
+    """Exact (tickets_sold, funding_raised), including sales not yet rolled up"""
+    tickets_sold, funding_raised = Venture.objects.values_list('tickets_sold', 'funding_raised').get(id=venture_id)
+    pending_tickets, pending_amount = pending_totals(venture_id)
+    return tickets_sold + pending_tickets, funding_raised + pending_amount
+
+def rollup_funding(venture_id):
+    """Fold a venture's shards into its totals. Returns the number of tickets moved."""
+    with transaction.atomic():
+        shards = list(
+            FundingCounterShard.objects.select_for_update()
+            .filter(venture_id=venture_id)
+            .exclude(tickets=0, amount=0)
+        )
+        if not shards:
+            return 0
+
+        # Subtract what was read rather than zeroing, so a sale landing mid-rollup isn't lost
+        for shard in shards:
+            FundingCounterShard.objects.filter(id=shard.id).update(
+                tickets=F('tickets') - shard.tickets, amount=F('amount') - shard.amount
+            )
+        tickets = sum(shard.tickets for shard in shards)
+        amount = sum((shard.amount for shard in shards), Decimal('0'))
+        Venture.objects.filter(id=venture_id).update(
+            tickets_sold=F('tickets_sold') + tickets,
+            funding_raised=F('funding_raised') + amount,
+        )
+        mark_funded(venture_id)
+        transaction.on_commit(lambda: bump_fragment_version(VENTURE_CARD, venture_id))
+    return tickets
+
+def refresh_funding(venture):
+    """Add a hot venture's unrolled shard totals to ``venture`` before they are shown.
+    Read-only, so page views never take the rollup's locks."""
+    if uses_shards(venture):
+        pending_tickets, pending_amount = pending_totals(venture.id)
+        venture.tickets_sold += pending_tickets
+        venture.funding_raised += pending_amount
+    return venture
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models import F
+from core.fragment_cache import bump_fragment_version, VENTURE_CARD
+from .models import Venture, VentureTicket, TicketInventory
+
+# Places for sale per venture live in one TicketInventory row, claimed with a
+# conditional UPDATE (as governance.inventory does for NFT tiers). Reserving a
+# ticket never locks the Venture row, and the inventory row is only locked
+# from the claim until its transaction commits. Rows are created lazily for
+# ventures added after migration 0011 (including bulk loads that skip signals).
+# Selling out and freeing a place again bump the venture's VENTURE_CARD version,
+# so cached cards and invest checks (ventures.eligibility) follow the row.
+
+# Tickets in these states hold one of the venture's places
+LIVE_TICKET_STATUSES = ['pending', 'processing', 'purchased']
+
+def reserve_ticket_place(venture_id):
+    """Claim one of the venture's places. Returns False when it is sold out."""
+    for _ in range(2):
+        if TicketInventory.objects.filter(venture_id=venture_id, remaining__gt=0).update(remaining=F('remaining') - 1):
+            if is_sold_out(venture_id):
+                _invalidate_on_commit(venture_id)
+            return True
+        if TicketInventory.objects.filter(venture_id=venture_id).exists():
+            return False
+        sync_ticket_inventory(venture_id)
+    return False
+
+def release_ticket_place(venture_id):
+    """Return a place after its ticket failed or was cancelled"""
+    if TicketInventory.objects.filter(venture_id=venture_id, remaining__lt=F('total')).update(remaining=F('remaining') + 1):
+        _invalidate_on_commit(venture_id)
+
+def _invalidate_on_commit(venture_id):
+    transaction.on_commit(lambda: bump_fragment_version(VENTURE_CARD, venture_id))
+
+def is_sold_out(venture_id):
+    """Every place is held by a live ticket. One primary-key read; False until the row exists."""
+    return TicketInventory.objects.filter(venture_id=venture_id, remaining=0).exists()
+
+def sync_ticket_inventory(venture_id):
+    """Reset a venture's row from max_tickets and its live tickets"""
+    total = Venture.objects.values_list('max_tickets', flat=True).get(id=venture_id)
+    live = VentureTicket.objects.filter(venture_id=venture_id, status__in=LIVE_TICKET_STATUSES).count()
+    TicketInventory.objects.bulk_create(
+        [TicketInventory(venture_id=venture_id, total=total, remaining=max(total - live, 0))],
+        update_conflicts=True,
+        unique_fields=['venture'],
+        update_fields=['total', 'remaining', 'updated_at'],
+    )
@@ -0,0 +1,108 @@
+import base64
+import json
+from decimal import Decimal, InvalidOperation
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, Max, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from core.fragment_cache import get_fragment_version, VENTURE_INVESTORS
+from .models import Venture, VentureOwnership, VentureTicket
+
+# Investors are ranked by investment (largest first, id as tie-breaker) and
+# read in keyset pages over ownership_rank_idx. Pages and the timeline are
+# cached under the venture's VENTURE_INVESTORS version, which
+# ventures.signals bumps whenever an ownership is written.
+INVESTORS_PAGE_SIZE = 20
+MAX_INVESTORS_PAGE_SIZE = 100
+INVESTORS_CACHE_TIMEOUT = 1800
+
+def ranked_investors(venture_id):
+    """A venture's ownerships in rank order, each annotated with the owner's purchased ``tickets``"""
+    tickets = (
+        VentureTicket.objects.filter(venture_id=OuterRef('venture_id'), buyer_id=OuterRef('owner_id'), status='purchased')
+        .order_by()
+        .values('buyer_id')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    return (
+        VentureOwnership.objects.filter(venture_id=venture_id)
+        .annotate(tickets=Coalesce(Subquery(tickets, output_field=IntegerField()), 0))
+        .order_by('-investment_amount', 'id')
+    )
+
+def encode_cursor(investor):
+    position = [investor['investment'], investor['ownership_id']]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+def decode_cursor(cursor):
+    """Return (investment_amount, id) from a cursor, raising ValueError if it is malformed"""
+    try:
+        investment, ownership_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return Decimal(investment), int(ownership_id)
+    except (TypeError, ValueError, UnicodeError, InvalidOperation) as e:
+        raise ValueError('Invalid cursor') from e
+
+def get_investors_page(venture_id, cursor=None, limit=INVESTORS_PAGE_SIZE):
+    """One page of a venture's investors: {'investors': [...], 'next_cursor': str|None}.
+
+    One query on a cache miss, none on a hit, however many investors the
+    venture has.
+    """
+    position = decode_cursor(cursor) if cursor else None
+    version = get_fragment_version(VENTURE_INVESTORS, venture_id)
+    # Key on the decoded position so arbitrary cursor strings can't flood the cache
+    page_key = f"{position[0]}:{position[1]}" if position else 'first'
+    cache_key = f"venture_investors:{venture_id}:{version}:{page_key}:{limit}"
+
+    page = cache.get(cache_key)
+    if page is None:
+        investors = ranked_investors(venture_id)
+        if position:
+            investment, ownership_id = position
+            investors = investors.filter(
+                Q(investment_amount__lt=investment) | Q(investment_amount=investment, id__gt=ownership_id)
+            )
+        rows = list(investors.values(
+            'id', 'owner_id', 'owner__username', 'owner__first_name', 'owner__last_name',
+            'investment_amount', 'equity_percentage', 'acquired_at', 'tickets',
+        )[:limit + 1])
+        has_more = len(rows) > limit
+        investors = [
+            {
+                'ownership_id': row['id'],
+                'user_id': row['owner_id'],
+                'username': row['owner__username'],
+                'name': f"{row['owner__first_name']} {row['owner__last_name']}".strip(),
+                'tickets': row['tickets'],
+                'investment': str(row['investment_amount']),
+                'equity': str(row['equity_percentage']),
+                'joined_date': row['acquired_at'],
+            }
+            for row in rows[:limit]
+        ]
+        page = {
+            'investors': investors,
+            'next_cursor': encode_cursor(investors[-1]) if has_more else None,
+        }
+        cache.set(cache_key, page, INVESTORS_CACHE_TIMEOUT)
+    return page
+
+def get_investor_summary(venture_id):
+    """Investor count and funding timeline from one aggregate query (cached)"""
+    cache_key = f"venture_investor_summary:{venture_id}:{get_fragment_version(VENTURE_INVESTORS, venture_id)}"
+    summary = cache.get(cache_key)
+    if summary is None:
+        first_ownership = VentureOwnership.objects.filter(venture_id=OuterRef('pk')).order_by('acquired_at', 'id')
+        summary = (
+            Venture.objects.filter(id=venture_id)
+            .annotate(
+                investor_total=Count('ownerships'),
+                first_investment_date=Min('ownerships__acquired_at'),
+                last_investment_date=Max('ownerships__acquired_at'),
+                first_investment_amount=Subquery(first_ownership.values('investment_amount')[:1]),
+            )
+            .values('investor_total', 'first_investment_date', 'last_investment_date', 'first_investment_amount')
+            .first()
+        )
+        cache.set(cache_key, summary, INVESTORS_CACHE_TIMEOUT)
+    return summary
@@ -0,0 +1,115 @@
+import logging
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from core.fragment_cache import bump_fragment_version, VENTURE_CARD, VENTURE_SEARCH
+from hiero.hcs import submit_message
+from .funding import rollup_funding, uses_shards
+from .models import Venture
+
+logger = logging.getLogger(__name__)
+
+# Ventures move draft -> funding when funding_start passes, and funding ->
+# funded/closed when funding_end passes, so listings can trust ``status``
+# instead of re-checking time windows row by row. Both scans are served by
+# the (status, funding_start) and (status, funding_end) indexes.
+TRANSITION_BATCH_SIZE = 500
+# Venture ids per HCS announcement, keeping each message within one chunk
+ANNOUNCE_BATCH_SIZE = 20
+
+def ventures_to_open(now):
+    return Venture.objects.filter(status='draft', funding_start__lte=now).filter(
+        Q(funding_end__isnull=True) | Q(funding_end__gt=now)
+    )
+
+def ventures_to_end(now):
+    """Open ventures past their end, and scheduled drafts whose whole window passed unopened"""
+    return Venture.objects.filter(
+        Q(status='funding') | Q(status='draft', funding_start__isnull=False), funding_end__lte=now
+    )
+
+def _invalidate_on_commit(venture_ids):
+    # Queryset updates skip the Venture signals that re-render cards and search results
+    def bump():
+        for venture_id in venture_ids:
+            bump_fragment_version(VENTURE_CARD, venture_id)
+        bump_fragment_version(VENTURE_SEARCH, 'all')
+    transaction.on_commit(bump)
+
+def open_batch(now, batch_size=TRANSITION_BATCH_SIZE):
+    """Open up to ``batch_size`` drafts whose funding has started. Returns their ids."""
+    with transaction.atomic():
+        # skip_locked lets several schedulers run side by side without double work
+        venture_ids = list(
+            ventures_to_open(now).select_for_update(skip_locked=True)
+            .order_by('funding_start', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not venture_ids:
+            return []
+        Venture.objects.filter(id__in=venture_ids, status='draft').update(status='funding')
+        _invalidate_on_commit(venture_ids)
+    return venture_ids
+
+def end_batch(now, batch_size=TRANSITION_BATCH_SIZE):
+    """Settle up to ``batch_size`` ventures whose funding window has closed.
+    Returns (funded ids, closed ids)."""
+    with transaction.atomic():
+        batch = list(
+            ventures_to_end(now).select_for_update(skip_locked=True)
+            .order_by('funding_end', 'id')
+            .only('id', 'max_tickets')[:batch_size]
+        )
+        if not batch:
+            return [], []
+
+        # Sales still sitting in counter shards must count towards the goal
+        for venture in batch:
+            if uses_shards(venture):
+                rollup_funding(venture.id)
+
+        venture_ids = [venture.id for venture in batch]
+        reached_goal = Q(funding_raised__gte=F('funding_goal')) | Q(tickets_sold__gte=F('max_tickets'))
+        pending = Venture.objects.filter(id__in=venture_ids, status__in=['draft', 'funding'])
+        funded_ids = list(pending.filter(reached_goal).values_list('id', flat=True))
+        Venture.objects.filter(id__in=funded_ids).update(status='funded')
+        pending.exclude(id__in=funded_ids).update(status='closed')
+        _invalidate_on_commit(venture_ids)
+    funded = set(funded_ids)
+    return funded_ids, [venture_id for venture_id in venture_ids if venture_id not in funded]
+
+def run_lifecycle(now=None, batch_size=TRANSITION_BATCH_SIZE):
+    """Apply every transition due by ``now``. Returns {'funding': [...], 'funded': [...], 'closed': [...]}."""
+    now = now or timezone.now()
+    transitions = {'funding': [], 'funded': [], 'closed': []}
+    while True:
+        opened = open_batch(now, batch_size)
+        transitions['funding'].extend(opened)
+        if len(opened) < batch_size:
+            break
+    while True:
+        funded, closed = end_batch(now, batch_size)
+        transitions['funded'].extend(funded)
+        transitions['closed'].extend(closed)
+        if len(funded) + len(closed) < batch_size:
+            break
+    return transitions
+
+def announce_transitions(transitions):
+    """Publish the transitions to HCS, ANNOUNCE_BATCH_SIZE ventures per message.
+    Returns (sent, failed) message counts."""
+    sent = failed = 0
+    for status, venture_ids in transitions.items():
+        for start in range(0, len(venture_ids), ANNOUNCE_BATCH_SIZE):
+            batch = venture_ids[start:start + ANNOUNCE_BATCH_SIZE]
+            message = f"VENTURES:{status}:{','.join(str(venture_id) for venture_id in batch)}"
+            try:
+                result = submit_message(message)
+            except Exception as e:
+                result = {'status': 'failed', 'message': str(e)}
+            if result['status'] == 'success':
+                sent += 1
+            else:
+                failed += 1
+                logger.error(f"Lifecycle announcement failed for {len(batch)} {status} ventures: {result.get('message')}")
+    return sent, failed
@@ -0,0 +1,47 @@
+# management/commands/cap_table.py
+import time
+from django.core.management.base import BaseCommand, CommandError
+from ventures.cap_table import build_snapshot, latest_snapshot, write_csv, write_parquet
+from ventures.models import Venture
+
+class Command(BaseCommand):
+    help = 'Compute a venture\'s cap table (CEO and investor equity) as a new snapshot and export it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', help='Venture slug')
+        parser.add_argument('--no-recompute', action='store_true',
+                            help='Export the latest stored snapshot instead of computing a new one')
+        parser.add_argument('--output', help='Export the snapshot to this file')
+        parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+
+    def handle(self, *args, **options):
+        venture = Venture.objects.filter(slug=options['slug']).first()
+        if venture is None:
+            raise CommandError(f"No venture with slug {options['slug']!r}")
+
+        if options['no_recompute']:
+            snapshot = latest_snapshot(venture)
+            if snapshot is None:
+                raise CommandError(f'{venture.name} has no cap table snapshot yet')
+        else:
+            started = time.perf_counter()
+            snapshot = build_snapshot(venture)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stdout.write(f'Computed v{snapshot.version} for {snapshot.holder_count} holders in {elapsed_ms:.0f}ms')
+
+        if options['output']:
+            try:
+                if options['format'] == 'parquet':
+                    write_parquet(snapshot, options['output'])
+                else:
+                    with open(options['output'], 'w', newline='') as f:
+                        write_csv(snapshot, f)
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            self.stdout.write(f"Wrote {options['output']}")
+
+        ceo = snapshot.ceo.username if snapshot.ceo else 'no winner yet'
+        self.stdout.write(self.style.SUCCESS(
+            f'{venture.name} cap table v{snapshot.version}: {snapshot.holder_count} holders, '
+            f'CEO {ceo}, {snapshot.unallocated_percentage}% unallocated'
+        ))
@@ -0,0 +1,12 @@
+# management/commands/rebuild_venture_search.py
+from django.core.management.base import BaseCommand
+from core.fragment_cache import bump_fragment_version, VENTURE_SEARCH
+from ventures.search import rebuild_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the venture full-text search index (needed after bulk loads, which skip signals)'
+
+    def handle(self, *args, **options):
+        count = rebuild_index()
+        bump_fragment_version(VENTURE_SEARCH, 'all')
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} ventures'))
@@ -0,0 +1,60 @@
+# management/commands/resume_ticket_purchases.py
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from ventures.models import TicketPurchase
+from ventures.ticket_purchase import fulfill_purchase, run_step, StepError, MAX_STEP_ATTEMPTS
+
+class Command(BaseCommand):
+    help = 'Resume ticket purchases whose background fulfillment was interrupted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset-stuck', action='store_true',
+                            help='Requeue purchases left in "fulfilling" by a crashed worker')
+        parser.add_argument('--stuck-minutes', type=int, default=15,
+                            help='How long a purchase must have been fulfilling to count as stuck')
+        parser.add_argument('--retry-logs', action='store_true',
+                            help='Write the HCS record for completed purchases that are missing one')
+        parser.add_argument('--max-attempts', type=int, default=MAX_STEP_ATTEMPTS)
+        parser.add_argument('--limit', type=int, default=100)
+
+    def handle(self, *args, **options):
+        if options['reset_stuck']:
+            cutoff = timezone.now() - timedelta(minutes=options['stuck_minutes'])
+            reset = TicketPurchase.objects.filter(status='fulfilling', updated_at__lt=cutoff).update(status='reserved')
+            self.stdout.write(f"Requeued {reset} stuck purchases")
+
+        purchase_ids = list(
+            TicketPurchase.objects.filter(status='reserved')
+            .order_by('created_at')
+            .values_list('id', flat=True)[:options['limit']]
+        )
+
+        completed = failed = 0
+        for purchase_id in purchase_ids:
+            purchase = fulfill_purchase(purchase_id, max_attempts=options['max_attempts'])
+            if purchase is None:
+                continue
+            if purchase.status == 'completed':
+                completed += 1
+            else:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"Purchase {purchase.id} {purchase.status}: {purchase.last_error}"))
+
+        logged = 0
+        if options['retry_logs']:
+            missing_log = (
+                TicketPurchase.objects.filter(status='completed')
+                .exclude(steps__step='hcs_log', steps__status='succeeded')
+                .select_related('ticket__venture', 'buyer')[:options['limit']]
+            )
+            for purchase in missing_log:
+                try:
+                    run_step(purchase, 'hcs_log', {}, max_attempts=options['max_attempts'])
+                    logged += 1
+                except StepError as e:
+                    self.stdout.write(self.style.WARNING(f"Purchase {purchase.id}: {e}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Completed {completed} purchases, {failed} failed, wrote {logged} missing HCS records'
+        ))
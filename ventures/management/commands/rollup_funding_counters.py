@@ -0,0 +1,23 @@
+# management/commands/rollup_funding_counters.py
+from django.core.management.base import BaseCommand
+from ventures.funding import rollup_funding
+from ventures.models import FundingCounterShard
+
+class Command(BaseCommand):
+    help = 'Fold sharded ticket sales into each venture\'s tickets_sold and funding_raised'
+
+    def handle(self, *args, **options):
+        venture_ids = (
+            FundingCounterShard.objects.exclude(tickets=0, amount=0)
+            .values_list('venture_id', flat=True)
+            .distinct()
+        )
+
+        ventures = tickets = 0
+        for venture_id in list(venture_ids):
+            moved = rollup_funding(venture_id)
+            if moved:
+                ventures += 1
+                tickets += moved
+
+        self.stdout.write(self.style.SUCCESS(f'Rolled up {tickets} tickets across {ventures} ventures'))
@@ -0,0 +1,35 @@
+# management/commands/run_venture_lifecycle.py
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from ventures.lifecycle import run_lifecycle, announce_transitions, TRANSITION_BATCH_SIZE
+
+class Command(BaseCommand):
+    help = 'Move ventures draft -> funding -> funded/closed as their funding windows open and close'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=TRANSITION_BATCH_SIZE)
+        parser.add_argument('--announce', action='store_true',
+                            help='Publish the transitions to the HCS topic in batches')
+        parser.add_argument('--loop', action='store_true', help='Keep running as a scheduler')
+        parser.add_argument('--interval', type=int, default=60, help='Seconds between runs with --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            self.run_once(options)
+            if not options['loop']:
+                return
+            close_old_connections()
+            time.sleep(options['interval'])
+
+    def run_once(self, options):
+        started = time.perf_counter()
+        transitions = run_lifecycle(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Opened {len(transitions['funding'])} ventures, {len(transitions['funded'])} funded, "
+            f"{len(transitions['closed'])} closed in {time.perf_counter() - started:.2f}s"
+        ))
+
+        if options['announce'] and any(transitions.values()):
+            sent, failed = announce_transitions(transitions)
+            self.stdout.write(f'Sent {sent} announcements to HCS, {failed} failed')
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:18
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0003_alter_venture_funding_end_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketPurchase',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('idempotency_key', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('reserved', 'Reserved'), ('fulfilling', 'Fulfilling'), ('completed', 'Completed'), ('compensating', 'Compensating'), ('failed', 'Failed'), ('compensation_failed', 'Compensation Failed')], db_index=True, default='reserved', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('buyer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_purchases', to=settings.AUTH_USER_MODEL)),
+                ('ticket', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='purchase', to='ventures.ventureticket')),
+            ],
+            options={
+                'unique_together': {('buyer', 'idempotency_key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TicketPurchaseStep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('step', models.CharField(choices=[('mint', 'Mint NFT'), ('deliver', 'Associate and deliver NFT'), ('payment', 'STAR payment'), ('hcs_log', 'HCS log'), ('refund_nft', 'Return NFT (compensation)')], max_length=20)),
+                ('status', models.CharField(choices=[('succeeded', 'Succeeded'), ('failed', 'Failed')], max_length=20)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('purchase', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='steps', to='ventures.ticketpurchase')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def create_counters(apps, schema_editor):
+    Venture = apps.get_model('ventures', 'Venture')
+    TicketNumberCounter = apps.get_model('ventures', 'TicketNumberCounter')
+    highest = dict(
+        Venture.objects.values_list('id').annotate(n=Max('tickets__ticket_number'))
+    )
+    TicketNumberCounter.objects.bulk_create([
+        TicketNumberCounter(venture_id=venture_id, next_number=(n or 0) + 1)
+        for venture_id, n in highest.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0004_ticket_purchase_saga'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketNumberCounter',
+            fields=[
+                ('venture', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ticket_counter', serialize=False, to='ventures.venture')),
+                ('next_number', models.PositiveIntegerField(default=1)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TicketNumberGap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('reason', models.CharField(choices=[('reservation_failed', 'Reservation failed'), ('purchase_failed', 'Purchase failed')], max_length=30)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('venture', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_number_gaps', to='ventures.venture')),
+            ],
+            options={
+                'ordering': ['number'],
+                'unique_together': {('venture', 'number')},
+            },
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
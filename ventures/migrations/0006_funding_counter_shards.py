@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0005_ticket_number_counter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FundingCounterShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('tickets', models.IntegerField(default=0)),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('venture', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='funding_shards', to='ventures.venture')),
+            ],
+            options={
+                'unique_together': {('venture', 'shard')},
+            },
+        ),
+    ]
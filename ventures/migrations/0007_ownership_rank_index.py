@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0006_funding_counter_shards'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ventureownership',
+            index=models.Index(fields=['venture', '-investment_amount', 'id'], name='ownership_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:40
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    """FTS5 table on SQLite, tsvector + GIN on PostgreSQL; other backends search with LIKE"""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE ventures_search USING fts5("
+            "venture_id, name, description, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE ventures_search ("
+            "venture_id uuid PRIMARY KEY REFERENCES ventures_venture (id) ON DELETE CASCADE, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute("CREATE INDEX ventures_search_document_idx ON ventures_search USING GIN (document)")
+    else:
+        return
+
+    Venture = apps.get_model('ventures', 'Venture')
+    for venture in Venture.objects.only('id', 'name', 'description').iterator():
+        venture_id = Venture._meta.pk.get_db_prep_value(venture.id, schema_editor.connection)
+        if vendor == 'sqlite':
+            schema_editor.execute(
+                "INSERT INTO ventures_search (venture_id, name, description) VALUES (%s, %s, %s)",
+                [venture_id, venture.name, venture.description],
+            )
+        else:
+            schema_editor.execute(
+                "INSERT INTO ventures_search (venture_id, document) VALUES (%s, "
+                "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B'))",
+                [venture_id, venture.name, venture.description],
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP TABLE IF EXISTS ventures_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0007_ownership_rank_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
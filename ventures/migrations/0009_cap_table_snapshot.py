@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0008_venture_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CapTableSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('holder_count', models.PositiveIntegerField(default=0)),
+                ('total_invested', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('unallocated_percentage', models.DecimalField(decimal_places=6, default=0, max_digits=9)),
+                ('holders', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('ceo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('venture', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cap_tables', to='ventures.venture')),
+            ],
+            options={
+                'ordering': ['-version'],
+                'unique_together': {('venture', 'version')},
+            },
+        ),
+    ]
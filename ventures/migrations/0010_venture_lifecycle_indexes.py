@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0009_cap_table_snapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venture',
+            index=models.Index(fields=['status', 'funding_start'], name='venture_status_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venture',
+            index=models.Index(fields=['status', 'funding_end'], name='venture_status_end_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-19 07:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+# ventures.inventory.LIVE_TICKET_STATUSES at the time of this migration
+LIVE_TICKET_STATUSES = ['pending', 'processing', 'purchased']
+
+
+def create_inventory(apps, schema_editor):
+    Venture = apps.get_model('ventures', 'Venture')
+    TicketInventory = apps.get_model('ventures', 'TicketInventory')
+    ventures = Venture.objects.annotate(live=Count('tickets', filter=Q(tickets__status__in=LIVE_TICKET_STATUSES)))
+    TicketInventory.objects.bulk_create([
+        TicketInventory(venture_id=venture.id, total=venture.max_tickets, remaining=max(venture.max_tickets - venture.live, 0))
+        for venture in ventures.only('id', 'max_tickets')
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0010_venture_lifecycle_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketInventory',
+            fields=[
+                ('venture', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ticket_inventory', serialize=False, to='ventures.venture')),
+                ('total', models.PositiveIntegerField()),
+                ('remaining', models.PositiveIntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='ventureticket',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'processing', 'purchased'])), fields=('venture', 'buyer'), name='one_live_ticket_per_buyer'),
+        ),
+        migrations.AddConstraint(
+            model_name='ticketinventory',
+            constraint=models.CheckConstraint(condition=models.Q(('remaining__lte', models.F('total'))), name='ticket_remaining_lte_total'),
+        ),
+        migrations.RunPython(create_inventory, migrations.RunPython.noop),
+    ]
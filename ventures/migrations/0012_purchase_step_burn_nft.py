@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ventures', '0011_ticket_inventory'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticketpurchasestep',
+            name='step',
+            field=models.CharField(choices=[('mint', 'Mint NFT'), ('deliver', 'Associate and deliver NFT'), ('payment', 'STAR payment'), ('hcs_log', 'HCS log'), ('refund_nft', 'Return NFT (compensation)'), ('burn_nft', 'Burn NFT (compensation)')], max_length=20),
+        ),
+    ]
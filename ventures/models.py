@@ -2,9 +2,11 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.validators import MinValueValidator
 import uuid
 import json
+from string import Template
 
 class Venture(models.Model):
     """Minimal Venture Model with NFT Integration"""
@@ -48,6 +50,11 @@ class Venture(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Lifecycle scheduler scans (see ventures.lifecycle)
+            models.Index(fields=['status', 'funding_start'], name='venture_status_start_idx'),
+            models.Index(fields=['status', 'funding_end'], name='venture_status_end_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -57,6 +64,7 @@ class Venture(models.Model):
         """Check if funding is currently active"""
         now = timezone.now()
         return (self.status == 'funding' and 
+                self.funding_start is not None and self.funding_end is not None and
                 self.funding_start <= now <= self.funding_end)
     
     @property
@@ -78,6 +86,16 @@ class Venture(models.Model):
             return 100 / self.max_tickets  # Equal distribution
         return 0
     
+    @cached_property
+    def top_investors(self):
+        """Top 3 ownerships by investment (only evaluated on a fragment cache miss)"""
+        return list(self.ownerships.select_related('owner').order_by('-investment_amount')[:3])
+    
+    @cached_property
+    def investor_count(self):
+        """Number of investors in this venture"""
+        return self.ownerships.count()
+    
     def can_user_buy_ticket(self, user):
         """Check if user can buy a ticket for this venture"""
         if not self.is_funding_active:
@@ -128,8 +146,14 @@ class VentureTicket(models.Model):
     
     class Meta:
         ordering = ['ticket_number']
-        unique_together = ['venture', 'buyer']  # One ticket per user per venture
         unique_together = ['venture', 'ticket_number']  # Unique ticket numbers
+        constraints = [
+            # One ticket per user per venture; failed and cancelled tickets don't count
+            models.UniqueConstraint(
+                fields=['venture', 'buyer'], name='one_live_ticket_per_buyer',
+                condition=models.Q(status__in=['pending', 'processing', 'purchased']),
+            ),
+        ]
     
     def __str__(self):
         return f"Ticket #{self.ticket_number} - {self.venture.name} - {self.buyer.username}"
@@ -137,9 +161,8 @@ class VentureTicket(models.Model):
     def save(self, *args, **kwargs):
         """Auto-assign ticket number if not set"""
         if not self.ticket_number:
-            # Get next available ticket number for this venture
-            last_ticket = VentureTicket.objects.filter(venture=self.venture).order_by('-ticket_number').first()
-            self.ticket_number = (last_ticket.ticket_number + 1) if last_ticket else 1
+            from .ticket_numbers import allocate_ticket_number
+            self.ticket_number = allocate_ticket_number(self.venture_id)
         
         super().save(*args, **kwargs)
     
@@ -151,39 +174,37 @@ class VentureTicket(models.Model):
         return 0
     
     def generate_nft_metadata(self):
-        """Generate NFT metadata for the ticket"""
-        metadata = {
-            "name": f"{self.venture.name} - Ticket #{self.ticket_number}",
-            "description": f"Venture ownership ticket for {self.venture.name}",
-            "image": f"https://api.dicebear.com/7.x/identicon/svg?seed={self.id}",
-            "attributes": [
-                {
-                    "trait_type": "Venture",
-                    "value": self.venture.name
-                },
-                {
-                    "trait_type": "Ticket Number",
-                    "value": str(self.ticket_number)
-                },
-                {
-                    "trait_type": "Equity",
-                    "value": f"{self.equity_percentage:.2f}%"
-                },
-                {
-                    "trait_type": "Purchase Price",
-                    "value": str(self.purchase_price)
-                }
-            ],
-            "properties": {
-                "venture_id": str(self.venture.id),
-                "ticket_id": str(self.id),
-                "buyer": self.buyer.username,
-                "purchase_date": self.purchased_at.isoformat() if self.purchased_at else None,
-                "blockchain": "hedera",
-                "type": "venture_ownership_ticket"
-            }
-        }
-        return json.dumps(metadata, indent=2)
+        """Generate the ticket's HIP-412 metadata as compact JSON.
+        
+        Only the values are escaped; the document's structure comes
+        pre-serialized from TICKET_METADATA_TEMPLATE, so equal tickets always
+        produce identical bytes (and the same content address).
+        """
+        return TICKET_METADATA_TEMPLATE.substitute(
+            name=json.dumps(f"{self.venture.name} - Ticket #{self.ticket_number}"),
+            description=json.dumps(f"Venture ownership ticket for {self.venture.name}"),
+            image=json.dumps(f"https://api.dicebear.com/7.x/identicon/svg?seed={self.id}"),
+            venture_id=json.dumps(str(self.venture_id)),
+            ticket_id=json.dumps(str(self.id)),
+            buyer=json.dumps(self.buyer.username),
+            purchase_date=json.dumps(self.purchased_at.isoformat() if self.purchased_at else None),
+            venture=json.dumps(self.venture.name),
+            ticket_number=json.dumps(str(self.ticket_number)),
+            equity=json.dumps(f"{self.equity_percentage:.2f}%"),
+            price=json.dumps(str(self.purchase_price)),
+        )
+
+# HIP-412 ticket metadata with every value already JSON-encoded by the caller
+TICKET_METADATA_TEMPLATE = Template(
+    '{"name":$name,"creator":"NextStar","description":$description,'
+    '"image":$image,"type":"image/svg+xml","format":"HIP412@2.0.0",'
+    '"properties":{"venture_id":$venture_id,"ticket_id":$ticket_id,"buyer":$buyer,'
+    '"purchase_date":$purchase_date,"blockchain":"hedera","type":"venture_ownership_ticket"},'
+    '"attributes":[{"trait_type":"Venture","value":$venture},'
+    '{"trait_type":"Ticket Number","value":$ticket_number},'
+    '{"trait_type":"Equity","value":$equity},'
+    '{"trait_type":"Purchase Price","value":$price}]}'
+)
 
 class VentureOwnership(models.Model):
     """Minimal ownership tracking"""
@@ -198,6 +219,155 @@ class VentureOwnership(models.Model):
     
     class Meta:
         unique_together = ['venture', 'owner']
+        indexes = [
+            # Investor leaderboard keyset order (see ventures.investors)
+            models.Index(fields=['venture', '-investment_amount', 'id'], name='ownership_rank_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.owner.username} owns {self.equity_percentage}% of {self.venture.name}"
+
+class TicketNumberCounter(models.Model):
+    """Next unallocated ticket number per venture (see ventures.ticket_numbers)"""
+    venture = models.OneToOneField(Venture, on_delete=models.CASCADE, primary_key=True, related_name='ticket_counter')
+    next_number = models.PositiveIntegerField(default=1)
+    
+    def __str__(self):
+        return f"{self.venture_id} next #{self.next_number}"
+
+class TicketInventory(models.Model):
+    """Places left for sale per venture, claimed with a conditional decrement (see ventures.inventory)"""
+    venture = models.OneToOneField(Venture, on_delete=models.CASCADE, primary_key=True, related_name='ticket_inventory')
+    total = models.PositiveIntegerField()
+    remaining = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        constraints = [
+            models.CheckConstraint(condition=models.Q(remaining__lte=models.F('total')), name='ticket_remaining_lte_total'),
+        ]
+    
+    def __str__(self):
+        return f"{self.venture_id} - {self.remaining}/{self.total}"
+
+class TicketNumberGap(models.Model):
+    """A ticket number that was allocated but never sold"""
+    
+    REASON_CHOICES = [
+        ('reservation_failed', 'Reservation failed'),
+        ('purchase_failed', 'Purchase failed'),
+    ]
+    
+    venture = models.ForeignKey(Venture, on_delete=models.CASCADE, related_name='ticket_number_gaps')
+    number = models.PositiveIntegerField()
+    reason = models.CharField(max_length=30, choices=REASON_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['venture', 'number']
+        ordering = ['number']
+    
+    def __str__(self):
+        return f"{self.venture_id} #{self.number} ({self.reason})"
+
+class FundingCounterShard(models.Model):
+    """Part of a hot venture's sales not yet rolled into Venture.tickets_sold
+    and funding_raised (see ventures.funding)"""
+    venture = models.ForeignKey(Venture, on_delete=models.CASCADE, related_name='funding_shards')
+    shard = models.PositiveSmallIntegerField()
+    tickets = models.IntegerField(default=0)
+    amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    class Meta:
+        unique_together = ['venture', 'shard']
+    
+    def __str__(self):
+        return f"{self.venture_id} shard {self.shard}: {self.tickets} tickets"
+
+class CapTableSnapshot(models.Model):
+    """A computed equity distribution for a venture (see ventures.cap_table).
+    Holders are stored column-wise so large tables load and export quickly."""
+    venture = models.ForeignKey(Venture, on_delete=models.CASCADE, related_name='cap_tables')
+    version = models.PositiveIntegerField()
+    ceo = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    holder_count = models.PositiveIntegerField(default=0)
+    total_invested = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    unallocated_percentage = models.DecimalField(max_digits=9, decimal_places=6, default=0)
+    # {'user_ids': [...], 'usernames': [...], 'invested_cents': [...], 'equity_units': [...]}
+    holders = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        unique_together = ['venture', 'version']
+        ordering = ['-version']
+    
+    def __str__(self):
+        return f"{self.venture.name} cap table v{self.version}"
+
+class TicketPurchase(models.Model):
+    """Saga state for one ticket purchase. The ticket is reserved in a short
+    transaction; the Hedera steps run afterwards in ventures.ticket_purchase."""
+    
+    STATUS_CHOICES = [
+        ('reserved', 'Reserved'),
+        ('fulfilling', 'Fulfilling'),
+        ('completed', 'Completed'),
+        ('compensating', 'Compensating'),
+        ('failed', 'Failed'),
+        ('compensation_failed', 'Compensation Failed'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ticket = models.OneToOneField(VentureTicket, on_delete=models.CASCADE, related_name='purchase')
+    buyer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ticket_purchases')
+    idempotency_key = models.CharField(max_length=64)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='reserved', db_index=True)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ['buyer', 'idempotency_key']
+    
+    def __str__(self):
+        return f"Purchase of {self.ticket_id} - {self.status}"
+    
+    def step_results(self):
+        """{step: result} for every step that has succeeded so far"""
+        return {
+            step.step: step.result
+            for step in self.steps.filter(status='succeeded')
+        }
+
+class TicketPurchaseStep(models.Model):
+    """Append-only log of the saga steps run for a purchase"""
+    
+    STEP_CHOICES = [
+        ('mint', 'Mint NFT'),
+        ('deliver', 'Associate and deliver NFT'),
+        ('payment', 'STAR payment'),
+        ('hcs_log', 'HCS log'),
+        ('refund_nft', 'Return NFT (compensation)'),
+        ('burn_nft', 'Burn NFT (compensation)'),
+    ]
+    STATUS_CHOICES = [
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    purchase = models.ForeignKey(TicketPurchase, on_delete=models.CASCADE, related_name='steps')
+    step = models.CharField(max_length=20, choices=STEP_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['created_at', 'id']
     
     def __str__(self):
-        return f"{self.owner.username} owns {self.equity_percentage}% of {self.venture.name}"
\ No newline at end of file
+        return f"{self.step} {self.status}"
@@ -0,0 +1,150 @@
+import hashlib
+import re
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from core.fragment_cache import get_fragment_version, VENTURE_SEARCH
+from .models import Venture
+
+# Venture names and descriptions are indexed in the ``ventures_search`` table:
+# an FTS5 virtual table on SQLite, a tsvector column with a GIN index on
+# PostgreSQL (both created by migration 0008). ventures.signals keeps it in
+# step with Venture saves and deletes; rebuild_venture_search refills it
+# after bulk loads, which skip signals. Name matches outrank description
+# matches, and every search term also matches as a prefix.
+SEARCH_TABLE = 'ventures_search'
+SEARCH_RESULTS_LIMIT = 20
+MAX_SEARCH_RESULTS_LIMIT = 50
+SEARCH_CACHE_TIMEOUT = 300
+MAX_SEARCH_TERMS = 8
+# ventures_list ranks and paginates over at most this many matches
+MAX_LIST_SEARCH_MATCHES = 500
+# Ventures shown to investors (same as ventures_list)
+LISTED_STATUSES = ['funding', 'active']
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+def search_terms(query):
+    """Lower-cased words of a query; punctuation never reaches the search syntax"""
+    return _TERM_RE.findall(query.lower())[:MAX_SEARCH_TERMS]
+
+def _backend():
+    return connection.vendor if connection.vendor in ('sqlite', 'postgresql') else None
+
+def _db_id(venture_id):
+    return Venture._meta.pk.get_db_prep_value(venture_id, connection)
+
+def _id_match(venture_id):
+    """FTS5 query for one venture's entry (its id is a single indexed token)"""
+    return f'venture_id: "{_db_id(venture_id)}"'
+
+def index_venture(venture):
+    """Add or refresh one venture's search entry"""
+    backend = _backend()
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [_id_match(venture.pk)])
+            cursor.execute(
+                f'INSERT INTO {SEARCH_TABLE} (venture_id, name, description) VALUES (%s, %s, %s)',
+                [_db_id(venture.pk), venture.name, venture.description],
+            )
+        elif backend == 'postgresql':
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE} (venture_id, document) VALUES (%s, "
+                f"setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')) "
+                f"ON CONFLICT (venture_id) DO UPDATE SET document = EXCLUDED.document",
+                [_db_id(venture.pk), venture.name, venture.description],
+            )
+
+def remove_venture(venture_id):
+    backend = _backend()
+    with connection.cursor() as cursor:
+        if backend == 'sqlite':
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [_id_match(venture_id)])
+        elif backend == 'postgresql':
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE venture_id = %s', [_db_id(venture_id)])
+
+def rebuild_index(batch_size=1000):
+    """Re-index every venture. Returns the number indexed."""
+    count = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        for venture in Venture.objects.only('id', 'name', 'description').iterator(chunk_size=batch_size):
+            index_venture(venture)
+            count += 1
+    return count
+
+def search_venture_ids(query, statuses=None, limit=SEARCH_RESULTS_LIMIT):
+    """Ids of the ventures best matching ``query``, best first"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    backend = _backend()
+    venture_table = Venture._meta.db_table
+    status_sql, status_params = '', []
+    if statuses:
+        status_sql = f" AND v.status IN ({', '.join(['%s'] * len(statuses))})"
+        status_params = list(statuses)
+
+    if backend == 'sqlite':
+        match = '{name description}: ' + ' '.join(f'"{term}"*' for term in terms)
+        sql = (
+            f'SELECT v.id FROM {SEARCH_TABLE} s JOIN {venture_table} v ON v.id = s.venture_id '
+            f'WHERE {SEARCH_TABLE} MATCH %s{status_sql} '
+            f'ORDER BY bm25({SEARCH_TABLE}, 0, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}), v.id LIMIT %s'
+        )
+        params = [match, *status_params, limit]
+    elif backend == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        sql = (
+            f"SELECT v.id FROM {SEARCH_TABLE} s JOIN {venture_table} v ON v.id = s.venture_id, "
+            f"to_tsquery('simple', %s) q WHERE s.document @@ q{status_sql} "
+            f"ORDER BY ts_rank(s.document, q) DESC, v.id LIMIT %s"
+        )
+        params = [tsquery, *status_params, limit]
+    else:
+        # No full-text backend: every term must appear in the name or description
+        ventures = Venture.objects.all()
+        for term in terms:
+            ventures = ventures.filter(Q(name__icontains=term) | Q(description__icontains=term))
+        if statuses:
+            ventures = ventures.filter(status__in=statuses)
+        return list(ventures.order_by('id').values_list('id', flat=True)[:limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [Venture._meta.pk.to_python(row[0]) for row in cursor.fetchall()]
+
+def search_ventures(query, statuses=None, limit=SEARCH_RESULTS_LIMIT):
+    """Best matching ventures as JSON-ready dicts (cached until any venture changes)"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    version = get_fragment_version(VENTURE_SEARCH, 'all')
+    status_key = ','.join(sorted(statuses)) if statuses else 'any'
+    # Key on a digest of the normalised terms so equivalent queries share one entry
+    terms_key = hashlib.sha1(' '.join(terms).encode()).hexdigest()
+    cache_key = f"venture_search:{version}:{status_key}:{limit}:{terms_key}"
+
+    results = cache.get(cache_key)
+    if results is None:
+        venture_ids = search_venture_ids(query, statuses, limit)
+        ventures = Venture.objects.in_bulk(venture_ids)
+        results = [
+            {
+                'id': str(venture.id),
+                'name': venture.name,
+                'slug': venture.slug,
+                'description': venture.description[:200],
+                'status': venture.status,
+                'ticket_price': float(venture.ticket_price),
+            }
+            for venture in (ventures[venture_id] for venture_id in venture_ids if venture_id in ventures)
+        ]
+        cache.set(cache_key, results, SEARCH_CACHE_TIMEOUT)
+    return results
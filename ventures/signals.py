@@ -0,0 +1,49 @@
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.dispatch import receiver
+from core.fragment_cache import (
+    bump_fragment_version, VENTURE_CARD, VENTURE_INVESTORS, VENTURE_SEARCH, VENTURE_TICKETS, USER_WALLET,
+)
+from .inventory import sync_ticket_inventory
+from .models import Venture, VentureOwnership, VentureTicket, TicketInventory
+from .search import index_venture, remove_venture
+
+@receiver([post_save, post_delete], sender=Venture)
+def invalidate_venture_fragments(sender, instance, **kwargs):
+    """Re-render venture cards when funding numbers or status change"""
+    bump_fragment_version(VENTURE_CARD, instance.pk)
+
+@receiver([post_save, post_delete], sender=VentureOwnership)
+def invalidate_investor_fragments(sender, instance, **kwargs):
+    """Re-render investor lists (and the top investors shown on cards)"""
+    bump_fragment_version(VENTURE_INVESTORS, instance.venture_id)
+    bump_fragment_version(VENTURE_CARD, instance.venture_id)
+
+@receiver([post_save, post_delete], sender=VentureTicket)
+def invalidate_ticket_pages(sender, instance, **kwargs):
+    """Tickets API pages (ventures.api)"""
+    bump_fragment_version(VENTURE_TICKETS, instance.venture_id)
+
+@receiver([post_save, post_delete], sender=VentureTicket)
+def invalidate_buyer_eligibility(sender, instance, **kwargs):
+    """The buyer's invest checks (ventures.eligibility); after commit so a
+    concurrent check can't re-cache the state from before the purchase"""
+    buyer_id = instance.buyer_id
+    transaction.on_commit(lambda: bump_fragment_version(USER_WALLET, buyer_id))
+
+@receiver(post_save, sender=Venture)
+def sync_ticket_places(sender, instance, created, **kwargs):
+    """Create the venture's inventory row, and recount it when max_tickets changes"""
+    if created or TicketInventory.objects.filter(venture_id=instance.pk).exclude(total=instance.max_tickets).exists():
+        sync_ticket_inventory(instance.pk)
+
+@receiver(post_save, sender=Venture)
+def update_search_index(sender, instance, **kwargs):
+    """Re-index the venture in the same transaction as the save"""
+    index_venture(instance)
+    transaction.on_commit(lambda: bump_fragment_version(VENTURE_SEARCH, 'all'))
+
+@receiver(post_delete, sender=Venture)
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_venture(instance.pk)
+    transaction.on_commit(lambda: bump_fragment_version(VENTURE_SEARCH, 'all'))
@@ -1,3 +1,646 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from hiero_sdk_python.response_code import ResponseCode
+from hiero.ft import transfer_between
+from hiero.nft import associate_token_with_account
+from core.fragment_cache import get_fragment_version, USER_WALLET
+from core.models import UserWallet, NFTMetadata
+from . import ticket_numbers
+from .eligibility import aget_eligibility
+from .api import MAX_API_PAGE_SIZE
+from .cap_table import allocate_units, compute_cap_table, UNITS_PER_PERCENT
+from .search import LISTED_STATUSES
+from .models import (
+    Venture, VentureTicket, VentureOwnership, TicketInventory, TicketNumberCounter, TicketNumberGap, TicketPurchase,
+    FundingCounterShard,
+)
+from .funding import record_sale, refresh_funding, rollup_funding
+from .lifecycle import announce_transitions, end_batch, open_batch, run_lifecycle
+from .ticket_numbers import allocate_ticket_number, peek_next_ticket_number, record_gap
+from .ticket_purchase import fulfill_purchase, reserve_ticket, ReservationError
 
-# Create your tests here.
+def make_user(username):
+    user = User.objects.create(username=username)
+    UserWallet.objects.create(user=user, recipient_id=f'0.0.{user.pk + 1000}', private_key='hex=abcd', status='active')
+    return user
+
+def make_venture(founder, **fields):
+    now = timezone.now()
+    defaults = {
+        'name': 'Test Venture',
+        'slug': 'test-venture',
+        'description': 'A venture for tests',
+        'founder': founder,
+        'funding_goal': Decimal('1000'),
+        'ticket_price': Decimal('10'),
+        'max_tickets': 2,
+        'nft_contract_address': '0.0.5005',
+        'funding_start': now - timedelta(days=1),
+        'funding_end': now + timedelta(days=1),
+        'status': 'funding',
+    }
+    defaults.update(fields)
+    return Venture.objects.create(**defaults)
+
+HIERO_SUCCESS = {
+    'mint_nft': {'status': 'success', 'serial': 7},
+    'associate_token_with_account': {'status': 'success'},
+    'deliver_nft': {'status': 'success'},
+    'transfer_between': {'status': 'success', 'receipt': None},
+    'submit_message': {'status': 'success', 'topic': '0.0.777'},
+    'return_nft': {'status': 'success'},
+    'find_transfers_by_memo': [],
+    'burn_nft': {'status': 'success'},
+    'find_nfts_by_metadata': [],
+}
+
+def patch_hiero(test):
+    """Patch every Hedera call the purchase saga makes with a successful response. Returns {name: mock}."""
+    mocks = {}
+    for name, value in HIERO_SUCCESS.items():
+        patcher = mock.patch(f'ventures.ticket_purchase.{name}', return_value=value)
+        mocks[name] = patcher.start()
+        test.addCleanup(patcher.stop)
+    return mocks
+
+def transfer_receipt(status):
+    """Run hiero.ft transfers offline, each returning a receipt with ``status``"""
+    transaction = mock.MagicMock()
+    for method in ('add_token_transfer', 'set_transaction_memo', 'freeze_with', 'sign'):
+        getattr(transaction, method).return_value = transaction
+    transaction.execute.return_value = mock.Mock(status=status)
+    return mock.patch.multiple(
+        'hiero.ft', Client=mock.DEFAULT, Network=mock.DEFAULT, PrivateKey=mock.DEFAULT,
+        TransferTransaction=mock.Mock(return_value=transaction),
+    )
+
+class TicketPurchaseSagaTests(TestCase):
+    def setUp(self):
+        self.founder = make_user('founder')
+        self.buyer = make_user('buyer')
+        self.venture = make_venture(self.founder)
+        self.mocks = patch_hiero(self)
+
+    def remaining(self):
+        return TicketInventory.objects.get(venture=self.venture).remaining
+
+    def test_reservation_claims_a_place_once_per_idempotency_key(self):
+        purchase, created = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        self.assertTrue(created)
+        self.assertEqual(purchase.status, 'reserved')
+        self.assertEqual(purchase.ticket.status, 'pending')
+        self.assertEqual(self.remaining(), 1)
+
+        replay, created = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        self.assertFalse(created)
+        self.assertEqual(replay.id, purchase.id)
+        self.assertEqual(self.remaining(), 1)
+
+    def test_second_ticket_for_the_same_buyer_is_refused(self):
+        reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        with self.assertRaisesMessage(ReservationError, 'already own'):
+            reserve_ticket(self.venture.id, self.buyer, 'key-2')
+        self.assertEqual(VentureTicket.objects.filter(buyer=self.buyer).count(), 1)
+        self.assertEqual(self.remaining(), 1)
+
+    def test_sold_out_venture_refuses_reservation_and_records_the_gap(self):
+        reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        reserve_ticket(self.venture.id, make_user('second'), 'key-1')
+        late = make_user('late')
+
+        with self.assertRaisesMessage(ReservationError, 'No tickets available'):
+            reserve_ticket(self.venture.id, late, 'key-1')
+        self.assertFalse(VentureTicket.objects.filter(buyer=late).exists())
+        self.assertEqual(self.remaining(), 0)
+        self.assertTrue(TicketNumberGap.objects.filter(venture=self.venture, number=3, reason='reservation_failed').exists())
+
+    def test_inactive_funding_is_refused(self):
+        Venture.objects.filter(id=self.venture.id).update(status='draft')
+        with self.assertRaisesMessage(ReservationError, 'Funding is not active'):
+            reserve_ticket(self.venture.id, self.buyer, 'key-1')
+
+    def test_inventory_row_is_created_for_ventures_loaded_without_one(self):
+        TicketInventory.objects.filter(venture=self.venture).delete()
+        reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        self.assertEqual(self.remaining(), 1)
+
+    def test_fulfillment_completes_the_purchase(self):
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, backoff=0)
+
+        purchase.refresh_from_db()
+        ticket = purchase.ticket
+        ticket.refresh_from_db()
+        self.assertEqual(purchase.status, 'completed')
+        self.assertEqual(ticket.status, 'purchased')
+        self.assertEqual(ticket.nft_token_id, '0.0.5005/7')
+        self.assertTrue(VentureOwnership.objects.filter(venture=self.venture, owner=self.buyer).exists())
+        self.venture.refresh_from_db()
+        self.assertEqual(self.venture.tickets_sold, 1)
+        self.assertEqual(self.venture.funding_raised, Decimal('10'))
+
+        # The minted metadata carries the same purchase date as the ticket
+        metadata = NFTMetadata.objects.get(digest=ticket.nft_metadata['digest'])
+        self.assertIn(ticket.purchased_at.isoformat(), metadata.content)
+        self.assertNotIn('"purchase_date":null', metadata.content)
+        self.assertEqual(
+            list(purchase.steps.filter(status='succeeded').values_list('step', flat=True).order_by('created_at')),
+            ['mint', 'deliver', 'payment', 'hcs_log'],
+        )
+
+    def test_completed_purchase_invalidates_both_wallets(self):
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        before = [get_fragment_version(USER_WALLET, user.id) for user in (self.buyer, self.founder)]
+        with self.captureOnCommitCallbacks(execute=True):
+            fulfill_purchase(purchase.id, backoff=0)
+        after = [get_fragment_version(USER_WALLET, user.id) for user in (self.buyer, self.founder)]
+        self.assertTrue(all(new > old for new, old in zip(after, before)))
+
+    def test_fulfillment_runs_once(self):
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, backoff=0)
+        self.assertIsNone(fulfill_purchase(purchase.id, backoff=0))
+        self.assertEqual(self.mocks['mint_nft'].call_count, 1)
+
+    def test_failed_payment_returns_the_nft_and_frees_the_place(self):
+        self.mocks['transfer_between'].return_value = {'status': 'failed', 'error': 'INSUFFICIENT_TOKEN_BALANCE'}
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=1, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'failed')
+        self.assertIn('INSUFFICIENT_TOKEN_BALANCE', purchase.last_error)
+        self.assertEqual(VentureTicket.objects.get(id=purchase.ticket_id).status, 'failed')
+        self.assertTrue(purchase.steps.filter(step='refund_nft', status='succeeded').exists())
+        self.mocks['return_nft'].assert_called_once()
+        # The returned serial is burned so the token's finite supply can cover the freed place
+        self.mocks['burn_nft'].assert_called_once_with('0.0.5005', 7)
+        self.assertEqual(self.remaining(), 2)
+        self.assertTrue(TicketNumberGap.objects.filter(venture=self.venture, reason='purchase_failed').exists())
+        self.assertFalse(VentureOwnership.objects.exists())
+
+        # The freed place and the buyer's one ticket can be used again
+        _, created = reserve_ticket(self.venture.id, self.buyer, 'key-2')
+        self.assertTrue(created)
+
+    def test_unfunded_buyer_gets_no_ticket(self):
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        with mock.patch('ventures.ticket_purchase.transfer_between', transfer_between), \
+                transfer_receipt(ResponseCode.INSUFFICIENT_TOKEN_BALANCE):
+            fulfill_purchase(purchase.id, max_attempts=1, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'failed')
+        self.assertIn('INSUFFICIENT_TOKEN_BALANCE', purchase.last_error)
+        self.assertEqual(VentureTicket.objects.get(id=purchase.ticket_id).status, 'failed')
+        self.assertFalse(VentureOwnership.objects.exists())
+
+    def test_payment_retry_finds_a_transfer_that_already_landed(self):
+        # The first attempt times out after reaching consensus
+        self.mocks['transfer_between'].return_value = {'status': 'failed', 'error': 'timeout'}
+        self.mocks['find_transfers_by_memo'].return_value = ['0.0.1001-1700000000-000000001']
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=2, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'completed')
+        self.mocks['transfer_between'].assert_called_once()
+        self.assertEqual(self.mocks['transfer_between'].call_args.kwargs['memo'], f'ticket purchase {purchase.id}')
+        self.assertEqual(VentureTicket.objects.get(id=purchase.ticket_id).purchase_hash, '0.0.1001-1700000000-000000001')
+
+    def test_payment_is_not_retried_blind(self):
+        self.mocks['transfer_between'].return_value = {'status': 'failed', 'error': 'timeout'}
+        self.mocks['find_transfers_by_memo'].return_value = None
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=3, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'failed')
+        self.mocks['transfer_between'].assert_called_once()
+
+    def test_buyer_can_buy_again_after_a_compensated_purchase(self):
+        # A ledger where the buyer's first association sticks and later ones are refused as duplicates
+        association = mock.MagicMock()
+        for method in ('set_account_id', 'add_token_id', 'freeze_with', 'sign'):
+            getattr(association, method).return_value = association
+        association.execute.side_effect = [
+            mock.Mock(status=ResponseCode.SUCCESS),
+            mock.Mock(status=ResponseCode.TOKEN_ALREADY_ASSOCIATED_TO_ACCOUNT),
+        ]
+        ledger = mock.patch.multiple(
+            'hiero.nft', setup_client=mock.Mock(return_value=(mock.Mock(), mock.Mock(), mock.Mock())),
+            PrivateKey=mock.DEFAULT, TokenAssociateTransaction=mock.Mock(return_value=association),
+        )
+        self.mocks['transfer_between'].return_value = {'status': 'failed', 'error': 'payment rejected'}
+
+        with ledger, mock.patch('ventures.ticket_purchase.associate_token_with_account', associate_token_with_account):
+            first, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+            fulfill_purchase(first.id, max_attempts=1, backoff=0)
+            self.mocks['transfer_between'].return_value = HIERO_SUCCESS['transfer_between']
+            second, _ = reserve_ticket(self.venture.id, self.buyer, 'key-2')
+            fulfill_purchase(second.id, max_attempts=1, backoff=0)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.status, second.status), ('failed', 'completed'))
+        self.assertEqual(association.execute.call_count, 2)
+
+    def test_failed_refund_is_flagged(self):
+        self.mocks['transfer_between'].return_value = {'status': 'failed', 'error': 'payment rejected'}
+        self.mocks['return_nft'].return_value = {'status': 'failed', 'message': 'refund rejected'}
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=1, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'compensation_failed')
+
+    def test_failed_mint_needs_no_refund(self):
+        self.mocks['mint_nft'].return_value = {'status': 'failed', 'message': 'mint rejected'}
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=2, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'failed')
+        self.assertEqual(purchase.steps.filter(step='mint', status='failed').count(), 2)
+        self.mocks['return_nft'].assert_not_called()
+        self.mocks['burn_nft'].assert_not_called()
+        self.assertEqual(self.remaining(), 2)
+
+    @override_settings(NFT_METADATA_BASE_URL='')
+    def test_missing_metadata_base_url_mints_nothing(self):
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'failed')
+        self.assertIn('NFT_METADATA_BASE_URL', purchase.last_error)
+        self.assertEqual(purchase.steps.filter(step='mint', status='failed').count(), 1)
+        self.mocks['mint_nft'].assert_not_called()
+
+    def test_failed_delivery_burns_the_serial(self):
+        self.mocks['deliver_nft'].return_value = {'status': 'failed', 'message': 'transfer rejected'}
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=1, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'failed')
+        self.mocks['return_nft'].assert_not_called()
+        self.mocks['burn_nft'].assert_called_once_with('0.0.5005', 7)
+
+    def test_failed_burn_is_flagged(self):
+        self.mocks['transfer_between'].return_value = {'status': 'failed', 'error': 'payment rejected'}
+        self.mocks['burn_nft'].return_value = {'status': 'failed', 'message': 'burn rejected'}
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=1, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'compensation_failed')
+
+    def test_retried_mint_reuses_the_serial_that_landed(self):
+        # The first mint times out after reaching consensus as serial 9
+        self.mocks['mint_nft'].return_value = {'status': 'failed', 'message': 'timeout'}
+        self.mocks['find_nfts_by_metadata'].return_value = [9]
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=2, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'completed')
+        self.mocks['mint_nft'].assert_called_once()
+        self.assertEqual(VentureTicket.objects.get(id=purchase.ticket_id).nft_token_id, '0.0.5005/9')
+
+    def test_failed_mint_that_landed_is_burned(self):
+        self.mocks['mint_nft'].return_value = {'status': 'failed', 'message': 'timeout'}
+        # Not visible on the mirror node at the retry, but by the time the purchase is compensated
+        self.mocks['find_nfts_by_metadata'].side_effect = [[], [9]]
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        fulfill_purchase(purchase.id, max_attempts=2, backoff=0)
+
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'failed')
+        self.mocks['burn_nft'].assert_called_once_with('0.0.5005', 9)
+
+    def test_resumed_purchase_skips_steps_that_succeeded(self):
+        self.mocks['transfer_between'].return_value = {'status': 'failed', 'error': 'timeout'}
+        purchase, _ = reserve_ticket(self.venture.id, self.buyer, 'key-1')
+        with mock.patch('ventures.ticket_purchase.compensate'):
+            # Simulate a worker dying after the deliver step
+            fulfill_purchase(purchase.id, max_attempts=1, backoff=0)
+        TicketPurchase.objects.filter(id=purchase.id).update(status='reserved')
+        self.mocks['transfer_between'].return_value = HIERO_SUCCESS['transfer_between']
+
+        fulfill_purchase(purchase.id, backoff=0)
+        purchase.refresh_from_db()
+        self.assertEqual(purchase.status, 'completed')
+        self.assertEqual(self.mocks['mint_nft'].call_count, 1)
+        self.assertEqual(self.mocks['deliver_nft'].call_count, 1)
+        self.mocks['find_transfers_by_memo'].assert_called_once()
+
+class TicketNumberTests(TestCase):
+    def setUp(self):
+        self.venture = make_venture(make_user('founder'))
+
+    def test_numbers_are_sequential_inside_a_transaction(self):
+        numbers = [allocate_ticket_number(self.venture.id, block_size=10) for _ in range(3)]
+        self.assertEqual(numbers, [1, 2, 3])
+        self.assertEqual(peek_next_ticket_number(self.venture.id), 4)
+
+    def test_counter_starts_after_the_highest_existing_number(self):
+        VentureTicket.objects.create(
+            venture=self.venture, buyer=make_user('buyer'), ticket_number=41, purchase_price=Decimal('10'),
+        )
+        TicketNumberCounter.objects.filter(venture=self.venture).delete()
+        self.assertEqual(peek_next_ticket_number(self.venture.id), 42)
+        self.assertEqual(allocate_ticket_number(self.venture.id), 42)
+        self.assertEqual(TicketNumberCounter.objects.get(venture=self.venture).next_number, 43)
+
+    def test_gaps_are_recorded_once(self):
+        record_gap(self.venture.id, 5, 'reservation_failed')
+        record_gap(self.venture.id, 5, 'purchase_failed')
+        self.assertEqual(list(TicketNumberGap.objects.values_list('number', 'reason')), [(5, 'reservation_failed')])
+
+class TicketNumberBlockTests(TransactionTestCase):
+    """Blocks are only claimed outside a transaction, which TestCase always opens"""
+
+    def setUp(self):
+        self.venture = make_venture(make_user('founder'))
+        ticket_numbers._blocks.clear()
+        self.addCleanup(ticket_numbers._blocks.clear)
+
+    def test_a_block_is_claimed_per_round_trip_and_handed_out_locally(self):
+        first = [allocate_ticket_number(self.venture.id, block_size=5) for _ in range(3)]
+        self.assertEqual(first, [1, 2, 3])
+        # The whole block is reserved in the counter
+        self.assertEqual(TicketNumberCounter.objects.get(venture=self.venture).next_number, 6)
+
+    def test_processes_never_share_a_block(self):
+        this_process = [allocate_ticket_number(self.venture.id, block_size=5) for _ in range(2)]
+        other_process, ticket_numbers._blocks = ticket_numbers._blocks, {}
+        self.assertEqual(allocate_ticket_number(self.venture.id, block_size=5), 6)
+
+        ticket_numbers._blocks = other_process
+        rest = [allocate_ticket_number(self.venture.id, block_size=5) for _ in range(4)]
+        # 3..5 finish the first block, then a new block starts after the other process's
+        self.assertEqual(this_process + rest, [1, 2, 3, 4, 5, 11])
+
+@override_settings(FUNDING_SHARD_MIN_TICKETS=2, FUNDING_COUNTER_SHARDS=4)
+class ShardedFundingTests(TestCase):
+    def setUp(self):
+        self.venture = make_venture(make_user('founder'), max_tickets=2, funding_goal=Decimal('100'))
+        self.buyers = [make_user('buyer-1'), make_user('buyer-2')]
+
+    def reload(self):
+        return Venture.objects.get(id=self.venture.id)
+
+    def test_sales_stay_in_shards_until_the_venture_sells_out(self):
+        reserve_ticket(self.venture.id, self.buyers[0], 'key-1')
+        record_sale(self.venture, Decimal('10'))
+
+        venture = self.reload()
+        self.assertEqual((venture.tickets_sold, venture.funding_raised), (0, Decimal('0')))
+        self.assertEqual(sum(FundingCounterShard.objects.values_list('tickets', flat=True)), 1)
+
+        # Reads include the pending sale without rolling it up
+        refreshed = refresh_funding(venture)
+        self.assertEqual((refreshed.tickets_sold, refreshed.funding_raised), (1, Decimal('10')))
+        self.assertEqual(self.reload().tickets_sold, 0)
+
+        self.assertEqual(rollup_funding(self.venture.id), 1)
+        self.assertEqual(self.reload().funding_raised, Decimal('10'))
+        self.assertEqual(sum(FundingCounterShard.objects.values_list('tickets', flat=True)), 0)
+
+    def test_last_sale_rolls_up_and_marks_the_venture_funded(self):
+        for i, buyer in enumerate(self.buyers):
+            reserve_ticket(self.venture.id, buyer, f'key-{i}')
+        record_sale(self.venture, Decimal('10'))
+        record_sale(self.venture, Decimal('10'))
+
+        venture = self.reload()
+        self.assertEqual((venture.tickets_sold, venture.funding_raised), (2, Decimal('20')))
+        self.assertEqual(venture.status, 'funded')
+
+
+class CapTableTests(SimpleTestCase):
+    def test_units_sum_exactly(self):
+        for weights in ([1, 1, 1], [3, 7, 11, 13], [1] * 7, [5000, 1, 1, 1]):
+            shares = allocate_units(weights, 80 * UNITS_PER_PERCENT)
+            self.assertEqual(int(shares.sum()), 80 * UNITS_PER_PERCENT)
+
+    def test_equal_remainders_go_to_earlier_holders(self):
+        self.assertEqual(allocate_units([1, 1, 1], 100).tolist(), [34, 33, 33])
+
+    def test_large_holdings_do_not_overflow(self):
+        units = 80 * UNITS_PER_PERCENT
+        weights = [10 ** 13, 3 * 10 ** 13, 1]
+        shares = allocate_units(weights, units)
+        total = sum(weights)
+        self.assertEqual(int(shares.sum()), units)
+        for weight, share in zip(weights, shares.tolist()):
+            self.assertLessEqual(abs(share * total - weight * units), total)
+
+    def test_negative_weights_rejected(self):
+        with self.assertRaises(ValueError):
+            allocate_units([5, -1], 100)
+
+    def test_totals_one_hundred_percent_with_ceo(self):
+        for ceo_id in (2, 99):
+            user_ids, invested, equity, unallocated = compute_cap_table([1, 2, 3], [1000, 1000, 1000], ceo_id=ceo_id)
+            self.assertEqual(unallocated, 0)
+            self.assertEqual(int(equity.sum()), 100 * UNITS_PER_PERCENT)
+        self.assertEqual(user_ids.tolist(), [1, 2, 3, 99])
+        self.assertEqual(int(equity[-1]), 20 * UNITS_PER_PERCENT)
+
+    def test_unclaimed_equity_is_unallocated(self):
+        _, _, equity, unallocated = compute_cap_table([1, 2], [700, 300])
+        self.assertEqual(int(equity.sum()) + unallocated, 100 * UNITS_PER_PERCENT)
+        self.assertEqual(unallocated, 20 * UNITS_PER_PERCENT)
+
+        _, _, equity, unallocated = compute_cap_table([], [])
+        self.assertEqual(unallocated, 100 * UNITS_PER_PERCENT)
+
+class EligibilityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.venture = make_venture(make_user('founder'))
+        self.user = make_user('investor')
+        patcher = mock.patch('ventures.eligibility.aget_balance', new=mock.AsyncMock(return_value=1000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def check(self):
+        return async_to_sync(aget_eligibility)(self.user.id, self.venture.id)
+
+    def test_open_venture_can_be_invested_in(self):
+        self.assertTrue(self.check()['can_invest'])
+
+    def test_places_held_by_pending_purchases_are_not_offered(self):
+        self.assertTrue(self.check()['can_invest'])
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve_ticket(self.venture.id, make_user('first'), 'key-1')
+            reserve_ticket(self.venture.id, make_user('second'), 'key-1')
+
+        # Nothing is sold yet, but reserve_ticket would refuse, and the cached answer is dropped
+        self.assertEqual(Venture.objects.get(id=self.venture.id).tickets_sold, 0)
+        self.assertEqual(self.check(), {'can_invest': False, 'message': 'No tickets available'})
+
+
+class LifecycleTests(TestCase):
+    def setUp(self):
+        self.founder = make_user('founder')
+        self.now = timezone.now()
+
+    def venture(self, slug, status, start_days, end_days, **fields):
+        return make_venture(
+            self.founder, name=slug, slug=slug, status=status,
+            funding_start=self.now + timedelta(days=start_days), funding_end=self.now + timedelta(days=end_days),
+            **fields
+        )
+
+    def status(self, venture):
+        return Venture.objects.values_list('status', flat=True).get(id=venture.id)
+
+    def test_drafts_open_once_funding_starts(self):
+        started = self.venture('started', 'draft', -1, 5)
+        scheduled = self.venture('scheduled', 'draft', 1, 5)
+
+        self.assertEqual(open_batch(self.now), [started.id])
+        self.assertEqual((self.status(started), self.status(scheduled)), ('funding', 'draft'))
+        self.assertEqual(open_batch(self.now), [])
+
+    def test_ended_funding_is_settled_against_the_goal(self):
+        raised = self.venture('raised', 'funding', -5, -1, funding_raised=Decimal('1000'))
+        sold_out = self.venture('sold-out', 'funding', -5, -1, tickets_sold=2)
+        short = self.venture('short', 'funding', -5, -1, funding_raised=Decimal('10'), tickets_sold=1)
+        running = self.venture('running', 'funding', -5, 1)
+
+        funded, closed = end_batch(self.now)
+        self.assertEqual(sorted(funded), sorted([raised.id, sold_out.id]))
+        self.assertEqual(closed, [short.id])
+        self.assertEqual(
+            [self.status(v) for v in (raised, sold_out, short, running)], ['funded', 'funded', 'closed', 'funding'],
+        )
+
+    def test_draft_whose_window_passed_unopened_is_closed(self):
+        missed = self.venture('missed', 'draft', -5, -1)
+        self.assertEqual(open_batch(self.now), [])
+        self.assertEqual(end_batch(self.now), ([], [missed.id]))
+        self.assertEqual(self.status(missed), 'closed')
+
+    @override_settings(FUNDING_SHARD_MIN_TICKETS=2, FUNDING_COUNTER_SHARDS=4)
+    def test_shard_sales_count_before_the_goal_is_judged(self):
+        venture = self.venture('sharded', 'funding', -5, 1, max_tickets=200, funding_goal=Decimal('20'))
+        record_sale(venture, Decimal('10'))
+        record_sale(venture, Decimal('10'))
+        self.assertEqual(Venture.objects.get(id=venture.id).funding_raised, Decimal('0'))
+
+        Venture.objects.filter(id=venture.id).update(funding_end=self.now - timedelta(hours=1))
+        self.assertEqual(end_batch(self.now), ([venture.id], []))
+        venture.refresh_from_db()
+        self.assertEqual((venture.status, venture.tickets_sold, venture.funding_raised), ('funded', 2, Decimal('20')))
+
+    def test_run_lifecycle_drains_every_batch(self):
+        drafts = [self.venture(f'draft-{i}', 'draft', -1, 5) for i in range(3)]
+        ended = [self.venture(f'ended-{i}', 'funding', -5, -1) for i in range(2)]
+
+        transitions = run_lifecycle(self.now, batch_size=1)
+        self.assertEqual(sorted(transitions['funding']), sorted(v.id for v in drafts))
+        self.assertEqual(sorted(transitions['closed']), sorted(v.id for v in ended))
+        self.assertEqual(transitions['funded'], [])
+
+    def test_transitions_are_announced_in_batches(self):
+        with mock.patch('ventures.lifecycle.submit_message', return_value={'status': 'success'}) as submit, \
+                mock.patch('ventures.lifecycle.ANNOUNCE_BATCH_SIZE', 2):
+            self.assertEqual(announce_transitions({'funding': [1, 2, 3], 'funded': [], 'closed': [4]}), (3, 0))
+        self.assertEqual(
+            [call.args[0] for call in submit.call_args_list],
+            ['VENTURES:funding:1,2', 'VENTURES:funding:3', 'VENTURES:closed:4'],
+        )
+
+class ReadApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.founder = make_user('founder')
+        self.buyer = make_user('buyer')
+        self.venture = make_venture(self.founder)
+        self.client.force_login(self.buyer)
+        patch_hiero(self)
+
+    def get(self, name, etag=None, **params):
+        args = [] if name == 'api_ventures' else [self.venture.slug]
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse(name, args=args), params, **headers)
+
+    def sell_ticket(self, buyer):
+        with self.captureOnCommitCallbacks(execute=True):
+            purchase, _ = reserve_ticket(self.venture.id, buyer, f'key-{buyer.pk}')
+        with self.captureOnCommitCallbacks(execute=True):
+            fulfill_purchase(purchase.id, backoff=0)
+
+    def test_matching_etag_is_answered_with_304(self):
+        for name in ('api_ventures', 'api_venture', 'api_venture_tickets'):
+            with self.subTest(name):
+                response = self.get(name)
+                self.assertEqual(response.status_code, 200)
+                etag = response['ETag']
+                self.assertTrue(etag.startswith('W/"'))
+
+                cached = self.get(name, etag)
+                self.assertEqual(cached.status_code, 304)
+                self.assertEqual(cached.content, b'')
+                self.assertEqual(cached['ETag'], etag)
+                self.assertIn('no-cache', cached['Cache-Control'])
+
+    def test_etag_changes_after_a_sale(self):
+        etags = {name: self.get(name)['ETag'] for name in ('api_ventures', 'api_venture', 'api_venture_tickets')}
+        self.sell_ticket(self.buyer)
+
+        for name, etag in etags.items():
+            with self.subTest(name):
+                response = self.get(name, etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.get('api_venture').json()['tickets_sold'], 1)
+        self.assertEqual([t['owner'] for t in self.get('api_venture_tickets').json()['tickets']], ['buyer'])
+
+    def test_cursor_walks_the_pages(self):
+        make_venture(self.founder, name='Older', slug='older')
+        seen, cursor = [], None
+        while True:
+            page = self.get('api_ventures', limit=1, **({'cursor': cursor} if cursor else {})).json()
+            self.assertEqual(len(page['ventures']), 1)
+            seen.extend(venture['id'] for venture in page['ventures'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        listed = Venture.objects.filter(status__in=LISTED_STATUSES).order_by('-created_at', '-id')
+        self.assertEqual(seen, [str(venture_id) for venture_id in listed.values_list('id', flat=True)])
+
+        self.sell_ticket(self.buyer)
+        self.sell_ticket(make_user('second'))
+        page = self.get('api_venture_tickets', limit=1).json()
+        self.assertEqual([t['number'] for t in page['tickets']], [1])
+        page = self.get('api_venture_tickets', limit=1, cursor=page['next_cursor']).json()
+        self.assertEqual(([t['number'] for t in page['tickets']], page['next_cursor']), ([2], None))
+
+    def test_bad_cursor_is_rejected(self):
+        for name in ('api_ventures', 'api_venture_tickets'):
+            for cursor in ('not-a-cursor', 'WyJ4Il0=', 'WzEsMl0='):
+                with self.subTest(name, cursor=cursor):
+                    response = self.get(name, cursor=cursor)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertEqual(response.json()['error'], 'Invalid cursor')
+
+    def test_limit_outside_the_allowed_range_is_rejected(self):
+        for name in ('api_ventures', 'api_venture_tickets'):
+            for limit in (0, MAX_API_PAGE_SIZE + 1, 'ten'):
+                with self.subTest(name, limit=limit):
+                    response = self.get(name, limit=limit)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertIn('limit', response.json()['error'])
+            self.assertEqual(self.get(name, limit=MAX_API_PAGE_SIZE).status_code, 200)
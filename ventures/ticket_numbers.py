@@ -0,0 +1,68 @@
+import threading
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max
+from .models import Venture, VentureTicket, TicketNumberCounter, TicketNumberGap
+
+# Ticket numbers come from a per-venture counter row bumped with a single
+# UPDATE ... RETURNING, so concurrent buyers never read-then-write the same
+# number. With TICKET_NUMBER_BLOCK_SIZE > 1 each process claims a block of
+# numbers per round trip and hands them out locally. Numbers that are
+# allocated but never sold are recorded in TicketNumberGap.
+
+_blocks = {}  # venture id -> [next number, last number] claimed by this process
+_blocks_lock = threading.Lock()
+
+def _claim_range(venture_id, size):
+    """Atomically advance the venture's counter by ``size``. Returns (first, last)."""
+    table = TicketNumberCounter._meta.db_table
+    venture_pk = Venture._meta.pk.get_db_prep_value(venture_id, connection)
+    sql = f'UPDATE {table} SET next_number = next_number + %s WHERE venture_id = %s RETURNING next_number'
+
+    for _ in range(2):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [size, venture_pk])
+            row = cursor.fetchone()
+        if row:
+            return row[0] - size, row[0] - 1
+        _create_counter(venture_id)
+    raise RuntimeError(f"Ticket number counter missing for venture {venture_id}")
+
+def _create_counter(venture_id):
+    """Start a venture's counter after the highest number already issued"""
+    highest = VentureTicket.objects.filter(venture_id=venture_id).aggregate(n=Max('ticket_number'))['n'] or 0
+    TicketNumberCounter.objects.bulk_create(
+        [TicketNumberCounter(venture_id=venture_id, next_number=highest + 1)], ignore_conflicts=True
+    )
+
+def allocate_ticket_number(venture_id, block_size=None):
+    """Return the next ticket number for a venture.
+
+    Inside a transaction a single number is claimed, so it rolls back with
+    the ticket. Outside one, numbers come from this process's block; a
+    block claim commits immediately and can never be handed out twice.
+    """
+    block_size = block_size or settings.TICKET_NUMBER_BLOCK_SIZE
+    if block_size <= 1 or connection.in_atomic_block:
+        return _claim_range(venture_id, 1)[0]
+
+    with _blocks_lock:
+        block = _blocks.get(venture_id)
+        if block is None or block[0] > block[1]:
+            block = _blocks[venture_id] = list(_claim_range(venture_id, block_size))
+        number = block[0]
+        block[0] += 1
+        return number
+
+def peek_next_ticket_number(venture_id):
+    """The number the next sequential allocation would return (for previews only)"""
+    counter = TicketNumberCounter.objects.filter(venture_id=venture_id).values_list('next_number', flat=True).first()
+    if counter is None:
+        return (VentureTicket.objects.filter(venture_id=venture_id).aggregate(n=Max('ticket_number'))['n'] or 0) + 1
+    return counter
+
+def record_gap(venture_id, number, reason):
+    """Note that ``number`` was allocated for a venture but will not be sold"""
+    TicketNumberGap.objects.bulk_create(
+        [TicketNumberGap(venture_id=venture_id, number=number, reason=reason)], ignore_conflicts=True
+    )
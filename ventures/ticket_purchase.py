@@ -0,0 +1,354 @@
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction, close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from hiero_sdk_python import TokenId
+from hiero_sdk_python.tokens.nft_id import NftId
+from core.fragment_cache import bump_fragment_version, USER_WALLET
+from core.models import UserWallet
+from core.nft_metadata import store_metadata
+from hiero.ft import transfer_between
+from hiero.hcs import submit_message
+from hiero.mirror_node import find_nfts_by_metadata, find_transfers_by_memo
+from hiero.nft import mint_nft, associate_token_with_account, deliver_nft, return_nft, burn_nft
+from .funding import record_sale
+from .inventory import release_ticket_place, reserve_ticket_place, LIVE_TICKET_STATUSES
+from .models import Venture, VentureTicket, VentureOwnership, TicketPurchase, TicketPurchaseStep
+from .ticket_numbers import allocate_ticket_number, record_gap
+
+logger = logging.getLogger(__name__)
+
+# Background fulfillment settings
+FULFILLMENT_WORKERS = 4
+MAX_STEP_ATTEMPTS = 3
+RETRY_BACKOFF_SECONDS = 2  # Doubled after every failed attempt
+
+# Steps that must all succeed for the purchase to complete, in order
+SAGA_STEPS = ['mint', 'deliver', 'payment']
+
+_executor = ThreadPoolExecutor(max_workers=FULFILLMENT_WORKERS, thread_name_prefix='ticket-fulfillment')
+
+class ReservationError(Exception):
+    """The ticket could not be reserved (sold out, not on sale, already owned)"""
+
+class StepError(RuntimeError):
+    """A saga step failed. ``permanent`` errors are not retried."""
+    def __init__(self, message, permanent=False):
+        super().__init__(message)
+        self.permanent = permanent
+
+def get_purchase(buyer, idempotency_key):
+    return TicketPurchase.objects.select_related('ticket').filter(buyer=buyer, idempotency_key=idempotency_key).first()
+
+def reserve_ticket(venture_id, buyer, idempotency_key):
+    """Reserve a ticket and queue its fulfillment. Returns (purchase, created).
+
+    Only database work happens here, so reservations are not slowed down by
+    Hedera consensus. The Venture row is never locked: the place comes from
+    the venture's inventory row (see ventures.inventory), whose lock is held
+    only for the two inserts that follow, and the one-ticket rule is
+    enforced by the one_live_ticket_per_buyer constraint. Repeating a request with the
+    same idempotency key returns the original purchase.
+    """
+    existing = get_purchase(buyer, idempotency_key)
+    if existing:
+        return existing, False
+
+    venture = Venture.objects.only('id', 'status', 'funding_start', 'funding_end', 'ticket_price').get(id=venture_id)
+    if not venture.is_funding_active:
+        raise ReservationError("Funding is not active")
+    if VentureTicket.objects.filter(venture_id=venture_id, buyer=buyer, status__in=LIVE_TICKET_STATUSES).exists():
+        raise ReservationError("You already own a ticket for this venture")
+
+    # Claimed before the transaction so a block claim commits on its own; see ventures.ticket_numbers
+    ticket_number = allocate_ticket_number(venture_id)
+    try:
+        with transaction.atomic():
+            if not reserve_ticket_place(venture_id):
+                raise ReservationError("No tickets available")
+            ticket = VentureTicket.objects.create(
+                venture_id=venture_id,
+                buyer=buyer,
+                ticket_number=ticket_number,
+                purchase_price=venture.ticket_price,
+                status='pending'
+            )
+            purchase = TicketPurchase.objects.create(ticket=ticket, buyer=buyer, idempotency_key=idempotency_key)
+            schedule_fulfillment(purchase.id)
+    except ReservationError:
+        record_gap(venture_id, ticket_number, 'reservation_failed')
+        raise
+    except IntegrityError:
+        record_gap(venture_id, ticket_number, 'reservation_failed')
+        # A concurrent request with the same key won the insert
+        existing = get_purchase(buyer, idempotency_key)
+        if existing is not None:
+            return existing, False
+        # ...or one with another key took this buyer's ticket
+        if VentureTicket.objects.filter(venture_id=venture_id, buyer=buyer, status__in=LIVE_TICKET_STATUSES).exists():
+            raise ReservationError("You already own a ticket for this venture")
+        raise
+
+    return purchase, True
+
+def schedule_fulfillment(purchase_id):
+    """Run the Hedera steps in a background worker once the reservation commits"""
+    transaction.on_commit(lambda: _executor.submit(_run_fulfillment, purchase_id))
+
+def _run_fulfillment(purchase_id):
+    try:
+        fulfill_purchase(purchase_id)
+    except Exception as e:
+        logger.error(f"Ticket fulfillment crashed for purchase {purchase_id}: {e}")
+    finally:
+        close_old_connections()
+
+def _wallet(user):
+    wallet = UserWallet.objects.filter(user=user).first()
+    if not wallet or not wallet.is_provisioned:
+        raise StepError(f"Wallet for user {user.pk} is not provisioned", permanent=True)
+    return wallet
+
+def _mint(purchase, results):
+    ticket = purchase.ticket
+    token_id = ticket.venture.nft_contract_address
+    if not token_id:
+        raise StepError("Venture NFT contract not configured", permanent=True)
+
+    # The metadata carries the purchase date, so fix it before the document is built.
+    # It is persisted so a retried mint produces the same document (and digest).
+    if ticket.purchased_at is None:
+        ticket.purchased_at = timezone.now()
+        VentureTicket.objects.filter(id=ticket.id).update(purchased_at=ticket.purchased_at)
+
+    # The full document is served off-chain; only its short URI goes into the token
+    try:
+        digest, uri = store_metadata(ticket.generate_nft_metadata())
+    except (ImproperlyConfigured, ValueError) as e:
+        # A bad base URL would be minted for good; retrying can't fix it
+        raise StepError(str(e), permanent=True)
+    if purchase.attempts > 1 or purchase.steps.filter(step='mint').exists():
+        # The token's supply is finite, so reuse a serial an earlier attempt minted before it failed
+        serial = _find_minted_serial(token_id, uri)
+        if serial is not None:
+            return {'token_id': token_id, 'serial': serial, 'metadata_uri': uri, 'metadata_digest': digest}
+
+    result = mint_nft(nft_token_id=token_id, metadata=uri)
+    if result['status'] != 'success':
+        raise StepError(f"NFT minting failed: {result.get('message')}")
+    return {'token_id': token_id, 'serial': int(result['serial']), 'metadata_uri': uri, 'metadata_digest': digest}
+
+def _find_minted_serial(token_id, uri):
+    """The serial already minted with this ticket's metadata URI, or None. Raises StepError
+    if the mirror node can't tell, so the step is retried rather than minting twice."""
+    serials = find_nfts_by_metadata(token_id, uri)
+    if serials is None:
+        raise StepError("Cannot check for an earlier mint, mirror node unavailable")
+    return serials[0] if serials else None
+
+def _deliver(purchase, results):
+    wallet = _wallet(purchase.buyer)
+    token_id = results['mint']['token_id']
+    # Association is repeatable (already associated counts as success), so a retry after
+    # a failed transfer, or a buyer whose earlier purchase was compensated, goes through
+    result = associate_token_with_account(wallet.recipient_id, token_id, wallet.decrypt_key())
+    if result['status'] != 'success':
+        raise StepError(f"NFT association failed: {result.get('message')}")
+
+    nft_id = NftId(TokenId.from_string(token_id), results['mint']['serial'])
+    result = deliver_nft(nft_id, wallet.recipient_id)
+    if result['status'] != 'success':
+        raise StepError(f"NFT delivery failed: {result.get('message')}")
+    return {'nft_id': str(nft_id)}
+
+def _payment(purchase, results):
+    wallet = _wallet(purchase.buyer)
+    founder_wallet = _wallet(purchase.ticket.venture.founder)
+    # The memo ties the transfer to this purchase so a retry can tell whether it already landed
+    memo = f"ticket purchase {purchase.id}"
+    if purchase.attempts > 1 or purchase.steps.filter(step='payment').exists():
+        # An earlier attempt may have reached consensus and still failed here (e.g. a timeout)
+        earlier = find_transfers_by_memo(wallet.recipient_id, memo, since=purchase.created_at)
+        if earlier is None:
+            raise StepError("Cannot check for an earlier payment, mirror node unavailable")
+        if earlier:
+            return {'transaction_id': earlier[0]}
+
+    result = transfer_between(
+        wallet.recipient_id, wallet.decrypt_key(), founder_wallet.recipient_id, int(purchase.ticket.purchase_price),
+        memo=memo,
+    )
+    if result['status'] != 'success':
+        raise StepError(f"Payment failed: {result.get('error')}")
+    # The founder's balance moved too (the buyer's is covered when the ticket is saved)
+    transaction.on_commit(lambda: bump_fragment_version(USER_WALLET, founder_wallet.user_id))
+    receipt = result.get('receipt')
+    return {'transaction_id': str(getattr(receipt, 'transaction_id', '') or '')}
+
+def _hcs_log(purchase, results):
+    ticket = purchase.ticket
+    result = submit_message(
+        message=f"Venture Ticket Purchase - Venture: {ticket.venture_id}, Ticket: {ticket.id}, "
+                f"Buyer: {purchase.buyer_id}, Price: {ticket.purchase_price}"
+    )
+    if result['status'] != 'success':
+        raise StepError(f"HCS log failed: {result.get('message')}")
+    return {'topic': str(result['topic'])}
+
+def _refund_nft(purchase, results):
+    wallet = _wallet(purchase.buyer)
+    result = return_nft(results['mint']['token_id'], results['mint']['serial'], wallet.recipient_id, wallet.decrypt_key())
+    if result['status'] != 'success':
+        raise StepError(result.get('message'))
+    return {}
+
+def _burn_nft(purchase, results):
+    result = burn_nft(results['mint']['token_id'], results['mint']['serial'])
+    if result['status'] != 'success':
+        raise StepError(result.get('message'))
+    return {}
+
+STEP_HANDLERS = {
+    'mint': _mint,
+    'deliver': _deliver,
+    'payment': _payment,
+    'hcs_log': _hcs_log,
+    'refund_nft': _refund_nft,
+    'burn_nft': _burn_nft,
+}
+
+def run_step(purchase, step, results, max_attempts=MAX_STEP_ATTEMPTS, backoff=RETRY_BACKOFF_SECONDS):
+    """Run one step with retries, logging every attempt. Returns the step result."""
+    for attempt in range(1, max_attempts + 1):
+        try:
+            result = STEP_HANDLERS[step](purchase, results)
+        except Exception as e:
+            TicketPurchaseStep.objects.create(purchase=purchase, step=step, status='failed', error=str(e))
+            logger.warning(f"Purchase {purchase.id} step {step} attempt {attempt} failed: {e}")
+            if getattr(e, 'permanent', False) or attempt == max_attempts:
+                raise StepError(f"{step}: {e}")
+            time.sleep(backoff * 2 ** (attempt - 1))
+            continue
+
+        TicketPurchaseStep.objects.create(purchase=purchase, step=step, status='succeeded', result=result)
+        return result
+
+def fulfill_purchase(purchase_id, max_attempts=MAX_STEP_ATTEMPTS, backoff=RETRY_BACKOFF_SECONDS):
+    """Run the outstanding saga steps for a reserved purchase.
+
+    Steps that already succeeded (per the step log) are skipped, so a
+    purchase interrupted by a crash resumes where it stopped. Returns the
+    purchase, or None if another worker already claimed it.
+    """
+    # Claim the purchase atomically so two workers never run its steps side by side
+    claimed = TicketPurchase.objects.filter(id=purchase_id, status='reserved').update(
+        status='fulfilling', attempts=F('attempts') + 1
+    )
+    if not claimed:
+        return None
+
+    purchase = TicketPurchase.objects.select_related('ticket__venture__founder', 'buyer').get(id=purchase_id)
+    VentureTicket.objects.filter(id=purchase.ticket_id).update(status='processing')
+    results = purchase.step_results()
+
+    try:
+        for step in SAGA_STEPS:
+            if step not in results:
+                results[step] = run_step(purchase, step, results, max_attempts, backoff)
+    except StepError as e:
+        compensate(purchase, results, str(e), max_attempts, backoff)
+        return purchase
+
+    complete_purchase(purchase, results)
+
+    # The HCS record is an audit trail; failing to write it doesn't undo a paid purchase
+    if 'hcs_log' not in results:
+        try:
+            results['hcs_log'] = run_step(purchase, 'hcs_log', results, max_attempts, backoff)
+        except StepError as e:
+            TicketPurchase.objects.filter(id=purchase.id).update(last_error=str(e))
+    return purchase
+
+def complete_purchase(purchase, results):
+    """Record a paid purchase: ticket, ownership and venture totals in one short transaction"""
+    ticket = purchase.ticket
+    venture = ticket.venture
+    now = timezone.now()
+
+    with transaction.atomic():
+        ticket.status = 'purchased'
+        # Normally already set by the mint step, so the ticket matches its metadata
+        ticket.purchased_at = ticket.purchased_at or now
+        ticket.nft_token_id = results['deliver']['nft_id']
+        mint = results['mint']
+        if 'metadata_uri' in mint:
+            ticket.nft_metadata = {'uri': mint['metadata_uri'], 'digest': mint['metadata_digest']}
+        else:
+            # Minted before metadata moved off-chain, with the whole document in the token
+            ticket.nft_metadata = json.loads(mint['metadata'])
+        ticket.purchase_hash = results['payment']['transaction_id']
+        ticket.save()
+
+        record_sale(venture, ticket.purchase_price)
+
+        VentureOwnership.objects.create(
+            venture=venture,
+            owner=purchase.buyer,
+            ticket=ticket,
+            equity_percentage=venture.equity_per_ticket,
+            investment_amount=ticket.purchase_price
+        )
+
+        purchase.status = 'completed'
+        purchase.completed_at = now
+        purchase.last_error = ''
+        purchase.save(update_fields=['status', 'completed_at', 'last_error', 'updated_at'])
+
+    logger.info(f"Ticket #{ticket.ticket_number} for venture {venture.id} purchased by user {purchase.buyer_id}")
+
+def compensate(purchase, results, error, max_attempts=MAX_STEP_ATTEMPTS, backoff=RETRY_BACKOFF_SECONDS):
+    """Undo the on-chain steps of a purchase that can't complete and free its ticket.
+
+    Freeing the place in the database is not enough: the venture token's max
+    supply equals max_tickets, so the minted serial is returned to the
+    treasury if needed and burned, or the place could never be minted again.
+    """
+    TicketPurchase.objects.filter(id=purchase.id).update(status='compensating', last_error=error)
+    compensated = True
+
+    try:
+        if 'mint' not in results and purchase.steps.filter(step='mint').exists():
+            # A failed mint may still have reached consensus
+            ticket = purchase.ticket
+            token_id = ticket.venture.nft_contract_address
+            uri = None
+            if token_id and ticket.purchased_at:
+                try:
+                    digest, uri = store_metadata(ticket.generate_nft_metadata())
+                except (ImproperlyConfigured, ValueError):
+                    pass  # The mint step stopped before calling Hedera
+            serial = _find_minted_serial(token_id, uri) if uri else None
+            if serial is not None:
+                results['mint'] = {'token_id': token_id, 'serial': serial, 'metadata_uri': uri, 'metadata_digest': digest}
+
+        if 'deliver' in results and 'payment' not in results:
+            # The buyer holds an NFT that was never paid for
+            run_step(purchase, 'refund_nft', results, max_attempts, backoff)
+        if 'mint' in results:
+            run_step(purchase, 'burn_nft', results, max_attempts, backoff)
+    except StepError as e:
+        compensated = False
+        logger.error(f"Purchase {purchase.id} could not be compensated: {e}")
+
+    with transaction.atomic():
+        VentureTicket.objects.filter(id=purchase.ticket_id).update(status='failed', purchased_at=None)
+        release_ticket_place(purchase.ticket.venture_id)
+        record_gap(purchase.ticket.venture_id, purchase.ticket.ticket_number, 'purchase_failed')
+        purchase.status = 'failed' if compensated else 'compensation_failed'
+        purchase.last_error = error
+        purchase.save(update_fields=['status', 'last_error', 'updated_at'])
+    logger.warning(f"Purchase {purchase.id} failed and was {'compensated' if compensated else 'NOT compensated'}: {error}")
@@ -8,10 +8,15 @@ urlpatterns = [
     path('ventures/create/', views.create_venture_page, name='create_venture_page'),
     path('ventures/admin/create/', views.create_venture, name='create_venture'),
     path('ventures/<slug:slug>/', views.venture_detail, name='venture_detail'),
+    path('api/ventures/', views.api_ventures, name='api_ventures'),
+    path('api/ventures/search/', views.api_search_ventures, name='api_search_ventures'),
+    path('api/ventures/<slug:slug>/', views.api_venture, name='api_venture'),
+    path('api/ventures/<slug:slug>/tickets/', views.api_venture_tickets, name='api_venture_tickets'),
     path('api/ventures/<slug:slug>/invest/', views.api_check_investment, name='api_check_investment'),
     path('api/ventures/<slug:slug>/invest/confirm/', views.api_purchase_ticket, name='api_purchase_ticket'),
     path('api/ventures/<slug:slug>/investors/', views.api_get_investors, name='api_get_investors'),
-    path('ventures/<int:venture_id>/buy-ticket/', views.buy_venture_ticket, name='buy_venture_ticket'),
+    path('ventures/<uuid:venture_id>/buy-ticket/', views.buy_venture_ticket, name='buy_venture_ticket'),
+    path('api/ventures/purchases/<uuid:purchase_id>/', views.purchase_status, name='purchase_status'),
     
     # API endpoints
     path('api/wallet/balance/', views.api_wallet_balance, name='api_wallet_balance'),
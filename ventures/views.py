@@ -1,23 +1,43 @@
-from django.shortcuts import render, redirect, get_object_or_404
+from django.shortcuts import render, redirect, get_object_or_404, aget_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from core.models import UserWallet
-from hiero.ft import transfer_tokens
+from core.rate_limit import rate_limit
 from hiero.mirror_node import get_balance
-from hiero.nft import mint_nft, associate_nft
-from hiero.hcs import submit_message
-from ventures.models import Venture, VentureTicket, VentureOwnership
-from datetime import timedelta, timezone, datetime
+from hiero.async_mirror_node import aget_balance
+from ventures.models import Venture, VentureTicket, VentureOwnership, TicketPurchase
+from ventures.ticket_purchase import get_purchase, reserve_ticket, ReservationError
+from ventures.eligibility import aget_eligibility
+from ventures.funding import refresh_funding
+from ventures.search import (
+    search_ventures, search_venture_ids, LISTED_STATUSES, MAX_LIST_SEARCH_MATCHES,
+    SEARCH_RESULTS_LIMIT, MAX_SEARCH_RESULTS_LIMIT,
+)
+from ventures.api import (
+    conditional_json, parse_limit, ticket_page_response, venture_detail_response, venture_id_for_slug,
+    venture_list_page, weak_etag,
+)
+from ventures.investors import (
+    get_investor_summary, get_investors_page, INVESTORS_PAGE_SIZE, MAX_INVESTORS_PAGE_SIZE,
+)
+from datetime import timedelta, datetime
+from django.utils import timezone
 import json
 import logging
+import uuid
 from django.views.decorators.http import require_POST
 from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from asgiref.sync import sync_to_async
+from core.fragment_cache import (
+    attach_fragment_versions, get_fragment_version, VENTURE_CARD, VENTURE_INVESTORS,
+)
 from hiero.nft import create_nft
 from hiero_sdk_python import (
     AccountId,
@@ -26,14 +46,14 @@ from hiero_sdk_python import (
 logger = logging.getLogger(__name__)
 
 from django.core.paginator import Paginator
-from django.db.models import Sum, Count
+from django.db.models import Case, Count, Sum, When
 
 @login_required
 def ventures_list(request):
     """List all ventures with filters"""
     from ventures.models import Venture, VentureOwnership
     
-    ventures = Venture.objects.filter(status__in=['funding', 'active']).order_by('-created_at')
+    ventures = Venture.objects.filter(status__in=['funding', 'active']).select_related('founder').order_by('-created_at')
     
     # Apply filters
     status_filter = request.GET.get('status')
@@ -42,13 +62,21 @@ def ventures_list(request):
     
     search_query = request.GET.get('search')
     if search_query:
-        ventures = ventures.filter(name__icontains=search_query)
+        # Full-text matches over name and description, best match first
+        matched_ids = search_venture_ids(search_query, [status_filter] if status_filter else LISTED_STATUSES,
+                                         limit=MAX_LIST_SEARCH_MATCHES)
+        ventures = ventures.filter(id__in=matched_ids).order_by(
+            Case(*[When(id=venture_id, then=position) for position, venture_id in enumerate(matched_ids)])
+        ) if matched_ids else ventures.none()
     
     # Pagination
     paginator = Paginator(ventures, 12)  # 12 ventures per page
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
+    # Card fragments are cached per venture until the venture changes
+    attach_fragment_versions(page_obj, VENTURE_CARD, attr='card_version')
+    
     # Get user's investments for quick reference
     user_investments = VentureOwnership.objects.filter(owner=request.user)
     invested_venture_ids = user_investments.values_list('venture_id', flat=True)
@@ -60,75 +88,41 @@ def ventures_list(request):
         'user_investments': list(invested_venture_ids),
         'today': timezone.now(),
     }
-    return render(request, 'ventures/ventures_list.html', context)
+    return render(request, 'dashboard/ventures_list.html', context)
 
 @login_required
 def venture_detail(request, slug):
     """Detailed venture view with investor leaderboard"""
     from ventures.models import Venture, VentureTicket, VentureOwnership
     
-    venture = get_object_or_404(Venture, slug=slug)
+    venture = refresh_funding(get_object_or_404(Venture, slug=slug))
     
-    # Check if user has already purchased a ticket
-    has_ticket = VentureTicket.objects.filter(
+    # The user's ticket, if they have already purchased one
+    user_ticket = VentureTicket.objects.filter(
         venture=venture,
         buyer=request.user,
         status='purchased'
-    ).exists()
-    
-    user_ticket = None
-    if has_ticket:
-        user_ticket = VentureTicket.objects.get(
-            venture=venture,
-            buyer=request.user,
-            status='purchased'
-        )
-    
-    # Get investor leaderboard
-    ownerships = VentureOwnership.objects.filter(venture=venture).select_related('owner')
-    
-    # Process investor data for display
-    investors_data = []
-    for ownership in ownerships:
-        # Count tickets for this user
-        ticket_count = VentureTicket.objects.filter(
-            venture=venture,
-            buyer=ownership.owner,
-            status='purchased'
-        ).count()
-        
-        investors_data.append({
-            'user': ownership.owner,
-            'tickets': ticket_count,
-            'investment': ownership.investment_amount,
-            'equity': ownership.equity_percentage,
-            'joined_date': ownership.acquired_at,
-        })
-    
-    # Sort by investment amount (descending)
-    investors_data.sort(key=lambda x: x['investment'], reverse=True)
+    ).first()
+    has_ticket = user_ticket is not None
     
-    # Get timeline data
+    # Investor count and timeline come from one cached aggregate
+    investor_summary = get_investor_summary(venture.pk)
     timeline_data = {
-        'first_investment_date': None,
-        'first_investment_amount': None,
-        'funding_complete_date': None,
+        'first_investment_date': investor_summary['first_investment_date'],
+        'first_investment_amount': investor_summary['first_investment_amount'],
+        'funding_complete_date': (
+            investor_summary['last_investment_date'] if venture.status == 'funded' else None
+        ),
     }
     
-    if ownerships.exists():
-        first_investment = ownerships.order_by('acquired_at').first()
-        timeline_data['first_investment_date'] = first_investment.acquired_at
-        timeline_data['first_investment_amount'] = first_investment.investment_amount
-    
-    if venture.status == 'funded':
-        last_investment = ownerships.order_by('-acquired_at').first()
-        timeline_data['funding_complete_date'] = last_investment.acquired_at
-    
     context = {
         'venture': venture,
         'has_ticket': has_ticket,
         'user_ticket': user_ticket,
-        'investors': investors_data,
+        # Only fetched when the investors fragment is not cached; the API pages the rest
+        'investors': SimpleLazyObject(lambda: get_investors_page(venture.pk)['investors']),
+        'investor_count': investor_summary['investor_total'],
+        'investors_version': get_fragment_version(VENTURE_INVESTORS, venture.pk),
         'timeline_data': timeline_data,
         'today': datetime.now(),
     }
@@ -137,83 +131,132 @@ def venture_detail(request, slug):
 # API Views for AJAX calls
 @login_required
 @require_http_methods(["GET"])
-def api_check_investment(request, slug):
-    """API endpoint to check if user can invest in venture"""
-    from ventures.models import Venture, VentureTicket
-    
-    venture = get_object_or_404(Venture, slug=slug)
-    
-    # Check investment conditions
-    can_invest, message = venture.can_user_buy_ticket(request.user)
-    
-    if not can_invest:
+async def api_check_investment(request, slug):
+    """API endpoint to check if user can invest in venture.
+
+    Served from a short-lived per-user snapshot (see ventures.eligibility),
+    so reopening the invest modal costs a few cache reads.
+    """
+    venture_id = await sync_to_async(venture_id_for_slug)(slug)
+    user = await request.auser()
+    eligibility = await aget_eligibility(user.id, venture_id) if venture_id is not None else None
+    if eligibility is None:
+        raise Http404("Venture not found")
+    
+    return JsonResponse(eligibility)
+
+@login_required
+@require_http_methods(["GET"])
+def api_get_investors(request, slug):
+    """Investor list, largest first. Paginate with ``?cursor=<next_cursor>&limit=<n>``;
+    send the ETag back as If-None-Match to get a 304 while nothing changed."""
+    venture_id = venture_id_for_slug(slug)
+    if venture_id is None:
+        raise Http404("Venture not found")
+    
+    limit = request.GET.get('limit', str(INVESTORS_PAGE_SIZE))
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_INVESTORS_PAGE_SIZE:
         return JsonResponse({
-            'can_invest': False,
-            'message': message
-        })
+            'success': False,
+            'error': f'limit must be between 1 and {MAX_INVESTORS_PAGE_SIZE}'
+        }, status=400)
     
-    # Check user balance
-    from core.models import UserWallet
     try:
-        wallet = UserWallet.objects.get(user=request.user)
-        star_balance = get_balance(wallet.recipient_id)
-    except:
-        star_balance = 0
-    
-    if star_balance < float(venture.ticket_price):
-        return JsonResponse({
-            'can_invest': False,
-            'message': f"Insufficient STAR tokens. Need {venture.ticket_price}, have {star_balance}"
-        })
-    
-    # Get next ticket number
-    last_ticket = VentureTicket.objects.filter(venture=venture).order_by('-ticket_number').first()
-    next_ticket_number = (last_ticket.ticket_number + 1) if last_ticket else 1
+        page = get_investors_page(venture_id, request.GET.get('cursor'), int(limit))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    
+    # is_current_user differs per caller, so the user is part of the ETag
+    etag = weak_etag('investors', venture_id, get_fragment_version(VENTURE_INVESTORS, venture_id), request.user.id)
+    
+    def build():
+        return {
+            'investors': [
+                {
+                    'id': investor['user_id'],
+                    'name': investor['name'],
+                    'username': investor['username'],
+                    'tickets': investor['tickets'],
+                    'investment': float(investor['investment']),
+                    'equity': float(investor['equity']),
+                    'joined_date': investor['joined_date'].isoformat(),
+                    'is_current_user': investor['user_id'] == request.user.id,
+                }
+                for investor in page['investors']
+            ],
+            'total': get_investor_summary(venture_id)['investor_total'],
+            'next_cursor': page['next_cursor'],
+            'has_more': page['next_cursor'] is not None,
+        }
     
-    return JsonResponse({
-        'can_invest': True,
-        'venture_name': venture.name,
-        'ticket_price': float(venture.ticket_price),
-        'equity_percentage': float(venture.equity_per_ticket),
-        'next_ticket_number': next_ticket_number,
-        'equity_remaining': 100 - (venture.tickets_sold * venture.equity_per_ticket),
-    })
+    return conditional_json(request, etag, build)
 
 @login_required
 @require_http_methods(["GET"])
-def api_get_investors(request, slug):
-    """API endpoint to get investor list"""
-    from ventures.models import Venture, VentureOwnership
+def api_ventures(request):
+    """Listed ventures, newest first. Filter with ``?status=`` and paginate with
+    ``?cursor=<next_cursor>&limit=<n>``. Supports If-None-Match."""
+    status = request.GET.get('status')
+    if status and status not in dict(Venture.STATUS_CHOICES):
+        return JsonResponse({'success': False, 'error': 'Invalid status'}, status=400)
     
-    venture = get_object_or_404(Venture, slug=slug)
-    page = int(request.GET.get('page', 1))
-    limit = int(request.GET.get('limit', 20))
+    try:
+        return venture_list_page(request, status, request.GET.get('cursor'), parse_limit(request.GET.get('limit')))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def api_venture(request, slug):
+    """One venture's funding state. Supports If-None-Match."""
+    venture_id = venture_id_for_slug(slug)
+    if venture_id is None:
+        raise Http404("Venture not found")
+    return venture_detail_response(request, venture_id)
+
+@login_required
+@require_http_methods(["GET"])
+def api_venture_tickets(request, slug):
+    """A venture's purchased tickets by number. Paginate with ``?cursor=<next_cursor>&limit=<n>``.
+    Supports If-None-Match."""
+    venture_id = venture_id_for_slug(slug)
+    if venture_id is None:
+        raise Http404("Venture not found")
     
-    ownerships = VentureOwnership.objects.filter(
-        venture=venture
-    ).select_related('owner').order_by('-investment_amount')
+    try:
+        return ticket_page_response(request, venture_id, request.GET.get('cursor'), parse_limit(request.GET.get('limit')))
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+@login_required
+@require_http_methods(["GET"])
+def api_search_ventures(request):
+    """Ventures matching ``?q=``, best match first. Narrow with ``?status=`` and ``?limit=``."""
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return JsonResponse({'success': False, 'error': 'q is required'}, status=400)
+    
+    limit = request.GET.get('limit', str(SEARCH_RESULTS_LIMIT))
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_SEARCH_RESULTS_LIMIT:
+        return JsonResponse({
+            'success': False,
+            'error': f'limit must be between 1 and {MAX_SEARCH_RESULTS_LIMIT}'
+        }, status=400)
     
-    # Pagination
-    paginator = Paginator(ownerships, limit)
-    page_obj = paginator.get_page(page)
+    status = request.GET.get('status')
+    if status and status not in dict(Venture.STATUS_CHOICES):
+        return JsonResponse({'success': False, 'error': 'Invalid status'}, status=400)
     
-    investors_data = []
-    for ownership in page_obj:
-        investors_data.append({
-            'id': ownership.owner.id,
-            'name': ownership.owner.get_full_name(),
-            'username': ownership.owner.username,
-            'investment': float(ownership.investment_amount),
-            'equity': float(ownership.equity_percentage),
-            'joined_date': ownership.acquired_at.isoformat(),
-            'is_current_user': (ownership.owner == request.user),
-        })
+    try:
+        results = search_ventures(query, [status] if status else LISTED_STATUSES, int(limit))
+    except Exception as e:
+        logger.error(f"Venture search failed for {query!r}: {str(e)}")
+        return JsonResponse({'success': False, 'error': 'Search failed'}, status=500)
     
     return JsonResponse({
-        'investors': investors_data,
-        'total': paginator.count,
-        'pages': paginator.num_pages,
-        'current_page': page,
+        'success': True,
+        'query': query,
+        'results': results,
     })
 
 @login_required
@@ -239,13 +282,14 @@ def api_purchase_ticket(request, slug):
 
 @login_required
 @require_http_methods(["GET"])
-def api_wallet_balance(request):
+async def api_wallet_balance(request):
     """API endpoint to get user's STAR balance"""
     from core.models import UserWallet
     
     try:
-        wallet = UserWallet.objects.get(user=request.user)
-        star_balance = get_balance(wallet.recipient_id)
+        user = await request.auser()
+        wallet = await UserWallet.objects.aget(user=user)
+        star_balance = await aget_balance(wallet.recipient_id)
         
         return JsonResponse({
             'success': True,
@@ -259,14 +303,57 @@ def api_wallet_balance(request):
             'error': str(e),
             'balance': 0,
         })
+def purchase_payload(purchase):
+    """JSON body describing a ticket purchase and where its saga has got to"""
+    ticket = purchase.ticket
+    payload = {
+        'success': purchase.status not in ('failed', 'compensation_failed'),
+        'purchase_id': str(purchase.id),
+        'status': purchase.status,
+        'ticket_id': str(ticket.id),
+        'ticket_number': ticket.ticket_number,
+        'nft_token_id': ticket.nft_token_id or None,
+    }
+    if purchase.status == 'completed':
+        payload['message'] = f'Successfully purchased ticket #{ticket.ticket_number}'
+    elif payload['success']:
+        payload['message'] = f'Ticket #{ticket.ticket_number} reserved. Your NFT is being issued.'
+    else:
+        payload['error'] = 'Purchase failed. Any on-chain steps have been reversed.'
+    return payload
+
 @login_required
 @require_http_methods(["POST"])
+@rate_limit('buy_venture_ticket', 'Too many purchase attempts. Please wait before trying again.')
 def buy_venture_ticket(request, venture_id):
-    """Buy NFT ticket for a venture - ONE TICKET PER USER PER VENTURE"""
+    """Buy NFT ticket for a venture - ONE TICKET PER USER PER VENTURE.
+
+    Only reserves the ticket; minting, payment and the HCS record run in the
+    background (see ventures.ticket_purchase). Send an ``Idempotency-Key``
+    header (or ``idempotency_key`` in the body) to make retries safe, and poll
+    ``purchase_status`` for the outcome.
+    """
     try:
-        data = json.loads(request.body)
+        data = json.loads(request.body or b'{}')
+        idempotency_key = request.headers.get('Idempotency-Key') or data.get('idempotency_key') or uuid.uuid4().hex
+        if len(idempotency_key) > 64:
+            return JsonResponse({
+                'success': False,
+                'error': 'Idempotency key must be at most 64 characters'
+            }, status=400)
+        
+        # A retried request gets the original purchase back
+        existing = get_purchase(request.user, idempotency_key)
+        if existing:
+            return JsonResponse(purchase_payload(existing))
+        
         venture = get_object_or_404(Venture, id=venture_id)
         user_wallet = get_object_or_404(UserWallet, user=request.user)
+        if not user_wallet.is_provisioned:
+            return JsonResponse({
+                'success': False,
+                'error': 'Hedera wallet is still being set up, try again shortly'
+            })
         
         # Check if user can buy ticket
         can_buy, message = venture.can_user_buy_ticket(request.user)
@@ -276,6 +363,12 @@ def buy_venture_ticket(request, venture_id):
                 'error': message
             })
         
+        if not venture.nft_contract_address:
+            return JsonResponse({
+                'success': False,
+                'error': 'Venture NFT contract not configured'
+            })
+        
         # Check user STAR balance
         try:
             star_balance = get_balance(user_wallet.recipient_id)
@@ -291,124 +384,15 @@ def buy_venture_ticket(request, venture_id):
                 'error': f"Insufficient STAR tokens. Need {ticket_price} STAR, but have {star_balance} STAR"
             })
         
-        with transaction.atomic():
-            # Generate NFT metadata
-            # First create ticket instance to get ticket number
-            ticket = VentureTicket.objects.create(
-                venture=venture,
-                buyer=request.user,
-                purchase_price=venture.ticket_price,
-                status='processing'
-            )
-            
-            ticket_metadata = ticket.generate_nft_metadata()
-            
-            # Mint NFT on Hedera
-            if venture.nft_contract_address:
-                # Mint NFT using existing contract
-                nft_result = mint_nft(
-                    nft_token_id=venture.nft_contract_address,
-                    metadata=ticket_metadata
-                )
-            else:
-                # You'll need to create NFT token first for the venture
-                # For now, simulate or create new NFT token
-                return JsonResponse({
-                    'success': False,
-                    'error': 'Venture NFT contract not configured'
-                })
-            
-            if nft_result['status'] == 'success':
-                # Associate NFT with user's wallet
-                associate_result = associate_nft(
-                    account_id=user_wallet.recipient_id,
-                    token_id=venture.nft_contract_address,
-                    account_private_key=user_wallet.decrypt_key(),
-                    nft_id=nft_result.get('serial_number', nft_result.get('message'))
-                )
-                
-                if associate_result['status'] == 'success':
-                    # Transfer STAR tokens from user to venture pool
-                    transfer_result = transfer_tokens(
-                        sender_id=user_wallet.recipient_id,
-                        receiver_id=venture.founder.wallet.recipient_id,  # Assuming founder has wallet
-                        amount=ticket_price,
-                        sender_private_key=user_wallet.decrypt_key(),
-                        token_id="0.0.XXXXXX"  # Replace with actual STAR token ID
-                    )
-                    
-                    if transfer_result['status'] == 'failed':
-                        logger.error(f"Token transfer failed: {transfer_result.get('message')}")
-                        # Update ticket status
-                        ticket.status = 'failed'
-                        ticket.status_message = f"Payment failed: {transfer_result.get('message')}"
-                        ticket.save()
-                        
-                        return JsonResponse({
-                            'success': False,
-                            'error': 'Payment processing failed'
-                        })
-                    
-                    # Record HCS message for immutability
-                    hcs_message = f"Venture Ticket Purchase - Venture: {venture.id}, Ticket: {ticket.id}, Buyer: {request.user.id}, Price: {ticket_price}"
-                    submit_message(message=hcs_message)
-                    
-                    # Update ticket with success details
-                    ticket.status = 'purchased'
-                    ticket.purchased_at = timezone.now()
-                    ticket.nft_token_id = nft_result.get('serial_number', nft_result.get('message'))
-                    ticket.nft_metadata = json.loads(ticket_metadata)
-                    ticket.purchase_hash = transfer_result.get('transaction_id', '')
-                    ticket.save()
-                    
-                    # Update venture stats
-                    venture.tickets_sold += 1
-                    venture.funding_raised += ticket.purchase_price
-                    
-                    # Check if venture is fully funded
-                    if venture.tickets_sold >= venture.max_tickets:
-                        venture.status = 'funded'
-                    
-                    venture.save()
-                    
-                    # Create ownership record
-                    VentureOwnership.objects.create(
-                        venture=venture,
-                        owner=request.user,
-                        ticket=ticket,
-                        equity_percentage=venture.equity_per_ticket,
-                        investment_amount=ticket.purchase_price
-                    )
-                    
-                    return JsonResponse({
-                        'success': True,
-                        'message': f'Successfully purchased ticket #{ticket.ticket_number} for {venture.name}',
-                        'ticket_id': str(ticket.id),
-                        'ticket_number': ticket.ticket_number,
-                        'equity_percentage': float(venture.equity_per_ticket),
-                        'nft_token_id': ticket.nft_token_id,
-                        'remaining_tickets': venture.max_tickets - venture.tickets_sold
-                    })
-                else:
-                    # NFT association failed
-                    ticket.status = 'failed'
-                    ticket.status_message = f"NFT association failed: {associate_result.get('message')}"
-                    ticket.save()
-                    
-                    return JsonResponse({
-                        'success': False,
-                        'error': 'NFT association failed'
-                    })
-            else:
-                # NFT minting failed
-                ticket.status = 'failed'
-                ticket.status_message = f"NFT minting failed: {nft_result.get('message')}"
-                ticket.save()
-                
-                return JsonResponse({
-                    'success': False,
-                    'error': 'NFT minting failed'
-                })
+        try:
+            purchase, _ = reserve_ticket(venture.id, request.user, idempotency_key)
+        except ReservationError as e:
+            return JsonResponse({
+                'success': False,
+                'error': str(e)
+            })
+        
+        return JsonResponse(purchase_payload(purchase), status=202 if purchase.status != 'completed' else 200)
                 
     except json.JSONDecodeError:
         return JsonResponse({
@@ -421,6 +405,18 @@ def buy_venture_ticket(request, venture_id):
             'success': False,
             'error': f'Purchase failed: {str(e)}'
         })
+
+@login_required
+@require_http_methods(["GET"])
+def purchase_status(request, purchase_id):
+    """Poll the outcome of a ticket purchase"""
+    purchase = get_object_or_404(TicketPurchase.objects.select_related('ticket'), id=purchase_id, buyer=request.user)
+    payload = purchase_payload(purchase)
+    payload['steps'] = [
+        {'step': step.step, 'status': step.status, 'error': step.error, 'at': step.created_at}
+        for step in purchase.steps.all()
+    ]
+    return JsonResponse(payload)
     
 
 
@@ -440,7 +436,9 @@ def create_venture(request):
         description = request.POST.get('description', '').strip()
         funding_goal = request.POST.get('funding_goal', '0')
         ticket_price = request.POST.get('ticket_price', '0')
-        max_tickets = funding_goal/ticket_price
+        max_tickets = request.POST.get('max_tickets', '')
+        funding_start = request.POST.get('funding_start', '')
+        funding_end = request.POST.get('funding_end', '')
         
         
         # Validate required fields
@@ -461,11 +459,23 @@ def create_venture(request):
         try:
             funding_goal = float(funding_goal)
             ticket_price = float(ticket_price)
-            max_tickets = int(max_tickets)
-        except ValueError:
+            max_tickets = int(max_tickets) if max_tickets else int(funding_goal // ticket_price)
+        except (ValueError, ZeroDivisionError):
             messages.warning(request, "Invalid numeric values!")
             return redirect(request.META.get('HTTP_REFERER', '/'))
         
+        # Funding window (datetime-local inputs, in the server's timezone)
+        try:
+            funding_start_dt = timezone.make_aware(datetime.fromisoformat(funding_start))
+            funding_end_dt = timezone.make_aware(datetime.fromisoformat(funding_end))
+        except ValueError:
+            messages.warning(request, "Invalid funding dates!")
+            return redirect(request.META.get('HTTP_REFERER', '/'))
+        
+        if funding_end_dt <= funding_start_dt:
+            messages.warning(request, "Funding must end after it starts!")
+            return redirect(request.META.get('HTTP_REFERER', '/'))
+        
         # Create NFT for the venture
         nft_symbol = slug[:5].upper() + "VENT"
         nft_result = create_nft(
@@ -486,8 +496,8 @@ def create_venture(request):
             funding_goal=funding_goal,
             ticket_price=ticket_price,
             max_tickets=max_tickets,
-            #funding_start=funding_start_dt,
-            #funding_end=funding_end_dt,
+            funding_start=funding_start_dt,
+            funding_end=funding_end_dt,
             nft_contract_address=nft_result['token_id'],
             nft_base_metadata={
                 "name": name,
@@ -500,12 +510,10 @@ def create_venture(request):
                     {"trait_type": "Max Tickets", "value": str(max_tickets)}
                 ]
             },
-            status='funding'
+            # A future start stays in draft until run_venture_lifecycle opens it
+            status='funding' if funding_start_dt <= timezone.now() else 'draft'
         )
         
-        # Clear relevant caches
-        cache.delete_many(["active_ventures", "featured_ventures", "landing_page_data"])
-        
         messages.success(request, f"Venture '{name}' created successfully with NFT contract!")
         return redirect('venture_detail', slug=venture.slug)
         